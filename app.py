@@ -1,29 +1,79 @@
+import os
+import time
+import uuid
 import streamlit as st
 import pandas as pd
-import joblib
 from db_helper import (
     init_db, register_user, verify_user, insert_prediction,
-    fetch_history, insert_feedback
+    insert_feedback, clear_history, HISTORY_COLUMNS
 )
-import matplotlib.pyplot as plt
+from history_cache import history_page, role_summary
+from model_registry import DEFAULT_MODEL_PATH, load_model, registry
+from predictor import features_frame
+from prediction_cache import cached_predict_top_k
+from prediction_grid import grid_predict_top_k
+from inference_service import RemoteInferenceError, predict_remote, serve_in_background
+from charts import bar_chart_png, bar_chart_spec
+import metrics
+import model_store
+import session_auth
+import shadow
+_page_start = time.perf_counter()
 # -------------------------------
 # Initialize database & load model
 # -------------------------------
 init_db()
 
-model_data = joblib.load("best_model.pkl")
-if isinstance(model_data, tuple):
-    model = model_data[0]
-    encoder = model_data[1] if len(model_data) > 1 else None
-else:
-    model = model_data
-    encoder = None
+# The native export (best_model.native.json) starts faster but predicts more
+# slowly than the pickle, so it is used only when EDU2JOB_MODEL_PATH names it.
+MODEL_PATH = os.environ.get("EDU2JOB_MODEL_PATH") or DEFAULT_MODEL_PATH
+
+# Optional headless inference service (inference_service.py):
+#   EDU2JOB_INFERENCE_URL          -> send predictions to a running service
+#   EDU2JOB_EMBED_INFERENCE_PORT   -> also host the service inside this process
+INFERENCE_URL = os.environ.get("EDU2JOB_INFERENCE_URL")
+
+# Versions published with model_store.py take over without a restart: a
+# background watcher loads the new artifact and then switches the path this
+# rerun (and every later one) reads, so a page never sees a half-loaded model.
+# If the store's artifact has not loaded (yet), best_model.pkl is served.
+USE_MODEL_STORE = not os.environ.get("EDU2JOB_MODEL_PATH") and model_store.has_current()
+if os.environ.get("EDU2JOB_EMBED_INFERENCE_PORT"):
+    # The embedded service follows the same model as this page.
+    serve_in_background(port=int(os.environ["EDU2JOB_EMBED_INFERENCE_PORT"]), model_path=MODEL_PATH,
+                        models_dir=model_store.MODELS_DIR if USE_MODEL_STORE else None)
+if USE_MODEL_STORE:
+    if INFERENCE_URL:
+        MODEL_PATH = model_store.current_path()  # fallback only, loaded on demand
+    else:
+        MODEL_PATH = model_store.watch().path or MODEL_PATH
+
+# Loaded once per process and shared across sessions; reloaded only when
+# the model file changes on disk. With INFERENCE_URL the service does the
+# scoring, and the local model is loaded only if a remote call fails.
+model, encoder = (None, None) if INFERENCE_URL else load_model(MODEL_PATH)
+
+# Hot-path metrics (metrics.py), off unless EDU2JOB_METRICS=1.
+# EDU2JOB_METRICS_FILE also writes a JSON snapshot every 15 seconds.
+if metrics.is_enabled() and os.environ.get("EDU2JOB_METRICS_FILE"):
+    metrics.start_file_exporter(os.environ["EDU2JOB_METRICS_FILE"])
+
+# Shadow evaluation (shadow.py), off unless EDU2JOB_SHADOW_FRACTION > 0.
+# Created here so a candidate that cannot score is disabled at startup.
+shadow.evaluator()
+
+# Prediction chart format (charts.py): "vega" (default) or "png".
+CHART_FORMAT = os.environ.get("EDU2JOB_CHART", "vega")
 
 # -------------------------------
 # Streamlit Page Config
 # -------------------------------
 st.set_page_config(page_title="EDU2JOB", page_icon="🎓", layout="wide")
 
+if "metrics_session" not in st.session_state:
+    st.session_state.metrics_session = uuid.uuid4().hex
+metrics.set_session(st.session_state.metrics_session)
+
 # -------------------------------
 # Custom Styling
 # -------------------------------
@@ -86,8 +136,10 @@ st.markdown("""
 # -------------------------------
 st.sidebar.title("🔐 User Authentication")
 
-if "user_id" not in st.session_state:
-    st.session_state.user_id = None
+# Identity comes from a signed token checked in memory, and the user record
+# from a shared TTL cache, so reruns do not query SQLite (session_auth.py).
+current_user = session_auth.current_user(st.session_state)
+st.session_state.user_id = current_user["id"] if current_user else None
 
 auth_choice = st.sidebar.radio("Choose Option", ["Login", "Sign Up"])
 
@@ -108,16 +160,17 @@ if st.session_state.user_id is None:
         if st.sidebar.button("Login"):
             user_id = verify_user(username, password)
             if user_id:
-                st.session_state.user_id = user_id
+                session_auth.login(st.session_state, user_id)
                 st.sidebar.success(f"Welcome, {username}!")
                 st.rerun()
             else:
                 st.sidebar.error("Invalid username or password")
 
 else:
-    st.sidebar.success("Logged in Successfully!")
+    st.sidebar.success(f"Logged in as {current_user['username']}")
     if st.sidebar.button("Logout"):
-        st.session_state.user_id = None
+        session_auth.logout(st.session_state)
+        st.session_state.history_cursors = []
         st.rerun()
 
 # -------------------------------
@@ -232,33 +285,48 @@ else:
 # -------------------------------
 # Prepare input data for prediction
 # -------------------------------
-    input_data = pd.DataFrame({
-     "Degree": [degree],
-     "Major": [major],
-     "Skill1": [skill1],
-     "Skill2": [skill2],
-     "Certification": [certification],
-     "ExperienceYears": [experience_years],
-     "ProjectCount": [project_count],
-     "Internship": [internship],
-     "ExperienceLevel": [experience_level]
-   })
+    # Plain dict of the nine features; the model pipeline builds its own
+    # input frame in one pass (predictor.features_frame).
+    input_data = {
+     "Degree": degree,
+     "Major": major,
+     "Skill1": skill1,
+     "Skill2": skill2,
+     "Certification": certification,
+     "ExperienceYears": experience_years,
+     "ProjectCount": project_count,
+     "Internship": internship,
+     "ExperienceLevel": experience_level
+   }
 
     with col1:
      if st.button("🔍 Predict Job Role"):
         
     # Predict probabilities
-      if hasattr(model, "predict_proba"):
-        probs = model.predict_proba(input_data)[0] 
-        class_indices = probs.argsort()[::-1] 
-        top_n = 3
-        top_classes = class_indices[:top_n]
-        
-        results = []
-        for idx in top_classes:
-            class_name = encoder.inverse_transform([idx])[0] if encoder else model.classes_[idx]
-            confidence = probs[idx] * 100
-            results.append((class_name, confidence))
+      if INFERENCE_URL or hasattr(model, "predict_proba"):
+        inference_start = time.perf_counter()
+        results = primary_version = None
+        with metrics.timer("inference"):
+         if INFERENCE_URL:
+            try:
+                results = predict_remote(input_data, INFERENCE_URL)
+            except RemoteInferenceError:
+                # Answer from the local model rather than failing the page.
+                metrics.inc("inference.remote_errors")
+                st.caption("⚠️ The inference service is unavailable; this answer comes from the local model.")
+         if results is None:
+            # Answered from the precomputed grid (prediction_grid.py) when it is
+            # built and current, otherwise from the shared prediction cache.
+            results = grid_predict_top_k(input_data, MODEL_PATH, k=3,
+                                         fallback=cached_predict_top_k)
+            primary_version = registry.version(MODEL_PATH)
+
+        # Shadow mode (shadow.py): a sampled fraction is also scored by the
+        # candidate model on a background thread; users only see `results`.
+        shadow_eval = shadow.evaluator()
+        if shadow_eval is not None:
+            shadow_eval.submit(input_data, results[0][0], time.perf_counter() - inference_start,
+                               primary_version)
         
        
         st.success("Top Job Role Matches:")
@@ -266,7 +334,7 @@ else:
             st.write(f"{i}. {role} — {conf:.2f}% confidence")
 
        
-        row = input_data.iloc[0].to_dict()
+        row = dict(input_data)
         row["predicted_label"] = results[0][0]  
         insert_prediction(st.session_state.user_id, row)
         st.info("Saved your top prediction to history.")
@@ -274,19 +342,21 @@ else:
          roles = [r[0] for r in results]
          confidences = [r[1] for r in results]
 
-         fig, ax = plt.subplots()
-         ax.barh(roles, confidences, color='#2E86C1')
-         ax.set_xlabel("Confidence (%)")
-         ax.set_title("Top Job Role Matches")
-         ax.invert_yaxis()  # highest at top
-         st.pyplot(fig)
+         # Cached Vega-Lite spec drawn by the browser (charts.py);
+         # EDU2JOB_CHART=png renders a cached PNG instead.
+         with metrics.timer("render.chart"):
+          if CHART_FORMAT == "png":
+            st.image(bar_chart_png(roles, confidences))
+          else:
+            st.vega_lite_chart(bar_chart_spec(roles, confidences), use_container_width=True)
       else:
         # Fallback: if model does not support predict_proba
-        prediction = model.predict(input_data)
+        with metrics.timer("inference"):
+            prediction = model.predict(features_frame(input_data))
         predicted_role = encoder.inverse_transform(prediction)[0] if encoder else prediction[0]
         st.success(f"Predicted Job Role: **{predicted_role}**")
         
-        row = input_data.iloc[0].to_dict()
+        row = dict(input_data)
         row["predicted_label"] = predicted_role
         insert_prediction(st.session_state.user_id, row)
         st.info("Saved to your history.")
@@ -295,17 +365,34 @@ else:
     st.divider()
 
     st.subheader("📚 Your Prediction History")
-    rows = fetch_history(st.session_state.user_id)
-    if rows:
-        df_hist = pd.DataFrame(rows, columns=[
-            "id","user_id","timestamp","degree","major","skill1","skill2","certification",
-            "experience_years","project_count","internship","experience_level","predicted_label"
-        ])
+    # Pages and the per-role summary are cached in this session and only
+    # refetched after this user's own writes (history_cache.py).
+    if "history_cursors" not in st.session_state:
+        st.session_state.history_cursors = []
+    summary = role_summary(st.session_state, st.session_state.user_id)
+    if summary:
+        st.caption(f"{sum(n for _, n in summary)} predictions so far")
+        st.dataframe(pd.DataFrame(summary, columns=["Predicted Role", "Count"]), hide_index=True)
+
+        cursors = st.session_state.history_cursors
+        rows, has_more = history_page(st.session_state, st.session_state.user_id,
+                                      cursors[-1] if cursors else None)
+        df_hist = pd.DataFrame(rows, columns=HISTORY_COLUMNS)
         st.dataframe(df_hist, use_container_width=True)
+
+        nav1, nav2 = st.columns(2)
+        with nav1:
+         if cursors and st.button("⬅️ Newer"):
+            cursors.pop()
+            st.rerun()
+        with nav2:
+         if has_more and st.button("Older ➡️"):
+            cursors.append(rows[-1][0])
+            st.rerun()
        
         if st.button("🗑️ Clear Prediction History"):
-          from db_helper import clear_history 
           clear_history(st.session_state.user_id)
+          st.session_state.history_cursors = []
           st.success("✅ Your prediction history has been cleared!")
           st.rerun()
     else:
@@ -321,3 +408,5 @@ else:
     if st.button("Submit Feedback "):
         insert_feedback(st.session_state.user_id, rating, comment)
         st.success(" Thank you for your valuable feedback!")
+
+metrics.observe("render.page", time.perf_counter() - _page_start)
@@ -0,0 +1,139 @@
+"""
+Batch scoring for whole candidate files.
+
+Streams a CSV or Parquet file in chunks, scores each chunk with one
+vectorized predict_proba call and appends the top-k roles to the output as
+it goes, so memory stays bounded by the chunk size.
+
+    python batch_predict.py final_high_accuracy_job_dataset.csv -o scored.csv
+    python batch_predict.py candidates.parquet -o scored.parquet --top-k 5
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_registry import DEFAULT_MODEL_PATH, load_model
+from predictor import predict_top_k
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+# -----------------------------
+# INPUT / OUTPUT
+# -----------------------------
+def is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNK_SIZE):
+    if is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize)
+
+
+class ChunkWriter:
+    """
+    Appends scored chunks to a CSV or Parquet file.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet_writer = None
+        self._wrote_header = False
+
+    def write(self, df):
+        if is_parquet(self.path):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = table.cast(self._parquet_writer.schema)
+            self._parquet_writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode="a" if self._wrote_header else "w",
+                      header=not self._wrote_header, index=False)
+            self._wrote_header = True
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# -----------------------------
+# SCORING
+# -----------------------------
+def score_chunk(model, encoder, chunk, k=3):
+    """
+    Returns `chunk` with role_i / confidence_i columns appended for the top k.
+    """
+    labels, confidences = predict_top_k(model, encoder, chunk, k)
+    scored = {}
+    for j in range(labels.shape[1]):
+        scored[f"role_{j + 1}"] = labels[:, j]
+        scored[f"confidence_{j + 1}"] = np.round(confidences[:, j], 2)
+    return pd.concat([chunk.reset_index(drop=True), pd.DataFrame(scored)], axis=1)
+
+
+def score_file(input_path, output_path, model_path=DEFAULT_MODEL_PATH,
+               chunksize=DEFAULT_CHUNK_SIZE, k=3, progress=None):
+    """
+    Scores `input_path` into `output_path` and returns throughput stats.
+    `progress`, if given, is called with (rows_done, seconds_elapsed) after
+    each chunk.
+    """
+    model, encoder = load_model(model_path)
+    rows = 0
+    start = time.perf_counter()
+    with ChunkWriter(output_path) as writer:
+        for chunk in iter_chunks(input_path, chunksize):
+            writer.write(score_chunk(model, encoder, chunk, k))
+            rows += len(chunk)
+            if progress:
+                progress(rows, time.perf_counter() - start)
+    seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else float("inf"),
+    }
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a candidate CSV/Parquet file in chunks.")
+    parser.add_argument("input", help="CSV or Parquet file with the app's nine input columns")
+    parser.add_argument("-o", "--output", required=True, help="output .csv or .parquet file")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--top-k", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    def report(rows, seconds):
+        print(f"  {rows:>10,} rows  {rows / max(seconds, 1e-9):>12,.0f} rows/sec")
+
+    stats = score_file(args.input, args.output, args.model, args.chunksize, args.top_k, report)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Latency and throughput benchmarks for the prediction path.
+
+    python -m benchmarks.run                     # writes benchmarks/results/<commit>.json
+    python -m benchmarks.run --compare old.json new.json
+
+Each run records environment metadata (commit, Python, platform, library
+versions) next to the numbers, so result files from different commits can
+be compared and regressions in the hot path show up.
+"""
@@ -0,0 +1,72 @@
+"""
+Login latency and throughput for db_helper.verify_user against a throwaway
+SQLite file. The verification cache is switched off so every login pays for
+the KDF; `cached` measures the repeat-login path separately.
+"""
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import db_helper
+import passwords
+from benchmarks.timing import measure
+
+
+def concurrent_logins(login, clients, per_client):
+    """
+    Runs `clients` threads doing `per_client` logins each and returns
+    logins/sec plus the latency percentiles seen by callers.
+    """
+    def client(_):
+        times = []
+        for _ in range(per_client):
+            start = time.perf_counter()
+            login()
+            times.append(time.perf_counter() - start)
+        return times
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        times = np.concatenate([np.asarray(t) for t in pool.map(client, range(clients))]) * 1e3
+    wall = time.perf_counter() - start
+    return {
+        "clients": clients,
+        "n": int(times.size),
+        "items_per_sec": times.size / wall,
+        "p50_ms": float(np.percentile(times, 50)),
+        "p99_ms": float(np.percentile(times, 99)),
+    }
+
+
+def run(quick=False):
+    repeats = 10 if quick else 50
+    original, original_ttl = db_helper.DB_NAME, passwords.VERIFY_CACHE_TTL
+    with tempfile.TemporaryDirectory() as tmp:
+        db_helper.DB_NAME = os.path.join(tmp, "bench.db")
+        try:
+            db_helper.init_db()
+            db_helper.register_user("bench", "bench@example.com", "bench")
+            passwords.VERIFY_CACHE_TTL = 0
+            login = lambda: db_helper.verify_user("bench", "bench")
+            results = {
+                "config": {"log2_n": passwords.SCRYPT_LOG2_N, "r": passwords.SCRYPT_R,
+                           "p": passwords.SCRYPT_P, "kdf_workers": passwords.KDF_WORKERS},
+                "login": measure(login, repeats=repeats, warmup=1),
+                "unknown_user": measure(lambda: db_helper.verify_user("nobody", "bench"),
+                                        repeats=repeats, warmup=1),
+                "concurrent": {
+                    str(clients): concurrent_logins(login, clients, 3 if quick else 10)
+                    for clients in (1, 4, 16)
+                },
+            }
+            passwords.VERIFY_CACHE_TTL = original_ttl
+            results["cached"] = measure(login, repeats=repeats * 10)
+            return results
+        finally:
+            passwords.VERIFY_CACHE_TTL = original_ttl
+            passwords.clear_verify_cache()
+            db_helper.close_all_connections()
+            db_helper.DB_NAME = original
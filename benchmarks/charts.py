@@ -0,0 +1,52 @@
+"""
+Per-prediction chart cost: the old pyplot figure versus charts.py.
+"""
+import tracemalloc
+
+from benchmarks.timing import measure
+from charts import bar_chart_png, bar_chart_spec
+
+ROLES = ["Data Analyst", "Data Scientist", "ML Engineer"]
+CONFIDENCES = [61.25, 22.4, 9.1]
+
+
+def _pyplot_figure():
+    # What app.py did before: a fresh figure per prediction, never closed.
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    ax.barh(ROLES, CONFIDENCES, color="#2E86C1")
+    ax.set_xlabel("Confidence (%)")
+    ax.set_title("Top Job Role Matches")
+    ax.invert_yaxis()
+    fig.canvas.draw()
+
+
+def _allocated_kib(fn, calls):
+    tracemalloc.start()
+    for _ in range(calls):
+        fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / 1024
+
+
+def run(quick=False):
+    repeats = 10 if quick else 50
+    results = {
+        "pyplot_figure": measure(_pyplot_figure, repeats=repeats),
+        "vega_spec_cached": measure(lambda: bar_chart_spec(ROLES, CONFIDENCES), repeats=repeats * 20),
+        "png_cached": measure(lambda: bar_chart_png(ROLES, CONFIDENCES), repeats=repeats * 20),
+    }
+    # Memory still held after `repeats` renders of the same chart.
+    results["retained_kib"] = {
+        "pyplot_figure": _allocated_kib(_pyplot_figure, repeats),
+        "vega_spec_cached": _allocated_kib(lambda: bar_chart_spec(ROLES, CONFIDENCES), repeats),
+    }
+    import matplotlib.pyplot as plt
+
+    plt.close("all")
+    return results
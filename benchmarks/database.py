@@ -0,0 +1,39 @@
+"""
+db_helper insert and fetch rates against a throwaway SQLite file.
+"""
+import os
+import tempfile
+
+import db_helper
+from benchmarks.timing import measure, throughput
+from benchmarks.prediction import SAMPLE_PROFILE
+
+
+def run(quick=False):
+    inserts = 200 if quick else 2000
+    original = db_helper.DB_NAME
+    with tempfile.TemporaryDirectory() as tmp:
+        db_helper.DB_NAME = os.path.join(tmp, "bench.db")
+        try:
+            db_helper.init_db()
+            db_helper.register_user("bench", "bench@example.com", "bench")
+            user_id = db_helper.verify_user("bench", "bench")
+            row = dict(SAMPLE_PROFILE, predicted_label="Data Analyst")
+
+            def insert_many():
+                for _ in range(inserts):
+                    db_helper.insert_prediction(user_id, row)
+                # Count the commit, not just the enqueue, when write-behind is on.
+                db_helper.flush_writes()
+
+            return {
+                "insert_prediction": throughput(insert_many, items=inserts, repeats=3, warmup=0),
+                "fetch_history_100": measure(lambda: db_helper.fetch_history(user_id, 100),
+                                             repeats=50 if quick else 500),
+                "insert_feedback": measure(lambda: db_helper.insert_feedback(user_id, 5, "ok"),
+                                           repeats=50 if quick else 500),
+            }
+        finally:
+            db_helper.flush_writes()
+            db_helper.close_all_connections()
+            db_helper.DB_NAME = original
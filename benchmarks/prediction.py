@@ -0,0 +1,55 @@
+"""
+Model loading, inference latency and batch throughput.
+"""
+import pandas as pd
+
+from benchmarks.timing import measure, throughput
+from model_registry import DEFAULT_MODEL_PATH, load_artifact, unpack_model
+from predictor import FEATURE_COLUMNS, features_frame, predict_top_k
+
+DEFAULT_DATA_PATH = "final_high_accuracy_job_dataset.csv"
+BATCH_SIZES = (1, 100, 10_000)
+
+SAMPLE_PROFILE = {
+    "Degree": "B.Tech", "Major": "CS", "Skill1": "Python", "Skill2": "SQL",
+    "Certification": "Data Analyst", "ExperienceYears": 2, "ProjectCount": 3,
+    "Internship": "Yes", "ExperienceLevel": "Beginner",
+}
+
+
+def sample_rows(n, data_path=DEFAULT_DATA_PATH):
+    df = pd.read_csv(data_path, usecols=FEATURE_COLUMNS)
+    return features_frame(df.sample(n=n, replace=len(df) < n, random_state=42).reset_index(drop=True))
+
+
+def app_style_frame(profile=SAMPLE_PROFILE):
+    # The one-row DataFrame app.py used to build on every prediction.
+    return pd.DataFrame({col: [value] for col, value in profile.items()})
+
+
+def run(model_path=DEFAULT_MODEL_PATH, data_path=DEFAULT_DATA_PATH, quick=False):
+    repeats = 20 if quick else 200
+    results = {
+        # Uncached load, as every Streamlit rerun paid before the registry.
+        "model_load": measure(lambda: load_artifact(model_path), repeats=3 if quick else 10, warmup=1),
+    }
+    model, encoder = unpack_model(load_artifact(model_path))
+
+    results["frame_construction"] = {
+        "app_dataframe": measure(app_style_frame, repeats=repeats * 5),
+        "features_frame": measure(lambda: features_frame(SAMPLE_PROFILE), repeats=repeats * 5),
+    }
+
+    single = features_frame(SAMPLE_PROFILE)
+    results["single_row"] = {
+        "predict_proba": measure(lambda: model.predict_proba(single), repeats=repeats),
+        "predict_top_k": measure(lambda: predict_top_k(model, encoder, SAMPLE_PROFILE, k=3), repeats=repeats),
+    }
+
+    rows = sample_rows(max(BATCH_SIZES), data_path)
+    results["batch"] = {}
+    for size in BATCH_SIZES:
+        batch = rows.iloc[:size]
+        results["batch"][str(size)] = throughput(
+            lambda: predict_top_k(model, encoder, batch, k=3), items=size, repeats=3 if quick else 10)
+    return results
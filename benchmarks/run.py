@@ -0,0 +1,137 @@
+"""
+Runs the benchmark suite and writes (or compares) JSON result files.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from importlib import metadata
+
+from model_registry import DEFAULT_MODEL_PATH
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+TRACKED_PACKAGES = ("numpy", "pandas", "scikit-learn", "xgboost", "joblib")
+
+# Metrics where a larger number is better; everything else is a latency.
+HIGHER_IS_BETTER = ("items_per_sec",)
+
+
+# -----------------------------
+# METADATA
+# -----------------------------
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    versions = {}
+    for name in TRACKED_PACKAGES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+# -----------------------------
+# COMPARISON
+# -----------------------------
+def flatten(results, prefix=""):
+    out = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            out.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            out[name] = value
+    return out
+
+
+def compare(old, new, threshold=0.10):
+    """
+    Returns [(metric, old, new, relative_change, regressed)] for the p50
+    latencies and throughputs present in both result files.
+    """
+    a, b = flatten(old["results"]), flatten(new["results"])
+    rows = []
+    for metric in sorted(a.keys() & b.keys()):
+        if not metric.endswith(("p50_ms",) + HIGHER_IS_BETTER) or not a[metric]:
+            continue
+        change = (b[metric] - a[metric]) / a[metric]
+        worse = -change if metric.endswith(HIGHER_IS_BETTER) else change
+        rows.append((metric, a[metric], b[metric], change, worse > threshold))
+    return rows
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the EDU2JOB prediction-path benchmarks.")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--data", default="final_high_accuracy_job_dataset.csv")
+    parser.add_argument("-o", "--output", help=f"result file (default: {RESULTS_DIR}/<commit>.json)")
+    parser.add_argument("--quick", action="store_true", help="fewer repetitions, for smoke runs")
+    parser.add_argument("--skip-db", action="store_true")
+    parser.add_argument("--skip-auth", action="store_true")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two result files instead of running")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default 0.10)")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        rows = compare(old, new, args.threshold)
+        print(f"{old['environment']['commit']} -> {new['environment']['commit']}")
+        for metric, a, b, change, regressed in rows:
+            flag = "  REGRESSION" if regressed else ""
+            print(f"{metric:<60} {a:>12.3f} {b:>12.3f} {change:>+8.1%}{flag}")
+        return 1 if any(r[4] for r in rows) else 0
+
+    from benchmarks import auth, charts, database, prediction
+
+    results = {"prediction": prediction.run(args.model, args.data, args.quick)}
+    results["charts"] = charts.run(args.quick)
+    if not args.skip_db:
+        results["database"] = database.run(args.quick)
+    if not args.skip_auth:
+        results["auth"] = auth.run(args.quick)
+
+    report = {"environment": environment(), "config": vars(args), "results": results}
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['environment']['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    single = results["prediction"]["single_row"]["predict_top_k"]
+    print(f"single-row predict_top_k p50 {single['p50_ms']:.3f} ms, p99 {single['p99_ms']:.3f} ms")
+    for size, stats in results["prediction"]["batch"].items():
+        print(f"batch {size:>6}: {stats['items_per_sec']:,.0f} rows/sec")
+    if "auth" in results:
+        login = results["auth"]["login"]
+        print(f"login p50 {login['p50_ms']:.1f} ms, p99 {login['p99_ms']:.1f} ms")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""
+Small timing helpers shared by the benchmark modules.
+"""
+import time
+
+import numpy as np
+
+
+def measure(fn, repeats=100, warmup=3):
+    """
+    Calls fn() `warmup` times untimed, then `repeats` times, and returns
+    latency statistics in milliseconds.
+    """
+    for _ in range(warmup):
+        fn()
+    times = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times[i] = time.perf_counter() - start
+    times *= 1e3
+    return {
+        "n": repeats,
+        "mean_ms": float(times.mean()),
+        "min_ms": float(times.min()),
+        "p50_ms": float(np.percentile(times, 50)),
+        "p90_ms": float(np.percentile(times, 90)),
+        "p99_ms": float(np.percentile(times, 99)),
+    }
+
+
+def throughput(fn, items, repeats=5, warmup=1):
+    """
+    Like measure(), plus items/sec based on the median call.
+    """
+    stats = measure(fn, repeats, warmup)
+    stats["items"] = items
+    stats["items_per_sec"] = items / (stats["p50_ms"] / 1e3) if stats["p50_ms"] > 0 else float("inf")
+    return stats
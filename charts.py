@@ -0,0 +1,95 @@
+"""
+Chart rendering for the top-k prediction bar chart.
+
+app.py used to build a new pyplot figure for every prediction and never
+close it, so figures piled up across reruns and every chart paid for Agg
+rasterization. By default the chart is now a Vega-Lite spec that the browser
+draws as vector graphics. A PNG fallback renders into one reusable
+matplotlib Figure that is not registered with pyplot, so nothing leaks.
+Both outputs are cached per (roles, confidences).
+"""
+import copy
+import io
+import threading
+from functools import lru_cache
+
+BAR_COLOR = "#2E86C1"
+CACHE_SIZE = 512
+
+
+def _key(roles, confidences):
+    # Confidences are displayed with two decimals, so cache at that precision.
+    return tuple(str(r) for r in roles), tuple(round(float(c), 2) for c in confidences)
+
+
+# -----------------------------
+# VEGA-LITE
+# -----------------------------
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached_spec(roles, confidences):
+    return {
+        "title": "Top Job Role Matches",
+        "data": {"values": [{"role": r, "confidence": c} for r, c in zip(roles, confidences)]},
+        "mark": {"type": "bar", "color": BAR_COLOR},
+        "encoding": {
+            # Keep the input order (best first) from top to bottom.
+            "y": {"field": "role", "type": "nominal", "sort": None, "title": None},
+            "x": {"field": "confidence", "type": "quantitative", "title": "Confidence (%)"},
+            "tooltip": [{"field": "role"}, {"field": "confidence", "format": ".2f"}],
+        },
+    }
+
+
+def bar_chart_spec(roles, confidences):
+    """
+    Vega-Lite spec for a horizontal bar chart of the top roles, for
+    st.vega_lite_chart. Returns a copy, so callers may modify it.
+    """
+    return copy.deepcopy(_cached_spec(*_key(roles, confidences)))
+
+
+# -----------------------------
+# PNG FALLBACK
+# -----------------------------
+_figure_lock = threading.Lock()
+_figure = None
+
+
+def _template():
+    # Called with the lock held. matplotlib.figure.Figure is not tracked by
+    # pyplot, so it is never kept alive by the global figure manager.
+    global _figure
+    if _figure is None:
+        from matplotlib.figure import Figure
+
+        _figure = Figure(figsize=(6.4, 3.2), dpi=100)
+        _figure.add_subplot()
+    return _figure
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _cached_png(roles, confidences):
+    with _figure_lock:
+        fig = _template()
+        ax = fig.axes[0]
+        ax.clear()
+        ax.barh(roles, confidences, color=BAR_COLOR)
+        ax.set_xlabel("Confidence (%)")
+        ax.set_title("Top Job Role Matches")
+        ax.invert_yaxis()  # highest at top
+        fig.tight_layout()
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png")
+        ax.clear()
+    return buf.getvalue()
+
+
+def bar_chart_png(roles, confidences):
+    """
+    PNG bytes of the same chart, for st.image.
+    """
+    return _cached_png(*_key(roles, confidences))
+
+
+def cache_info():
+    return {"spec": _cached_spec.cache_info()._asdict(), "png": _cached_png.cache_info()._asdict()}
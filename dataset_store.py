@@ -0,0 +1,179 @@
+"""
+Columnar Parquet store for the pipeline's CSV snapshots.
+
+Each stage (candidate_job_role.csv, cleaned_dataset.csv, ...,
+final_high_accuracy_job_dataset.csv) is converted once to
+data_store/<stage>.parquet, on first access or whenever the CSV is newer,
+and is read from there afterwards:
+
+- Columns are typed: ints, floats and booleans are inferred once, at
+  conversion.
+- Parquet dictionary-encodes values on disk. String columns are read back
+  as Arrow dictionaries, which become pandas Categoricals.
+- Only the requested columns are read. Filters are checked against
+  row-group statistics before any data is decoded.
+- Files are memory-mapped, and null-free numeric columns reach pandas and
+  NumPy without a copy.
+
+    import dataset_store
+    df = dataset_store.load("processed", columns=["qualification", "job_role"],
+                            filters=[("num_skills", ">", 0)])
+
+    python dataset_store.py convert        # convert every stage now
+"""
+import argparse
+import os
+import time
+
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+STORE_DIR = "data_store"
+STAGES = {
+    "raw": "candidate_job_role.csv",
+    "cleaned": "cleaned_dataset.csv",
+    "stage1": "dataprocessing_stage1.csv",
+    "stage2": "dataprocessing_stage2.csv",
+    "processed": "processed_dataset.csv",
+    "app": "final_high_accuracy_job_dataset.csv",
+}
+CSV_BLOCK_SIZE = 1 << 24          # bytes per streamed CSV block
+ROW_GROUP_SIZE = 128 * 1024       # rows; the unit predicate pushdown can skip
+COMPRESSION = "zstd"
+
+
+# -----------------------------
+# PATHS
+# -----------------------------
+def resolve(stage):
+    """
+    Returns (csv_path, parquet_path) for a stage name ("processed") or a
+    CSV path ("processed_dataset.csv").
+    """
+    csv_path = STAGES.get(stage, stage)
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return csv_path, os.path.join(STORE_DIR, f"{name}.parquet")
+
+
+def _is_stale(csv_path, parquet_path):
+    if not os.path.exists(parquet_path):
+        return True
+    return os.path.exists(csv_path) and os.path.getmtime(csv_path) > os.path.getmtime(parquet_path)
+
+
+# -----------------------------
+# CONVERSION
+# -----------------------------
+def convert(stage, force=False):
+    """
+    Streams the stage's CSV into Parquet, one CSV block at a time, and swaps
+    the file in atomically. Returns the Parquet path. Does nothing when the
+    Parquet file is already current, unless `force` is set.
+    """
+    csv_path, parquet_path = resolve(stage)
+    if not force and not _is_stale(csv_path, parquet_path):
+        return parquet_path
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(csv_path)
+
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    reader = pv.open_csv(
+        csv_path,
+        read_options=pv.ReadOptions(block_size=CSV_BLOCK_SIZE),
+        # Spreadsheet round-trips left TRUE/FALSE in some files.
+        convert_options=pv.ConvertOptions(true_values=["True", "TRUE", "true"],
+                                          false_values=["False", "FALSE", "false"]),
+    )
+    tmp = f"{parquet_path}.tmp"
+    with pq.ParquetWriter(tmp, reader.schema, compression=COMPRESSION,
+                          use_dictionary=True, write_statistics=True) as writer:
+        for batch in reader:
+            writer.write_batch(batch, row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp, parquet_path)
+    return parquet_path
+
+
+# -----------------------------
+# READING
+# -----------------------------
+def _string_columns(schema, columns=None):
+    wanted = set(columns) if columns is not None else None
+    return [f.name for f in schema
+            if (pa.types.is_string(f.type) or pa.types.is_large_string(f.type))
+            and (wanted is None or f.name in wanted)]
+
+
+def read_table(stage, columns=None, filters=None):
+    """
+    Arrow Table for `stage` with only `columns` read. `filters` uses
+    pyarrow's DNF form, e.g. [("job_role", "in", [3, 4]), ("num_skills", ">", 0)].
+    String columns come back dictionary-encoded.
+    """
+    path = convert(stage)
+    schema = pq.read_schema(path)
+    return pq.read_table(path, columns=columns, filters=filters, memory_map=True,
+                         read_dictionary=_string_columns(schema, columns))
+
+
+def load(stage, columns=None, filters=None):
+    """
+    pandas DataFrame for `stage` (see read_table). Null-free numeric columns
+    are handed over without copying, and string columns become Categoricals.
+    """
+    table = read_table(stage, columns, filters)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def to_numpy(stage, column, filters=None):
+    """
+    One column as a NumPy array; zero-copy when it is numeric, null-free and
+    stored in a single chunk.
+    """
+    array = read_table(stage, [column], filters).column(column)
+    if array.num_chunks == 1:
+        array = array.chunk(0)
+    else:
+        array = array.combine_chunks()
+    return array.to_numpy(zero_copy_only=False)
+
+
+def scan(stage, columns=None, filter=None, batch_size=ROW_GROUP_SIZE):
+    """
+    Yields RecordBatches without materializing the whole stage. `filter` is
+    a pyarrow.dataset expression, e.g. ds.field("num_skills") > 0.
+    """
+    dataset = ds.dataset(convert(stage), format="parquet")
+    yield from dataset.to_batches(columns=columns, filter=filter, batch_size=batch_size)
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert and inspect the Parquet data store.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    conv = sub.add_parser("convert", help="convert CSV stages to Parquet")
+    conv.add_argument("stages", nargs="*", help="stage names or CSV paths (default: all)")
+    conv.add_argument("--force", action="store_true")
+    info = sub.add_parser("info", help="print schema and row groups of a stage")
+    info.add_argument("stage")
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        for stage in args.stages or list(STAGES):
+            csv_path, parquet_path = resolve(stage)
+            start = time.perf_counter()
+            convert(stage, args.force)
+            print(f"{csv_path} -> {parquet_path}: {os.path.getsize(parquet_path):,} bytes "
+                  f"({time.perf_counter() - start:.2f}s)")
+    else:
+        path = convert(args.stage)
+        meta = pq.ParquetFile(path).metadata
+        print(pq.read_schema(path))
+        print(f"{meta.num_rows} rows in {meta.num_row_groups} row group(s)")
+
+
+if __name__ == "__main__":
+    main()
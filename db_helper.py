@@ -1,35 +1,123 @@
 
 import sqlite3
 from datetime import datetime
-import hashlib
+import atexit
+import os
+import queue
+import threading
+from contextlib import contextmanager
+
+import metrics
+import passwords
+from metrics import instrumented
 
 DB_NAME = "smartland.db"
 
+# Connections are kept open and handed out from a small pool instead of being
+# opened and closed around every statement. Each pooled connection keeps its
+# own prepared-statement cache, so the fixed SQL strings below are compiled
+# once per connection rather than once per call.
+POOL_SIZE = 8
+STATEMENT_CACHE_SIZE = 128
+
+# WAL lets readers run while a write is in progress, and synchronous=NORMAL
+# only fsyncs at checkpoints instead of on every commit.
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",       # ~16 MB page cache per connection
+    "PRAGMA mmap_size=268435456",     # 256 MB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA foreign_keys=ON",
+)
+
+# insert_prediction / insert_feedback hand their rows to a background writer
+# that commits them in batches, so the commit never lands on the request
+# thread. Set EDU2JOB_WRITE_BEHIND=0 to write synchronously instead.
+WRITE_BEHIND = os.environ.get("EDU2JOB_WRITE_BEHIND", "1") != "0"
+WRITE_QUEUE_SIZE = 1024   # producers block once this many rows are pending
+WRITE_BATCH_SIZE = 256    # rows committed per transaction at most
+
+_pool = queue.LifoQueue(maxsize=POOL_SIZE)
+_pool_db_name = DB_NAME
+
 # -----------------------------
 # UTILS
 # -----------------------------
+def _connect():
+    conn = sqlite3.connect(
+        DB_NAME,
+        timeout=5,
+        check_same_thread=False,
+        cached_statements=STATEMENT_CACHE_SIZE,
+    )
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def close_all_connections():
+    """
+    Closes every idle pooled connection.
+    """
+    while True:
+        try:
+            conn = _pool.get_nowait()
+        except queue.Empty:
+            return
+        conn.close()
+
+atexit.register(close_all_connections)
+
+@contextmanager
 def get_db():
-    return sqlite3.connect(DB_NAME)
+    """
+    Borrows a tuned connection from the pool and returns it afterwards.
+    Any transaction left open by an exception is rolled back first.
+    """
+    global _pool_db_name
+    if _pool_db_name != DB_NAME:
+        # DB_NAME was repointed (e.g. by a script or test); drop stale connections.
+        close_all_connections()
+        _pool_db_name = DB_NAME
+
+    try:
+        conn = _pool.get_nowait()
+    except queue.Empty:
+        conn = _connect()
+
+    try:
+        yield conn
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
 
 # -----------------------------
-# INIT DB
+# SCHEMA MIGRATIONS
 # -----------------------------
-def init_db():
-    conn = get_db()
-    c = conn.cursor()
-
-    # USERS TABLE
-    c.execute("""
+# Each entry is (version, description, statements). The applied version is
+# stored in SQLite's PRAGMA user_version, so only migrations newer than the
+# database are run. Append new entries; never edit one that has shipped.
+MIGRATIONS = [
+    (1, "initial schema", [
+        # USERS TABLE
+        """
         CREATE TABLE IF NOT EXISTS users (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             username TEXT UNIQUE,
             email TEXT,
             password_hash TEXT
         )
-    """)
-
-    # PREDICTIONS TABLE
-    c.execute("""
+        """,
+        # PREDICTIONS TABLE
+        """
         CREATE TABLE IF NOT EXISTS predictions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id INTEGER,
@@ -46,10 +134,9 @@ def init_db():
             predicted_label TEXT,
             FOREIGN KEY(user_id) REFERENCES users(id)
         )
-    """)
-
-    # FEEDBACK TABLE
-    c.execute("""
+        """,
+        # FEEDBACK TABLE
+        """
         CREATE TABLE IF NOT EXISTS feedback (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id INTEGER,
@@ -58,52 +145,350 @@ def init_db():
             comments TEXT,
             FOREIGN KEY(user_id) REFERENCES users(id)
         )
-    """)
+        """,
+    ]),
+    (2, "indexes for per-user history and feedback lookups", [
+        # Serves fetch_history's ORDER BY id DESC and clear_history's DELETE.
+        "CREATE INDEX IF NOT EXISTS idx_predictions_user_id ON predictions(user_id, id DESC)",
+        # Backs the feedback(user_id) -> users(id) foreign key.
+        "CREATE INDEX IF NOT EXISTS idx_feedback_user_id ON feedback(user_id)",
+    ]),
+    (3, "per-user prediction counts maintained by triggers", [
+        # history_summary reads this instead of aggregating the user's whole
+        # history. NULL labels are stored as '' so the primary key matches.
+        """
+        CREATE TABLE IF NOT EXISTS prediction_counts (
+            user_id INTEGER NOT NULL,
+            predicted_label TEXT NOT NULL,
+            n INTEGER NOT NULL,
+            PRIMARY KEY (user_id, predicted_label)
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT OR REPLACE INTO prediction_counts (user_id, predicted_label, n)
+        SELECT user_id, COALESCE(predicted_label, ''), COUNT(*)
+        FROM predictions WHERE user_id IS NOT NULL
+        GROUP BY user_id, COALESCE(predicted_label, '')
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_prediction_counts_insert
+        AFTER INSERT ON predictions WHEN NEW.user_id IS NOT NULL
+        BEGIN
+            INSERT INTO prediction_counts (user_id, predicted_label, n)
+            VALUES (NEW.user_id, COALESCE(NEW.predicted_label, ''), 1)
+            ON CONFLICT (user_id, predicted_label) DO UPDATE SET n = n + 1;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_prediction_counts_delete
+        AFTER DELETE ON predictions WHEN OLD.user_id IS NOT NULL
+        BEGIN
+            UPDATE prediction_counts SET n = n - 1
+            WHERE user_id = OLD.user_id AND predicted_label = COALESCE(OLD.predicted_label, '');
+            DELETE FROM prediction_counts
+            WHERE user_id = OLD.user_id AND predicted_label = COALESCE(OLD.predicted_label, '') AND n <= 0;
+        END
+        """,
+    ]),
+    (4, "user roles", [
+        # Read through session_auth's user cache, so role checks need no query.
+        "ALTER TABLE users ADD COLUMN role TEXT NOT NULL DEFAULT 'user'",
+    ]),
+    (5, "incremental training runs", [
+        # One row per incremental_training.py run; the latest watermark is
+        # the highest predictions.id already consumed.
+        """
+        CREATE TABLE IF NOT EXISTS training_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            finished_at TEXT,
+            watermark INTEGER NOT NULL,
+            rows INTEGER NOT NULL,
+            artifact TEXT
+        )
+        """,
+    ]),
+    (6, "shadow evaluation results", [
+        # One row per shadowed prediction (shadow.py). Labels are stored
+        # only on disagreement, and latencies in milliseconds.
+        """
+        CREATE TABLE IF NOT EXISTS shadow_results (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ts REAL NOT NULL,
+            primary_version TEXT,
+            candidate_version TEXT,
+            agree INTEGER,
+            primary_label TEXT,
+            candidate_label TEXT,
+            primary_ms REAL,
+            candidate_ms REAL,
+            error TEXT
+        )
+        """,
+    ]),
+]
 
-    conn.commit()
-    conn.close()
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+_migrated_dbs = set()
+_migrate_lock = threading.Lock()
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn):
+    """
+    Applies every pending migration, each in its own transaction.
+    BEGIN IMMEDIATE takes the write lock up front so two processes starting
+    together cannot apply the same migration twice.
+    """
+    for version, _description, statements in MIGRATIONS:
+        if version <= schema_version(conn):
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= schema_version(conn):
+                conn.rollback()
+                continue
+            for sql in statements:
+                conn.execute(sql)
+            conn.execute(f"PRAGMA user_version = {int(version)}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+# -----------------------------
+# INIT DB
+# -----------------------------
+def init_db():
+    """
+    Brings the schema up to date. Runs the migrations once per process and
+    database file; later calls (e.g. every Streamlit rerun) return immediately.
+    """
+    if DB_NAME in _migrated_dbs:
+        return
+    with _migrate_lock:
+        if DB_NAME in _migrated_dbs:
+            return
+        with get_db() as conn:
+            migrate(conn)
+        _migrated_dbs.add(DB_NAME)
+
+# -----------------------------
+# WRITE-BEHIND QUEUE
+# -----------------------------
+_STOP = object()
+
+class WriteBehindQueue:
+    """
+    Background writer for INSERT statements. Rows are queued with the user
+    they belong to; the writer drains up to `batch_size` rows at a time and
+    commits them in one transaction. The queue is bounded, so a stalled
+    writer makes producers wait instead of growing memory (backpressure).
+
+    Pending rows are counted per user so readers can wait for their own
+    writes (see wait_for_user) without waiting for everybody else's.
+    """
+
+    def __init__(self, maxsize=WRITE_QUEUE_SIZE, batch_size=WRITE_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._cond = threading.Condition()
+        self._pending = {}
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.failed = 0
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="edu2job-db-writer", daemon=True)
+                self._thread.start()
+
+    def submit(self, user_id, sql, params):
+        self._ensure_started()
+        with self._cond:
+            self._pending[user_id] = self._pending.get(user_id, 0) + 1
+        self._queue.put((user_id, sql, params))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch):
+        try:
+            with metrics.timer("db.write_batch"):
+                try:
+                    with get_db() as conn:
+                        for _, sql, params in batch:
+                            conn.execute(sql, params)
+                        conn.commit()
+                except sqlite3.Error:
+                    # Retry row by row so one bad row does not drop the batch.
+                    for _, sql, params in batch:
+                        try:
+                            with get_db() as conn:
+                                conn.execute(sql, params)
+                                conn.commit()
+                        except sqlite3.Error as e:
+                            self.failed += 1
+                            print(f"Error writing queued row: {e}")
+            metrics.inc("db.write_behind.rows", len(batch))
+        finally:
+            with self._cond:
+                for user_id, _, _ in batch:
+                    left = self._pending.get(user_id, 0) - 1
+                    if left > 0:
+                        self._pending[user_id] = left
+                    else:
+                        self._pending.pop(user_id, None)
+                self._cond.notify_all()
+
+    def wait_for_user(self, user_id, timeout=10):
+        """
+        Blocks until every row queued for `user_id` has been committed.
+        Returns immediately when nothing is pending for that user.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: user_id not in self._pending, timeout)
+
+    def flush(self, timeout=30):
+        """
+        Blocks until every queued row has been committed.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending, timeout)
+
+    def close(self, timeout=30):
+        """
+        Flushes pending rows and stops the writer thread.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self.flush(timeout)
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+_writer = WriteBehindQueue()
+
+def flush_writes(timeout=30):
+    """
+    Waits for every queued insert to be committed.
+    """
+    return _writer.flush(timeout)
+
+# Registered after close_all_connections, so it runs first at exit.
+atexit.register(_writer.close)
+
+def _write(user_id, sql, params):
+    if WRITE_BEHIND:
+        _writer.submit(user_id, sql, params)
+    else:
+        with get_db() as conn:
+            conn.execute(sql, params)
+            conn.commit()
 
 # -----------------------------
 # USER FUNCTIONS
 # -----------------------------
 def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+    # Salted scrypt, computed on the bounded KDF pool; see passwords.py.
+    return passwords.hash_password_pooled(password)
+
+# Checked when the username is unknown, so a miss costs as much as a wrong password.
+# Computed once, on the KDF pool like every other hash.
+_DUMMY_HASH = None
+_dummy_hash_lock = threading.Lock()
 
+def _dummy_hash():
+    global _DUMMY_HASH
+    if _DUMMY_HASH is None:
+        with _dummy_hash_lock:
+            if _DUMMY_HASH is None:
+                _DUMMY_HASH = passwords.hash_password_pooled(os.urandom(16).hex())
+    return _DUMMY_HASH
+
+@instrumented("db.register_user")
 def register_user(username, email, password):
-    conn = get_db()
-    c = conn.cursor()
-    try:
-        c.execute("INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
-                  (username, email, hash_password(password)))
-        conn.commit()
-        return True
-    except sqlite3.IntegrityError:
-        return False
-    finally:
-        conn.close()
+    # Hash before taking a connection so the KDF never holds the pool.
+    password_hash = hash_password(password)
+    with get_db() as conn:
+        try:
+            conn.execute("INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+                         (username, email, password_hash))
+            conn.commit()
+            return True
+        except sqlite3.IntegrityError:
+            conn.rollback()
+            return False
 
+@instrumented("db.verify_user")
 def verify_user(username, password):
-    conn = get_db()
-    c = conn.cursor()
-    c.execute("SELECT id, password_hash FROM users WHERE username=?", (username,))
-    user = c.fetchone()
-    conn.close()
-    if user and user[1] == hash_password(password):
-        return user[0]
-    return None
+    with get_db() as conn:
+        user = conn.execute("SELECT id, password_hash FROM users WHERE username=?", (username,)).fetchone()
+    if not user:
+        passwords.verify_password_pooled(password, _dummy_hash())
+        return None
+    user_id, stored = user
+    if not passwords.verify_password_pooled(password, stored):
+        return None
+    if passwords.needs_rehash(stored):
+        _rehash(user_id, stored, password)
+    return user_id
+
+def _rehash(user_id, stored, password):
+    # Legacy SHA-256 (or outdated scrypt cost) hashes are upgraded on the
+    # first successful login. The WHERE on the old hash keeps a concurrent
+    # password change from being overwritten.
+    upgraded = hash_password(password)
+    with get_db() as conn:
+        conn.execute("UPDATE users SET password_hash=? WHERE id=? AND password_hash=?",
+                     (upgraded, user_id, stored))
+        conn.commit()
+    metrics.inc("auth.rehash")
+
+@instrumented("db.get_user")
+def get_user(user_id):
+    """
+    Returns {"id", "username", "role"} for `user_id`, or None.
+    """
+    with get_db() as conn:
+        row = conn.execute("SELECT id, username, role FROM users WHERE id=?", (user_id,)).fetchone()
+    if row is None:
+        return None
+    return {"id": row[0], "username": row[1], "role": row[2]}
 
 # -----------------------------
 # PREDICTION FUNCTIONS
 # -----------------------------
+INSERT_PREDICTION_SQL = """
+    INSERT INTO predictions (
+        user_id, timestamp, degree, major, skill1, skill2, certification,
+        experience_years, project_count, internship, experience_level, predicted_label
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+@instrumented("db.insert_prediction")
 def insert_prediction(user_id, row):
-    conn = get_db()
-    c = conn.cursor()
-    c.execute("""
-        INSERT INTO predictions (
-            user_id, timestamp, degree, major, skill1, skill2, certification,
-            experience_years, project_count, internship, experience_level, predicted_label
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
+    _write(user_id, INSERT_PREDICTION_SQL, (
         user_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         row.get("Degree"),
         row.get("Major"),
@@ -116,27 +501,82 @@ def insert_prediction(user_id, row):
         row.get("ExperienceLevel"),
         row.get("predicted_label")
     ))
-    conn.commit()
-    conn.close()
+    # Only once the row is queued (or committed): a reader that sees the new
+    # version and refetches is then guaranteed to get it.
+    _bump_history_version(user_id)
+
+# Columns shown in the history panel, in display order. user_id is implied
+# by the query and not fetched.
+HISTORY_COLUMNS = (
+    "id", "timestamp", "degree", "major", "skill1", "skill2", "certification",
+    "experience_years", "project_count", "internship", "experience_level", "predicted_label",
+)
+HISTORY_PAGE_SQL = (
+    f"SELECT {', '.join(HISTORY_COLUMNS)} FROM predictions "
+    "WHERE user_id=? AND id<? ORDER BY id DESC LIMIT ?"
+)
+
+# Bumped on every write that changes a user's history, so per-session caches
+# can tell whether what they hold is still current.
+_history_versions = {}
+_history_versions_lock = threading.Lock()
+
+def _bump_history_version(user_id):
+    with _history_versions_lock:
+        _history_versions[user_id] = _history_versions.get(user_id, 0) + 1
+
+def history_version(user_id):
+    """
+    Process-local counter of history writes for `user_id`.
+    """
+    return _history_versions.get(user_id, 0)
+
+@instrumented("db.fetch_history_page")
+def fetch_history_page(user_id, before_id=None, limit=20):
+    """
+    Keyset pagination over a user's predictions, newest first: returns up to
+    `limit` rows (HISTORY_COLUMNS) with id < `before_id`. Pass the last id
+    of one page as `before_id` for the next. Each page is a single index
+    range scan on predictions(user_id, id DESC), however deep it is.
+    """
+    _writer.wait_for_user(user_id)
+    with get_db() as conn:
+        return conn.execute(
+            HISTORY_PAGE_SQL, (user_id, before_id if before_id is not None else 2**63 - 1, limit)
+        ).fetchall()
 
+@instrumented("db.history_summary")
+def history_summary(user_id):
+    """
+    Returns [(predicted_label, count), ...] for a user, most frequent first,
+    read from the trigger-maintained prediction_counts table.
+    """
+    _writer.wait_for_user(user_id)
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT predicted_label, n FROM prediction_counts WHERE user_id=? ORDER BY n DESC, predicted_label",
+            (user_id,),
+        ).fetchall()
+    return [(label or None, n) for label, n in rows]
+
+@instrumented("db.fetch_history")
 def fetch_history(user_id, limit=100):
-    conn = get_db()
-    c = conn.cursor()
-    c.execute("SELECT * FROM predictions WHERE user_id=? ORDER BY id DESC LIMIT ?", (user_id, limit))
-    rows = c.fetchall()
-    conn.close()
-    return rows
+    # Read-your-writes: wait for this user's queued inserts, if any.
+    _writer.wait_for_user(user_id)
+    with get_db() as conn:
+        return conn.execute(
+            "SELECT * FROM predictions WHERE user_id=? ORDER BY id DESC LIMIT ?", (user_id, limit)
+        ).fetchall()
 
 # -----------------------------
 # FEEDBACK FUNCTIONS
 # -----------------------------
+@instrumented("db.insert_feedback")
 def insert_feedback(user_id, rating, comments):
-    conn = get_db()
-    c = conn.cursor()
-    c.execute("INSERT INTO feedback (user_id, timestamp, rating, comments) VALUES (?, ?, ?, ?)",
-              (user_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), rating, comments))
-    conn.commit()
-    conn.close()
+    _write(user_id, "INSERT INTO feedback (user_id, timestamp, rating, comments) VALUES (?, ?, ?, ?)",
+           (user_id, datetime.now().strftime("%Y-%m-%d %H:%M:%S"), rating, comments))
+
+@instrumented("db.clear_history")
 def clear_history(user_id):
     """
     Deletes all prediction records for a given user.
@@ -144,13 +584,86 @@ def clear_history(user_id):
     Args:
         user_id (int): The ID of the logged-in user.
     """
-    conn = get_db()
-    cursor = conn.cursor()
-    try:
-        cursor.execute("DELETE FROM predictions WHERE user_id = ?", (user_id,))
+    # Queued inserts must land before the DELETE, not after it.
+    _writer.wait_for_user(user_id)
+    with get_db() as conn:
+        try:
+            conn.execute("DELETE FROM predictions WHERE user_id = ?", (user_id,))
+            conn.commit()
+            _bump_history_version(user_id)
+        except Exception as e:
+            conn.rollback()
+            print(f"Error clearing history: {e}")
+
+# -----------------------------
+# TRAINING DATA FUNCTIONS
+# -----------------------------
+TRAINING_COLUMNS = (
+    "id", "degree", "major", "skill1", "skill2", "certification", "experience_years",
+    "project_count", "internship", "experience_level", "predicted_label", "rating",
+)
+# Feedback is per user, not per prediction, so each prediction carries its
+# user's average rating (NULL when they never rated the app).
+TRAINING_ROWS_SQL = f"""
+    SELECT {', '.join('p.' + c for c in TRAINING_COLUMNS[:-1])}, f.rating
+    FROM predictions p
+    LEFT JOIN (SELECT user_id, AVG(rating) AS rating FROM feedback GROUP BY user_id) f
+        ON f.user_id = p.user_id
+    WHERE p.id > ? ORDER BY p.id LIMIT ?
+"""
+
+@instrumented("db.fetch_training_rows")
+def fetch_training_rows(after_id=0, limit=100000):
+    """
+    Returns up to `limit` predictions with id > `after_id`, oldest first, as
+    TRAINING_COLUMNS tuples.
+    """
+    flush_writes()
+    with get_db() as conn:
+        return conn.execute(TRAINING_ROWS_SQL, (after_id, limit)).fetchall()
+
+@instrumented("db.training_watermark")
+def training_watermark():
+    """
+    Highest predictions.id consumed by a finished training run, or 0.
+    """
+    with get_db() as conn:
+        row = conn.execute("SELECT MAX(watermark) FROM training_runs").fetchone()
+    return row[0] or 0
+
+@instrumented("db.record_training_run")
+def record_training_run(watermark, rows, artifact=None):
+    with get_db() as conn:
+        conn.execute("INSERT INTO training_runs (finished_at, watermark, rows, artifact) VALUES (?, ?, ?, ?)",
+                     (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), watermark, rows, artifact))
         conn.commit()
-    except Exception as e:
-        print(f"Error clearing history: {e}")
-    finally:
-        conn.close()
 
+# -----------------------------
+# SHADOW EVALUATION FUNCTIONS
+# -----------------------------
+SHADOW_COLUMNS = (
+    "ts", "primary_version", "candidate_version", "agree", "primary_label",
+    "candidate_label", "primary_ms", "candidate_ms", "error",
+)
+
+@instrumented("db.insert_shadow_results")
+def insert_shadow_results(rows):
+    """
+    Inserts SHADOW_COLUMNS tuples in one transaction. Called from the shadow
+    worker thread in batches, so it bypasses the write-behind queue.
+    """
+    with get_db() as conn:
+        conn.executemany(
+            f"INSERT INTO shadow_results ({', '.join(SHADOW_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(SHADOW_COLUMNS))})", rows)
+        conn.commit()
+
+@instrumented("db.fetch_shadow_results")
+def fetch_shadow_results(since=0.0):
+    """
+    Returns SHADOW_COLUMNS tuples recorded at or after the `since` timestamp.
+    """
+    with get_db() as conn:
+        return conn.execute(
+            f"SELECT {', '.join(SHADOW_COLUMNS)} FROM shadow_results WHERE ts >= ? ORDER BY id", (since,)
+        ).fetchall()
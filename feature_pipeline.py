@@ -0,0 +1,144 @@
+"""
+Single versioned preprocessing-plus-model artifact for the app.
+
+The artifact bundles the categorical encoders, the numeric scaler, the
+classifier and the job-role label encoder into one object that is fitted
+once in training and unpickled once by the model registry. At inference the
+raw app inputs ("B.Tech", "Python", 3, ...) go through one fused
+ColumnTransformer pass, and predict_proba columns line up with the role
+names in `classes_`, so callers need no separate encoder.
+
+    python feature_pipeline.py final_high_accuracy_job_dataset.csv -o best_model.pkl
+"""
+import argparse
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+from xgboost import XGBClassifier
+
+from predictor import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, features_frame
+
+PIPELINE_FORMAT_VERSION = 1
+DEFAULT_TRAINING_PATH = "final_high_accuracy_job_dataset.csv"
+TARGET_COLUMN = "JobRole"
+
+
+# -----------------------------
+# BUILDING BLOCKS
+# -----------------------------
+def build_preprocessor():
+    # Unknown categories (including the app's "Select Option") encode as all
+    # zeros instead of raising. Output is kept dense: XGBoost reads absent
+    # sparse entries as missing rather than 0, and native_model.py rebuilds
+    # this exact matrix with NumPy.
+    return ColumnTransformer([
+        ("categorical", OneHotEncoder(handle_unknown="ignore", dtype=np.float32), CATEGORICAL_COLUMNS),
+        ("numeric", StandardScaler(), NUMERIC_COLUMNS),
+    ], sparse_threshold=0)
+
+
+def default_classifier():
+    return XGBClassifier(
+        n_estimators=150,
+        learning_rate=0.08,
+        max_depth=4,
+        subsample=0.8,
+        colsample_bytree=0.8,
+        eval_metric="mlogloss",
+        random_state=42,
+    )
+
+
+# -----------------------------
+# ARTIFACT
+# -----------------------------
+class JobRolePipeline:
+    """
+    Fitted preprocessing + classifier + label encoder, saved as one file.
+    """
+
+    def __init__(self, pipeline, label_encoder, metadata=None):
+        self.pipeline = pipeline
+        self.label_encoder = label_encoder
+        self.metadata = dict(metadata or {})
+        self.format_version = PIPELINE_FORMAT_VERSION
+
+    @property
+    def classes_(self):
+        # Role names in predict_proba column order.
+        return self.label_encoder.classes_
+
+    def predict_proba(self, rows):
+        return self.pipeline.predict_proba(features_frame(rows))
+
+    def predict(self, rows):
+        return self.label_encoder.inverse_transform(self.pipeline.predict(features_frame(rows)))
+
+
+def fit_pipeline(df, classifier=None, target=TARGET_COLUMN):
+    """
+    Fits encoders, scaler and classifier on `df` (the app's nine input
+    columns plus `target`) and returns a JobRolePipeline.
+    """
+    label_encoder = LabelEncoder()
+    y = label_encoder.fit_transform(df[target].astype(object))
+    pipeline = Pipeline([
+        ("preprocess", build_preprocessor()),
+        ("classifier", classifier if classifier is not None else default_classifier()),
+    ])
+    start = time.perf_counter()
+    pipeline.fit(features_frame(df), y)
+    return JobRolePipeline(pipeline, label_encoder, {
+        "trained_at": time.time(),
+        "fit_seconds": time.perf_counter() - start,
+        "rows": len(df),
+        "classifier": type(pipeline.named_steps["classifier"]).__name__,
+    })
+
+
+def as_job_role_pipeline(model, encoder=None):
+    """
+    Returns `model`, as split by model_registry.unpack_model, as a
+    JobRolePipeline. A legacy (pipeline, label_encoder) best_model.pkl is
+    wrapped, with every step before the classifier as the preprocessing.
+    Native exports and bare estimators raise ValueError.
+    """
+    if isinstance(model, JobRolePipeline):
+        return model
+    if isinstance(model, Pipeline) and encoder is not None and len(model.steps) > 1:
+        pipeline = Pipeline([("preprocess", model[:-1]), ("classifier", model.steps[-1][1])])
+        return JobRolePipeline(pipeline, encoder, {"classifier": type(pipeline.named_steps["classifier"]).__name__})
+    raise ValueError(f"expected a feature_pipeline.py artifact or a (pipeline, label_encoder) pickle, "
+                     f"not {type(model).__name__}")
+
+
+def save_pipeline(artifact, path):
+    joblib.dump(artifact, path)
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the app's preprocessing + model pipeline.")
+    parser.add_argument("data", nargs="?", default=DEFAULT_TRAINING_PATH)
+    parser.add_argument("-o", "--output", default="best_model.pkl")
+    args = parser.parse_args(argv)
+
+    # Run as a script, this file is `__main__`; fit through the importable
+    # module so the pickle references feature_pipeline.JobRolePipeline.
+    import feature_pipeline
+
+    artifact = feature_pipeline.fit_pipeline(pd.read_csv(args.data))
+    feature_pipeline.save_pipeline(artifact, args.output)
+    print(f"Fitted {artifact.metadata['classifier']} on {artifact.metadata['rows']:,} rows "
+          f"({len(artifact.classes_)} roles) in {artifact.metadata['fit_seconds']:.2f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Per-session cache for the prediction-history panel.
+
+Streamlit reruns the whole script on every widget click, so the history
+panel used to re-read up to 100 full rows each time. Pages and the per-role
+summary are kept in the session's state instead, tagged with
+db_helper.history_version(user_id); they are refetched only after this
+user's own inserts or clear_history, not after anybody else's writes.
+"""
+from db_helper import fetch_history_page, history_summary, history_version
+
+PAGE_SIZE = 20
+STATE_KEY = "_history_cache"
+
+
+def _entry(state, user_id):
+    version = history_version(user_id)
+    entry = state.get(STATE_KEY)
+    if entry is None or entry["user_id"] != user_id or entry["version"] != version:
+        entry = {"user_id": user_id, "version": version, "pages": {}, "summary": None}
+        state[STATE_KEY] = entry
+    return entry
+
+
+def history_page(state, user_id, before_id=None, page_size=PAGE_SIZE):
+    """
+    Returns (rows, has_more) for the page of `user_id`'s history that starts
+    below `before_id` (None for the newest page). `state` is any mutable
+    mapping, normally st.session_state.
+    """
+    entry = _entry(state, user_id)
+    key = (before_id, page_size)
+    if key not in entry["pages"]:
+        # One extra row tells us whether an older page exists.
+        rows = fetch_history_page(user_id, before_id, page_size + 1)
+        entry["pages"][key] = (rows[:page_size], len(rows) > page_size)
+    return entry["pages"][key]
+
+
+def role_summary(state, user_id):
+    """
+    Returns [(predicted_label, count), ...] for `user_id`, cached like pages.
+    """
+    entry = _entry(state, user_id)
+    if entry["summary"] is None:
+        entry["summary"] = history_summary(user_id)
+    return entry["summary"]
+
+
+def invalidate(state):
+    state.pop(STATE_KEY, None)
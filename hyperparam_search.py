@@ -0,0 +1,289 @@
+"""
+Config-driven hyperparameter search with successive halving.
+
+Search spaces are declared in a TOML file (search_spaces.toml) instead of
+as one pasted estimator block per configuration. For each model, n_trials
+configurations are sampled and cross-validated with a small budget
+(n_estimators = min_resource); only the best 1/eta survive to the next
+rung, where the budget is multiplied by eta, until max_resource is reached.
+The trials of a rung run in parallel on a loky process pool.
+
+Every finished trial is appended to a JSONL trial store. Re-running the
+same search skips trials that are already in the store, so an interrupted
+search resumes where it stopped. Trials are keyed by a fingerprint of the
+data, the model's fixed settings and the CV folds as well as by their
+params, so changing any of those re-runs them instead of reusing stale
+scores.
+
+    python hyperparam_search.py processed_dataset.csv --config search_spaces.toml
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed, parallel_config
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import StratifiedKFold
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+from xgboost import XGBClassifier
+
+from training_harness import DEFAULT_DATA_PATH, RANDOM_STATE, load_training_data
+
+DEFAULT_CONFIG_PATH = "search_spaces.toml"
+DEFAULT_STORE_PATH = os.path.join("search_trials", "trials.jsonl")
+
+ESTIMATORS = {
+    "xgboost": XGBClassifier,
+    "random_forest": RandomForestClassifier,
+}
+
+
+# -----------------------------
+# CONFIG
+# -----------------------------
+def load_config(path=DEFAULT_CONFIG_PATH):
+    try:
+        import tomllib
+    except ImportError:  # Python < 3.11
+        import toml
+        return toml.load(path)
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+def sample_params(space, rng):
+    """
+    Draws one configuration from a {name: distribution} table.
+    """
+    params = {}
+    for name, dist in space.items():
+        kind = dist["type"]
+        if kind == "int":
+            params[name] = int(rng.integers(dist["low"], dist["high"] + 1))
+        elif kind == "uniform":
+            params[name] = float(rng.uniform(dist["low"], dist["high"]))
+        elif kind == "loguniform":
+            params[name] = float(math.exp(rng.uniform(math.log(dist["low"]), math.log(dist["high"]))))
+        elif kind == "choice":
+            params[name] = dist["values"][int(rng.integers(len(dist["values"])))]
+        else:
+            raise ValueError(f"unknown distribution type {kind!r} for {name}")
+    return params
+
+
+def rungs(min_resource, max_resource, eta):
+    """
+    Budgets for each successive-halving rung, e.g. 40, 120, 360.
+    """
+    out = []
+    r = min_resource
+    while r < max_resource:
+        out.append(int(r))
+        r *= eta
+    out.append(int(max_resource))
+    return out
+
+
+def trial_id(model_name, params):
+    blob = json.dumps([model_name, params], sort_keys=True)
+    return hashlib.sha1(blob.encode()).hexdigest()[:12]
+
+
+def search_fingerprint(X, y, folds, model_cfg):
+    """
+    Hash of everything other than the sampled params that a trial's score
+    depends on: the training data, the CV folds (split count, seed) and the
+    model's estimator, fixed params and resource name.
+    """
+    h = hashlib.sha1()
+    for data in (X, y):
+        if hasattr(data, "iloc"):
+            names = data.columns if hasattr(data, "columns") else [data.name]
+            h.update(json.dumps([str(c) for c in names]).encode())
+            h.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+        else:
+            data = np.ascontiguousarray(data)
+            h.update(f"{data.dtype}{data.shape}".encode())
+            h.update(data.tobytes())
+    for _, test_idx in folds:
+        h.update(np.asarray(test_idx, dtype=np.int64).tobytes())
+    setup = {key: model_cfg.get(key) for key in ("estimator", "fixed", "resource")}
+    h.update(json.dumps(setup, sort_keys=True, default=str).encode())
+    return h.hexdigest()[:12]
+
+
+def build_estimator(model_cfg, params, resource_value, threads=1):
+    estimator_cls = ESTIMATORS[model_cfg["estimator"]]
+    kwargs = dict(model_cfg.get("fixed", {}))
+    kwargs.update(params)
+    kwargs[model_cfg["resource"]] = resource_value
+    kwargs["n_jobs"] = threads
+    return estimator_cls(**kwargs)
+
+
+# -----------------------------
+# TRIAL STORE
+# -----------------------------
+class TrialStore:
+    """
+    Append-only JSONL file of finished trials, keyed by
+    (model, fingerprint, trial_id, resource). Records written before
+    fingerprints existed match nothing and are refitted.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH):
+        self.path = path
+        self.records = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # partially written last line of an interrupted run
+                    self.records[self._key(rec)] = rec
+
+    @staticmethod
+    def _key(rec):
+        return rec["model"], rec.get("fingerprint"), rec["trial_id"], rec["resource"]
+
+    def get(self, model, fingerprint, tid, resource):
+        return self.records.get((model, fingerprint, tid, resource))
+
+    def add(self, rec):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "a") as f:
+            f.write(json.dumps(rec) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.records[self._key(rec)] = rec
+
+    def to_frame(self):
+        return pd.DataFrame(list(self.records.values()))
+
+
+# -----------------------------
+# EVALUATION
+# -----------------------------
+def _rows(data, idx):
+    return data.iloc[idx] if hasattr(data, "iloc") else data[idx]
+
+
+def _evaluate_trial(model_name, fingerprint, tid, params, resource_value, model_cfg, X, y, folds, threads):
+    start = time.perf_counter()
+    scores = []
+    for train_idx, test_idx in folds:
+        model = make_pipeline(StandardScaler(), build_estimator(model_cfg, params, resource_value, threads))
+        model.fit(_rows(X, train_idx), _rows(y, train_idx))
+        scores.append(model.score(_rows(X, test_idx), _rows(y, test_idx)))
+    return {
+        "model": model_name,
+        "fingerprint": fingerprint,
+        "trial_id": tid,
+        "resource": resource_value,
+        "params": params,
+        "score": float(np.mean(scores)),
+        "score_std": float(np.std(scores)),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def run_search(X, y, config=None, store_path=DEFAULT_STORE_PATH, models=None, n_jobs=None, verbose=True):
+    """
+    Runs successive halving for every model in `config` (or the subset named
+    in `models`) and returns {model_name: best_trial_record}. Trials already
+    present in the store are reused instead of refitted.
+    """
+    config = config or load_config()
+    search = config.get("search", {})
+    n_trials = search.get("n_trials", 27)
+    eta = search.get("eta", 3)
+    budgets = rungs(search.get("min_resource", 40), search.get("max_resource", 360), eta)
+    seed = search.get("seed", RANDOM_STATE)
+    folds = list(StratifiedKFold(n_splits=search.get("cv", 3), shuffle=True, random_state=seed).split(X, y))
+
+    cpus = os.cpu_count() or 1
+    workers = min(n_jobs or cpus, cpus)
+    threads = max(1, cpus // workers)
+    store = TrialStore(store_path)
+
+    best = {}
+    for model_name, model_cfg in config["models"].items():
+        if models and model_name not in models:
+            continue
+        # Seeded per model so a resumed run samples the same configurations.
+        rng = np.random.default_rng([seed, int(hashlib.sha1(model_name.encode()).hexdigest()[:8], 16)])
+        candidates = [sample_params(model_cfg["params"], rng) for _ in range(n_trials)]
+        candidates = {trial_id(model_name, p): p for p in candidates}
+        fingerprint = search_fingerprint(X, y, folds, model_cfg)
+
+        for rung, budget in enumerate(budgets):
+            results = []
+            pending = []
+            for tid, params in candidates.items():
+                rec = store.get(model_name, fingerprint, tid, budget)
+                if rec is not None:
+                    results.append(rec)
+                else:
+                    pending.append(delayed(_evaluate_trial)(
+                        model_name, fingerprint, tid, params, budget, model_cfg, X, y, folds, threads))
+
+            if pending:
+                with parallel_config(backend="loky", inner_max_num_threads=threads):
+                    for rec in Parallel(n_jobs=min(workers, len(pending)), return_as="generator_unordered")(pending):
+                        store.add(rec)
+                        results.append(rec)
+
+            results.sort(key=lambda r: r["score"], reverse=True)
+            if verbose:
+                print(f"{model_name}: rung {rung} ({model_cfg['resource']}={budget}) "
+                      f"{len(results)} trials, {len(pending)} new, best {results[0]['score']:.4f}")
+            keep = max(1, len(results) // eta) if rung < len(budgets) - 1 else 1
+            candidates = {r["trial_id"]: r["params"] for r in results[:keep]}
+
+        best[model_name] = results[0]
+    return best
+
+
+def best_estimator(config, model_name, record, X, y):
+    """
+    Refits the winning configuration of `model_name` on (X, y) with the full
+    resource budget recorded in `record`.
+    """
+    model_cfg = config["models"][model_name]
+    estimator = build_estimator(model_cfg, record["params"], record["resource"], threads=os.cpu_count() or 1)
+    return estimator.fit(X, y)
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Successive-halving hyperparameter search.")
+    parser.add_argument("data", nargs="?", default=DEFAULT_DATA_PATH)
+    parser.add_argument("--config", default=DEFAULT_CONFIG_PATH)
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="JSONL trial store (reused to resume)")
+    parser.add_argument("--model", action="append", help="only search this model (repeatable)")
+    parser.add_argument("--n-jobs", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    X, y, _ = load_training_data(args.data)
+    start = time.perf_counter()
+    best = run_search(X, y, load_config(args.config), args.store, args.model, args.n_jobs)
+    print(f"\nSearch finished in {time.perf_counter() - start:.1f}s")
+    for model_name, rec in best.items():
+        print(f"{model_name}: CV {rec['score']:.4f} ± {rec['score_std']:.4f} "
+              f"with {rec['resource']} estimators, {rec['params']}")
+
+
+if __name__ == "__main__":
+    main()
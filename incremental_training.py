@@ -0,0 +1,194 @@
+"""
+Incremental retraining of the app model from the predictions table.
+
+model_training.py always trains from scratch on the CSV snapshots. This
+script instead takes only the predictions newer than the watermark saved by
+the last run (db_helper.training_runs). It keeps the existing artifact's
+encoders and scaler frozen and updates only the classifier:
+
+- XGBoost continues boosting from the current booster (`xgb_model=`),
+  adding `rounds` trees;
+- estimators with partial_fit (SGDClassifier, ...) take one partial_fit
+  step.
+
+Each update is published as a new version in the model store
+(model_store.py). With --activate, running apps switch to it without a
+restart.
+
+The stored labels are the model's own predictions, so a row is used only
+when its user's average feedback rating is at least `min_rating`; otherwise
+the model would just be reinforcing itself. Rows still holding the form's
+"Select Option" placeholder, or labelled with roles the artifact does not
+know, are skipped. Every fetched row advances the watermark, so nothing is
+looked at twice. That includes rows whose user had not rated the app yet:
+a rating given later does not bring them back. Each run reports how many
+rows were passed over as unrated; --min-rating 0 trains on them instead.
+
+    python incremental_training.py --rounds 50 --activate
+"""
+import argparse
+import copy
+import time
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import clone
+from sklearn.pipeline import Pipeline
+
+from db_helper import (
+    TRAINING_COLUMNS, fetch_training_rows, init_db, record_training_run, training_watermark,
+)
+from feature_pipeline import JobRolePipeline, as_job_role_pipeline
+from model_registry import DEFAULT_MODEL_PATH, load_artifact, registry, unpack_model
+from model_store import MODELS_DIR, current_path, publish
+from predictor import FEATURE_COLUMNS, features_frame
+
+PLACEHOLDER = "Select Option"
+DEFAULT_ROUNDS = 50
+DEFAULT_MIN_RATING = 4.0
+
+# predictions table column -> app feature name
+DB_TO_FEATURE = dict(zip(
+    ["degree", "major", "skill1", "skill2", "certification", "experience_years",
+     "project_count", "internship", "experience_level"],
+    FEATURE_COLUMNS,
+))
+
+
+# -----------------------------
+# DATA
+# -----------------------------
+def load_base(path):
+    """
+    Loads `path` as a JobRolePipeline (see as_job_role_pipeline), so a
+    legacy best_model.pkl works as a base. Native exports and bare
+    estimators carry no fitted preprocessing and are rejected.
+    """
+    try:
+        return as_job_role_pipeline(*unpack_model(load_artifact(path)))
+    except ValueError as e:
+        raise ValueError(f"{path} cannot be updated incrementally: {e}") from None
+
+
+def training_frame(rows, classes, min_rating=DEFAULT_MIN_RATING):
+    """
+    Returns (features, labels) for the usable rows of fetch_training_rows()
+    output. `classes` are the artifact's role names.
+    """
+    df = pd.DataFrame(rows, columns=TRAINING_COLUMNS)
+    keep = df["predicted_label"].isin(classes)
+    keep &= ~df[list(DB_TO_FEATURE)].isin([PLACEHOLDER]).any(axis=1)
+    keep &= df["rating"].ge(min_rating) | (min_rating <= 0)
+    df = df[keep]
+    return df[list(DB_TO_FEATURE)].rename(columns=DB_TO_FEATURE), df["predicted_label"].to_numpy()
+
+
+# -----------------------------
+# UPDATE
+# -----------------------------
+def _continue_boosting(classifier, X, y, n_classes, rounds):
+    # XGBClassifier.fit insists on seeing every class; classes absent from
+    # this batch get one all-zero row with zero weight, which adds nothing
+    # to the gradients. The legacy best_model.pkl preprocessor emits sparse
+    # matrices, so the padding matches whichever format X is in.
+    missing = np.setdiff1d(np.arange(n_classes), y)
+    weights = np.ones(len(y), dtype=np.float32)
+    if len(missing):
+        if sparse.issparse(X):
+            X = sparse.vstack([X, sparse.csr_matrix((len(missing), X.shape[1]), dtype=X.dtype)], format="csr")
+        else:
+            X = np.vstack([X, np.zeros((len(missing), X.shape[1]), dtype=X.dtype)])
+        y = np.concatenate([y, missing])
+        weights = np.concatenate([weights, np.zeros(len(missing), dtype=np.float32)])
+    updated = clone(classifier).set_params(n_estimators=rounds)
+    updated.fit(X, y, sample_weight=weights, xgb_model=classifier.get_booster())
+    return updated.set_params(n_estimators=classifier.n_estimators + rounds)
+
+
+def update_artifact(artifact, features, labels, rounds=DEFAULT_ROUNDS):
+    """
+    Returns a new JobRolePipeline whose classifier has been updated on
+    (features, labels). The encoders and scaler are shared with `artifact`,
+    which is left unchanged.
+    """
+    preprocess = artifact.pipeline.named_steps["preprocess"]
+    classifier = artifact.pipeline.named_steps["classifier"]
+    X = preprocess.transform(features_frame(features))
+    y = artifact.label_encoder.transform(labels)
+    n_classes = len(artifact.classes_)
+
+    if hasattr(classifier, "get_booster"):
+        updated, method = _continue_boosting(classifier, X, y, n_classes, rounds), "xgb_model"
+    elif hasattr(classifier, "partial_fit"):
+        updated, method = copy.deepcopy(classifier), "partial_fit"
+        updated.partial_fit(X, y, classes=np.arange(n_classes))
+    else:
+        raise ValueError(f"{type(classifier).__name__} supports neither continued boosting nor partial_fit")
+
+    # The fitted preprocessor is reused as is; only the classifier changed.
+    pipeline = Pipeline([("preprocess", preprocess), ("classifier", updated)])
+    return JobRolePipeline(pipeline, artifact.label_encoder, dict(
+        artifact.metadata,
+        trained_at=time.time(),
+        incremental={"method": method, "rows": len(y), "rounds": rounds if method == "xgb_model" else None},
+    ))
+
+
+# -----------------------------
+# RUN
+# -----------------------------
+def run(base=None, rounds=DEFAULT_ROUNDS, min_rating=DEFAULT_MIN_RATING,
+        limit=100000, models_dir=MODELS_DIR, activate=False):
+    """
+    One incremental step. Returns a summary dict; `artifact` is None when
+    there were no usable rows. The watermark advances over every fetched
+    row, including the `unrated` ones skipped for lack of feedback. The new
+    artifact is published to the model store (model_store.py) and, with
+    `activate`, becomes the one the app serves.
+    """
+    base = base or current_path(models_dir) or DEFAULT_MODEL_PATH
+    init_db()
+    watermark = training_watermark()
+    rows = fetch_training_rows(watermark, limit)
+    if not rows:
+        return {"watermark": watermark, "fetched": 0, "used": 0, "unrated": 0, "artifact": None}
+    new_watermark = rows[-1][0]
+    unrated = sum(row[-1] is None for row in rows) if min_rating > 0 else 0
+
+    artifact = load_base(base)
+    features, labels = training_frame(rows, artifact.classes_, min_rating)
+    path = None
+    if len(labels):
+        updated = update_artifact(artifact, features, labels, rounds)
+        updated.metadata["incremental"].update(parent=registry.version(base), watermark=new_watermark)
+        path = publish(updated, models_dir, activate)
+    record_training_run(new_watermark, len(labels), path)
+    return {"watermark": new_watermark, "fetched": len(rows), "used": len(labels), "unrated": unrated,
+            "artifact": path}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Update the app model from new predictions.")
+    parser.add_argument("--base", help="artifact to continue from (default: the store's current "
+                                        f"artifact, else {DEFAULT_MODEL_PATH})")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS,
+                        help="boosting rounds to add (XGBoost only)")
+    parser.add_argument("--min-rating", type=float, default=DEFAULT_MIN_RATING,
+                        help="minimum average user rating for a prediction to count as a label "
+                             "(0 also uses unrated users)")
+    parser.add_argument("--limit", type=int, default=100000, help="maximum new rows per run")
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    parser.add_argument("--activate", action="store_true",
+                        help="point the store's `current` at the new artifact")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = run(args.base, args.rounds, args.min_rating, args.limit, args.models_dir, args.activate)
+    print(f"{summary['fetched']} new rows, {summary['used']} used, {summary['unrated']} skipped as unrated, "
+          f"watermark {summary['watermark']} ({time.perf_counter() - start:.2f}s)")
+    print(f"Published {summary['artifact']}" if summary["artifact"] else "No artifact published")
+
+
+if __name__ == "__main__":
+    main()
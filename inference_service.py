@@ -0,0 +1,319 @@
+"""
+Headless HTTP inference service for EDU2JOB.
+
+A dependency-free ASGI app that loads best_model.pkl once through the shared
+model registry and answers JSON requests, so predictions do not have to go
+through a Streamlit rerun:
+
+    GET  /health          -> {"status": "ok", "model_version": "..."}
+    GET  /metrics         -> Prometheus text (when EDU2JOB_METRICS=1)
+    POST /predict         {"Degree": "B.Tech", ...}            -> {"predictions": [...]}
+    POST /predict/batch   {"rows": [{"Degree": ...}, ...]}     -> {"predictions": [[...], ...]}
+
+Concurrent requests are micro-batched: requests arriving within a few
+milliseconds of each other are concatenated and scored with a single
+predict_proba call.
+
+    python inference_service.py --port 8502
+    uvicorn inference_service:app --port 8502
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import urllib.request
+
+import pandas as pd
+
+import metrics
+import model_store
+from model_registry import DEFAULT_MODEL_PATH, load_model, registry
+from predictor import FEATURE_COLUMNS, features_frame, predict_top_k
+
+TOP_K = 3
+MAX_BATCH_SIZE = 512
+MAX_WAIT_MS = 5
+
+
+# -----------------------------
+# MICRO-BATCHING
+# -----------------------------
+class MicroBatcher:
+    """
+    Collects DataFrames submitted by concurrent requests and scores them
+    together. A batch is flushed when it reaches `max_batch_size` rows or
+    `max_wait_ms` after its first request arrived, whichever comes first.
+    """
+
+    def __init__(self, predict_fn, max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._worker = None
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, frame):
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((frame, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        items = [await self._queue.get()]
+        rows = len(items[0][0])
+        deadline = loop.time() + self.max_wait
+        while rows < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            rows += len(item[0])
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            batch = pd.concat([frame for frame, _ in items], ignore_index=True)
+            try:
+                # predict_proba releases the GIL inside XGBoost, so run it off
+                # the event loop to keep accepting requests meanwhile.
+                labels, confidences = await loop.run_in_executor(None, self.predict_fn, batch)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            offset = 0
+            for frame, future in items:
+                n = len(frame)
+                if not future.done():
+                    future.set_result((labels[offset:offset + n], confidences[offset:offset + n]))
+                offset += n
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+
+# -----------------------------
+# REQUEST HELPERS
+# -----------------------------
+class BadRequest(Exception):
+    pass
+
+
+class RemoteInferenceError(Exception):
+    pass
+
+
+def rows_to_frame(rows):
+    if not isinstance(rows, list) or not rows or not all(isinstance(r, dict) for r in rows):
+        raise BadRequest("expected a non-empty list of feature objects")
+    for i, row in enumerate(rows):
+        missing = [c for c in FEATURE_COLUMNS if c not in row]
+        if missing:
+            raise BadRequest(f"row {i}: missing features: {', '.join(missing)}")
+        nested = [c for c in FEATURE_COLUMNS if isinstance(row[c], (dict, list))]
+        if nested:
+            raise BadRequest(f"row {i}: features must be strings or numbers: {', '.join(nested)}")
+    try:
+        return features_frame(rows)
+    except (TypeError, ValueError) as e:
+        raise BadRequest(str(e))
+
+
+def format_predictions(labels, confidences):
+    return [
+        [{"role": str(role), "confidence": round(float(conf), 2)} for role, conf in zip(row_labels, row_conf)]
+        for row_labels, row_conf in zip(labels, confidences)
+    ]
+
+
+async def read_json(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            break
+    try:
+        return json.loads(body or b"null")
+    except ValueError:
+        raise BadRequest("request body is not valid JSON")
+
+
+async def send_json(send, status, payload):
+    body = json.dumps(payload).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_text(send, status, text):
+    body = text.encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"text/plain; version=0.0.4"), (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+# -----------------------------
+# ASGI APP
+# -----------------------------
+def create_app(model_path=DEFAULT_MODEL_PATH, k=TOP_K,
+               max_batch_size=MAX_BATCH_SIZE, max_wait_ms=MAX_WAIT_MS, models_dir=None):
+    # With `models_dir`, serve whatever model_store's `current` points at and
+    # hot-swap when it moves; each batch reads the path once. Until the
+    # store has loaded an artifact (e.g. its first load failed), `model_path`
+    # is served instead.
+    if models_dir is not None:
+        watcher = model_store.watch(models_dir)
+
+        def current():
+            return watcher.path or model_path
+    else:
+        def current():
+            return model_path
+
+    def predict(frame):
+        model, encoder = load_model(current())
+        with metrics.timer("service.predict_batch"):
+            metrics.inc("service.rows", len(frame))
+            return predict_top_k(model, encoder, frame, k)
+
+    batcher = MicroBatcher(predict, max_batch_size, max_wait_ms)
+
+    async def lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                # Load the model before accepting traffic.
+                await asyncio.get_running_loop().run_in_executor(None, load_model, current())
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await batcher.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await lifespan(receive, send)
+        if scope["type"] != "http":
+            return
+
+        route = (scope["method"], scope["path"].rstrip("/") or "/")
+        try:
+            if route == ("GET", "/metrics"):
+                return await send_text(send, 200, metrics.metrics.render_prometheus())
+            if route == ("GET", "/health"):
+                return await send_json(send, 200, {"status": "ok", "model_version": registry.version(current())})
+            if route == ("POST", "/predict"):
+                frame = rows_to_frame([await read_json(receive)])
+                labels, confidences = await batcher.submit(frame)
+                return await send_json(send, 200, {"predictions": format_predictions(labels, confidences)[0]})
+            if route == ("POST", "/predict/batch"):
+                payload = await read_json(receive)
+                rows = payload.get("rows") if isinstance(payload, dict) else payload
+                frame = rows_to_frame(rows)
+                labels, confidences = await batcher.submit(frame)
+                return await send_json(send, 200, {"predictions": format_predictions(labels, confidences)})
+            return await send_json(send, 404, {"error": "not found"})
+        except BadRequest as e:
+            return await send_json(send, 400, {"error": str(e)})
+
+    return app
+
+
+app = create_app()
+
+
+# -----------------------------
+# CLIENT / EMBEDDING
+# -----------------------------
+def predict_remote(row, url, timeout=5):
+    """
+    Calls a running service's /predict and returns [(role, confidence), ...].
+    Raises RemoteInferenceError when the service is unreachable, times out
+    or answers with an error or an unexpected body.
+    """
+    request = urllib.request.Request(
+        url.rstrip("/") + "/predict",
+        data=json.dumps(row, default=lambda v: v.item() if hasattr(v, "item") else str(v)).encode(),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            predictions = json.load(response)["predictions"]
+        results = [(p["role"], p["confidence"]) for p in predictions]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        # URLError, HTTPError and timeouts are all OSErrors.
+        raise RemoteInferenceError(f"{url}: {e}") from e
+    if not results:
+        raise RemoteInferenceError(f"{url}: no predictions returned")
+    return results
+
+
+_embedded_lock = threading.Lock()
+_embedded_server = None
+
+
+def serve_in_background(host="127.0.0.1", port=8502, model_path=DEFAULT_MODEL_PATH, models_dir=None):
+    """
+    Starts the service on a daemon thread inside the current process, once.
+    Lets the Streamlit server host the API without a second process.
+    `model_path` and `models_dir` are as for create_app, so the embedded
+    service can serve the same model as its host.
+    """
+    global _embedded_server
+    import uvicorn
+
+    with _embedded_lock:
+        if _embedded_server is None:
+            service = create_app(model_path, models_dir=models_dir)
+            config = uvicorn.Config(service, host=host, port=port, log_level="warning")
+            _embedded_server = uvicorn.Server(config)
+            threading.Thread(target=_embedded_server.run, name="edu2job-inference", daemon=True).start()
+    return f"http://{host}:{port}"
+
+
+def main(argv=None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the EDU2JOB inference service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.environ.get("EDU2JOB_INFERENCE_PORT", 8502)))
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--models-dir", help="serve the model store's current artifact instead of --model")
+    parser.add_argument("--max-batch-size", type=int, default=MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=MAX_WAIT_MS)
+    args = parser.parse_args(argv)
+
+    service = create_app(args.model, TOP_K, args.max_batch_size, args.max_wait_ms, args.models_dir)
+    uvicorn.run(service, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
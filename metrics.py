@@ -0,0 +1,273 @@
+"""
+Lightweight timers and counters for the app's hot path.
+
+Off by default. When disabled, `timer()` hands back a shared no-op context
+manager and `instrumented` wrappers make one flag check before calling
+through, so instrumented code costs next to nothing. Enable with
+EDU2JOB_METRICS=1 (or metrics.enable()).
+
+Every observation is aggregated globally and, when a session id is set for
+the current thread/context, per session as well. Global aggregates can be
+rendered in Prometheus text format (GET /metrics on inference_service.py)
+or written to a JSON file periodically with EDU2JOB_METRICS_FILE.
+"""
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+PREFIX = "edu2job"
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+MAX_SESSIONS = 1000
+
+_enabled = os.environ.get("EDU2JOB_METRICS", "").lower() in ("1", "true", "yes")
+_session = contextvars.ContextVar("edu2job_metrics_session", default=None)
+_NULL_TIMER = contextlib.nullcontext()
+
+
+# -----------------------------
+# AGGREGATES
+# -----------------------------
+class _Summary:
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "total_seconds": self.total,
+            "mean_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+        }
+
+
+class _Scope:
+    __slots__ = ("timers", "counters")
+
+    def __init__(self):
+        self.timers = {}
+        self.counters = {}
+
+    def to_dict(self):
+        return {
+            "timers": {name: s.to_dict() for name, s in sorted(self.timers.items())},
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+
+class MetricsRegistry:
+    """
+    Global and per-session timers/counters. Per-session scopes are kept for
+    the MAX_SESSIONS most recently active sessions.
+    """
+
+    def __init__(self, max_sessions=MAX_SESSIONS):
+        self.max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._global = _Scope()
+        self._sessions = OrderedDict()
+        self.started_at = time.time()
+
+    def _scopes(self, session):
+        # Called with the lock held.
+        yield self._global
+        if session is not None:
+            scope = self._sessions.get(session)
+            if scope is None:
+                scope = self._sessions[session] = _Scope()
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session)
+            yield scope
+
+    def observe(self, name, seconds, session=None):
+        session = session if session is not None else _session.get()
+        with self._lock:
+            for scope in self._scopes(session):
+                summary = scope.timers.get(name)
+                if summary is None:
+                    summary = scope.timers[name] = _Summary()
+                summary.add(seconds)
+
+    def inc(self, name, value=1, session=None):
+        session = session if session is not None else _session.get()
+        with self._lock:
+            for scope in self._scopes(session):
+                scope.counters[name] = scope.counters.get(name, 0) + value
+
+    def snapshot(self, include_sessions=True):
+        with self._lock:
+            out = {"started_at": self.started_at, "global": self._global.to_dict()}
+            if include_sessions:
+                out["sessions"] = {sid: scope.to_dict() for sid, scope in self._sessions.items()}
+        return out
+
+    def session_snapshot(self, session):
+        with self._lock:
+            scope = self._sessions.get(session)
+            return scope.to_dict() if scope else _Scope().to_dict()
+
+    def render_prometheus(self):
+        """
+        Global aggregates in Prometheus text exposition format. Sessions are
+        left out to keep label cardinality bounded.
+        """
+        lines = [
+            f"# HELP {PREFIX}_operation_seconds Time spent per instrumented operation.",
+            f"# TYPE {PREFIX}_operation_seconds histogram",
+        ]
+        with self._lock:
+            timers = sorted(self._global.timers.items())
+            counters = sorted(self._global.counters.items())
+            for name, s in timers:
+                cumulative = 0
+                for bound, n in zip(BUCKETS, s.buckets):
+                    cumulative += n
+                    lines.append(f'{PREFIX}_operation_seconds_bucket{{op="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'{PREFIX}_operation_seconds_bucket{{op="{name}",le="+Inf"}} {s.count}')
+                lines.append(f'{PREFIX}_operation_seconds_sum{{op="{name}"}} {s.total}')
+                lines.append(f'{PREFIX}_operation_seconds_count{{op="{name}"}} {s.count}')
+        lines.append(f"# HELP {PREFIX}_events_total Instrumented event counters.")
+        lines.append(f"# TYPE {PREFIX}_events_total counter")
+        for name, value in counters:
+            lines.append(f'{PREFIX}_events_total{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._global = _Scope()
+            self._sessions.clear()
+            self.started_at = time.time()
+
+
+# Shared by every Streamlit session in this process.
+metrics = MetricsRegistry()
+
+
+# -----------------------------
+# INSTRUMENTATION
+# -----------------------------
+def enable(flag=True):
+    global _enabled
+    _enabled = bool(flag)
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_session(session_id):
+    """
+    Attributes observations made in the current thread/context to
+    `session_id` in addition to the global aggregates.
+    """
+    _session.set(session_id)
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        metrics.observe(self.name, time.perf_counter() - self.start)
+        if exc_type is not None:
+            metrics.inc(self.name + ".errors")
+        return False
+
+
+def timer(name):
+    """
+    Context manager that records the time spent in its block as `name`.
+    """
+    return _Timer(name) if _enabled else _NULL_TIMER
+
+
+def observe(name, seconds):
+    if _enabled:
+        metrics.observe(name, seconds)
+
+
+def inc(name, value=1):
+    if _enabled:
+        metrics.inc(name, value)
+
+
+def instrumented(name):
+    """
+    Decorator form of timer(); also counts exceptions as `name`.errors.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Timer(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# -----------------------------
+# FILE EXPORT
+# -----------------------------
+def write_metrics_file(path, registry=metrics):
+    """
+    Writes a JSON snapshot atomically, so readers never see a partial file.
+    """
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(dict(registry.snapshot(), written_at=time.time()), f)
+    os.replace(tmp, path)
+
+
+_exporter_lock = threading.Lock()
+_exporter = None
+
+
+def start_file_exporter(path, interval=15.0):
+    """
+    Starts (once per process) a daemon thread that rewrites `path` every
+    `interval` seconds.
+    """
+    global _exporter
+    with _exporter_lock:
+        if _exporter is not None:
+            return _exporter
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    write_metrics_file(path)
+                except OSError:
+                    pass
+
+        _exporter = threading.Thread(target=loop, name="edu2job-metrics-exporter", daemon=True)
+        _exporter.start()
+        return _exporter
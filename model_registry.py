@@ -0,0 +1,168 @@
+"""
+Process-wide cache for model artifacts.
+
+Streamlit re-executes app.py on every widget interaction, but imported modules
+stay loaded for the lifetime of the server process. Artifacts held here are
+therefore unpickled once and shared by every session, and are only loaded
+again when the file on disk actually changes.
+"""
+import hashlib
+import os
+import threading
+import time
+
+DEFAULT_MODEL_PATH = "best_model.pkl"
+
+
+# -----------------------------
+# UTILS
+# -----------------------------
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def current_rss_bytes():
+    """
+    Returns the resident set size of this process, or None if the platform
+    does not expose it.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def load_artifact(path):
+    """
+    Loads a model file. Native exports (*.native.json, see native_model.py)
+    only need xgboost; everything else is a joblib pickle. Both imports are
+    deferred so a process pays only for the format it actually loads.
+    """
+    from native_model import is_native_path
+
+    if is_native_path(path):
+        from native_model import load_native
+
+        return load_native(path)
+    import joblib
+
+    return joblib.load(path)
+
+
+def unpack_model(model_data):
+    """
+    Splits a loaded artifact into (model, encoder). Older best_model.pkl files
+    are a (pipeline, label_encoder) tuple; feature_pipeline.JobRolePipeline
+    and other bare estimators carry their own labels and need no encoder.
+    """
+    if isinstance(model_data, tuple):
+        model = model_data[0]
+        encoder = model_data[1] if len(model_data) > 1 else None
+    else:
+        model = model_data
+        encoder = None
+    return model, encoder
+
+
+# -----------------------------
+# REGISTRY
+# -----------------------------
+class ModelRegistry:
+    """
+    Loads each artifact once per process and reloads it only when the file's
+    mtime/size change *and* its content hash differs from the loaded copy.
+    """
+
+    def __init__(self, loader=load_artifact):
+        self._loader = loader
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _path_lock(self, key):
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def get(self, path=DEFAULT_MODEL_PATH):
+        key = os.path.abspath(path)
+        st = os.stat(key)
+        entry = self._entries.get(key)
+        if entry and entry["stat"] == (st.st_mtime_ns, st.st_size):
+            entry["hits"] += 1
+            return entry["obj"]
+
+        with self._path_lock(key):
+            # Another thread may have finished the reload while we waited.
+            st = os.stat(key)
+            entry = self._entries.get(key)
+            if entry and entry["stat"] == (st.st_mtime_ns, st.st_size):
+                entry["hits"] += 1
+                return entry["obj"]
+
+            sha = file_sha256(key)
+            if entry and entry["sha256"] == sha:
+                # Touched or copied over with identical bytes: keep the model.
+                entry["stat"] = (st.st_mtime_ns, st.st_size)
+                entry["hits"] += 1
+                return entry["obj"]
+
+            rss_before = current_rss_bytes()
+            start = time.perf_counter()
+            obj = self._loader(key)
+            load_seconds = time.perf_counter() - start
+            rss_after = current_rss_bytes()
+
+            self._entries[key] = {
+                "obj": obj,
+                "stat": (st.st_mtime_ns, st.st_size),
+                "sha256": sha,
+                "version": sha[:12],
+                "size_bytes": st.st_size,
+                "loaded_at": time.time(),
+                "load_seconds": load_seconds,
+                "load_count": (entry["load_count"] + 1) if entry else 1,
+                "total_load_seconds": (entry["total_load_seconds"] if entry else 0.0) + load_seconds,
+                "rss_delta_bytes": (rss_after - rss_before) if rss_before is not None and rss_after is not None else None,
+                "hits": 0,
+            }
+            return obj
+
+    def version(self, path=DEFAULT_MODEL_PATH):
+        """
+        Short content hash of the currently loaded artifact, loading it first
+        if needed. Useful as a cache key component.
+        """
+        self.get(path)
+        return self._entries[os.path.abspath(path)]["version"]
+
+    def invalidate(self, path=None):
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(path), None)
+
+    def stats(self):
+        """
+        Returns load-time and memory metrics for every loaded artifact.
+        """
+        out = {}
+        for key, entry in list(self._entries.items()):
+            out[key] = {k: v for k, v in entry.items() if k not in ("obj", "stat")}
+        return {"artifacts": out, "process_rss_bytes": current_rss_bytes()}
+
+
+# Shared by every Streamlit session in this process.
+registry = ModelRegistry()
+
+
+def load_model(path=DEFAULT_MODEL_PATH):
+    """
+    Returns (model, encoder) for the artifact at `path` from the shared registry.
+    """
+    return unpack_model(registry.get(path))
@@ -0,0 +1,274 @@
+"""
+Versioned model directory with an atomically switched `current` pointer.
+
+Deploying used to mean overwriting best_model.pkl and restarting Streamlit.
+Artifacts are now published as immutable files:
+
+    models/
+        best_model.20260101T120000-3f2a9c1d.pkl
+        best_model.20260102T093000-8be01f44.pkl
+        current            <- text file naming the active artifact
+
+Every write (artifact and pointer) goes to a temporary file in the same
+directory, is fsynced, renamed into place and followed by an fsync of the
+directory. A crash therefore leaves either the old state or the new one,
+never a truncated file.
+
+On the serving side, ModelWatcher polls the pointer from a daemon thread.
+It loads a newly named artifact through the shared model registry on that
+thread and only then replaces the path it serves. Requests read
+`watcher.path` once and use it throughout, so in-flight predictions keep
+the model they started with, and nobody waits on a load or has to restart.
+
+    python model_store.py publish best_model.pkl
+    python model_store.py list
+    python model_store.py activate best_model.20260101T120000-3f2a9c1d.pkl
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import threading
+import time
+
+import metrics
+from model_registry import registry
+
+MODELS_DIR = os.environ.get("EDU2JOB_MODELS_DIR", "models")
+POINTER = "current"
+ARTIFACT_PREFIX = "best_model"
+POLL_INTERVAL = float(os.environ.get("EDU2JOB_MODEL_POLL_SECONDS", 2.0))
+
+
+# -----------------------------
+# ATOMIC WRITES
+# -----------------------------
+def _fsync_dir(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # e.g. Windows, where directories cannot be opened
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path, write, mode="wb"):
+    """
+    Calls write(f) on a temporary file next to `path`, fsyncs it and renames
+    it over `path`.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, mode) as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    _fsync_dir(directory)
+
+
+# -----------------------------
+# PUBLISHING
+# -----------------------------
+def _artifact_name(tmp_path, suffix):
+    h = hashlib.sha256()
+    with open(tmp_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return f"{ARTIFACT_PREFIX}.{time.strftime('%Y%m%dT%H%M%S')}-{h.hexdigest()[:8]}{suffix}"
+
+
+def _publish(write, models_dir, activate, suffix=".pkl"):
+    os.makedirs(models_dir, exist_ok=True)
+    staging = os.path.join(models_dir, f".staging.{os.getpid()}{suffix}")
+    write_atomic(staging, write)
+    name = _artifact_name(staging, suffix)
+    os.replace(staging, os.path.join(models_dir, name))
+    _fsync_dir(models_dir)
+    if activate:
+        set_current(name, models_dir)
+    return os.path.join(models_dir, name)
+
+
+def publish(artifact, models_dir=MODELS_DIR, activate=True):
+    """
+    Pickles `artifact` into a new versioned file and, with `activate`,
+    points `current` at it. Returns the artifact path.
+    """
+    import joblib
+
+    return _publish(lambda f: joblib.dump(artifact, f), models_dir, activate)
+
+
+def publish_file(path, models_dir=MODELS_DIR, activate=True):
+    """
+    Copies an existing artifact file (e.g. best_model.pkl) into the store.
+    Native exports are rejected: the sidecar alone is not loadable, and its
+    booster is a second file.
+    """
+    # native_model.SIDECAR_SUFFIX; that module is not imported here because
+    # it pulls in pandas, which publishing a pickle does not need.
+    if str(path).endswith(".native.json"):
+        raise ValueError(f"{path} is a native export; publish the pickle it was exported from instead")
+
+    def copy(f):
+        with open(path, "rb") as src:
+            shutil.copyfileobj(src, f, 1 << 20)
+
+    return _publish(copy, models_dir, activate, os.path.splitext(path)[1] or ".pkl")
+
+
+def set_current(name, models_dir=MODELS_DIR):
+    name = os.path.basename(name)
+    if not os.path.exists(os.path.join(models_dir, name)):
+        raise FileNotFoundError(os.path.join(models_dir, name))
+    write_atomic(os.path.join(models_dir, POINTER), lambda f: f.write(name + "\n"), mode="w")
+
+
+def current_name(models_dir=MODELS_DIR):
+    try:
+        with open(os.path.join(models_dir, POINTER)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def current_path(models_dir=MODELS_DIR):
+    name = current_name(models_dir)
+    return os.path.join(models_dir, name) if name else None
+
+
+def versions(models_dir=MODELS_DIR):
+    """
+    Published artifact names, oldest first.
+    """
+    if not os.path.isdir(models_dir):
+        return []
+    return sorted(n for n in os.listdir(models_dir)
+                  if n.startswith(ARTIFACT_PREFIX + ".") and not n.endswith(".tmp"))
+
+
+# -----------------------------
+# SERVING
+# -----------------------------
+class ModelWatcher:
+    """
+    Follows `current` in `models_dir`. `path` always names an artifact that
+    is already loaded in the registry.
+    """
+
+    def __init__(self, models_dir=MODELS_DIR, interval=POLL_INTERVAL, registry=registry):
+        self.models_dir = models_dir
+        self.interval = interval
+        self.registry = registry
+        self._path = None
+        self._previous = None
+        self._failed = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return self._path
+
+    def poll(self):
+        """
+        Loads and switches to the pointed-at artifact if it changed. Returns
+        True when a swap happened.
+        """
+        with self._lock:
+            target = current_path(self.models_dir)
+            if target is None or target == self._path or target == self._failed:
+                return False
+            start = time.perf_counter()
+            try:
+                self.registry.get(target)  # the slow part, off the request path
+            except Exception as e:
+                # Keep serving the old model; retry only when the pointer moves.
+                self._failed = target
+                metrics.inc("model.swap.errors")
+                print(f"Failed to load {target}: {e}")
+                return False
+            old, self._previous = self._previous, self._path
+            self._path = target  # single reference assignment: readers see old or new
+            self._failed = None
+            metrics.observe("model.swap", time.perf_counter() - start)
+            # Keep the model just replaced for requests still using it;
+            # anything older can go.
+            if old is not None and old not in (self._previous, self._path):
+                self.registry.invalidate(old)
+            return True
+
+    def start(self):
+        if self._thread is not None:
+            return self
+        self.poll()  # serve the current model from the first request on
+
+        def loop():
+            while True:
+                time.sleep(self.interval)
+                try:
+                    self.poll()
+                except OSError:
+                    pass
+
+        self._thread = threading.Thread(target=loop, name="edu2job-model-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+
+_watchers = {}
+_watchers_lock = threading.Lock()
+
+
+def has_current(models_dir=MODELS_DIR):
+    return current_name(models_dir) is not None
+
+
+def watch(models_dir=MODELS_DIR, interval=POLL_INTERVAL):
+    """
+    Returns the process-wide, started ModelWatcher for `models_dir`.
+    """
+    key = os.path.abspath(models_dir)
+    with _watchers_lock:
+        watcher = _watchers.get(key)
+        if watcher is None:
+            watcher = _watchers[key] = ModelWatcher(models_dir, interval).start()
+        return watcher
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish and activate versioned model artifacts.")
+    parser.add_argument("--models-dir", default=MODELS_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    pub = sub.add_parser("publish", help="copy an artifact into the store")
+    pub.add_argument("artifact")
+    pub.add_argument("--no-activate", action="store_true")
+    act = sub.add_parser("activate", help="point `current` at a published artifact")
+    act.add_argument("name")
+    sub.add_parser("list", help="list published artifacts")
+    args = parser.parse_args(argv)
+
+    if args.command == "publish":
+        path = publish_file(args.artifact, args.models_dir, activate=not args.no_activate)
+        print(f"Published {path}" + ("" if args.no_activate else " (current)"))
+    elif args.command == "activate":
+        set_current(args.name, args.models_dir)
+        print(f"current -> {os.path.basename(args.name)}")
+    else:
+        active = current_name(args.models_dir)
+        for name in versions(args.models_dir):
+            print(("* " if name == active else "  ") + name)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ import pandas as pd
 import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, classification_report
+from sklearn.metrics import accuracy_score
 from sklearn.linear_model import LogisticRegression
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.ensemble import RandomForestClassifier
@@ -10,12 +10,18 @@ from sklearn.svm import SVC
 from xgboost import XGBClassifier
 from sklearn.preprocessing import LabelEncoder
 import joblib
-from sklearn.model_selection import cross_val_score
-from sklearn.model_selection import RandomizedSearchCV
 from google.colab import files
+from training_harness import compare_models
+from hyperparam_search import best_estimator, load_config, run_search
+from feature_pipeline import fit_pipeline, save_pipeline
+from native_model import export_native, measure_cold_start
+import dataset_store
+import model_store
+from skill_encoder import SkillEncoder, multi_hot_features
 
 
-df = pd.read_csv("processed_dataset.csv")
+# Typed, memory-mapped Parquet copy of the CSV, converted on first use (dataset_store.py).
+df = dataset_store.load("processed")
 
 print("Data Loaded Successfully!")
 print("Shape of dataset:", df.shape)
@@ -52,56 +58,14 @@ X_test = scaler.transform(X_test)
 
 print("Feature Scaling Done")
 
-models = {
-    "Logistic Regression": LogisticRegression(max_iter=1000, random_state=42),
-    "Decision Tree": DecisionTreeClassifier(random_state=42),
-    "Random Forest": RandomForestClassifier(random_state=42),
-    "SVM": SVC(random_state=42),
-    "XGBoost": XGBClassifier(eval_metric='mlogloss', random_state=42)
-}
-
-
-
-results = []
-
-for name, model in models.items():
-    print(f"\n Training {name}...")
-    model.fit(X_train, y_train)
-    y_pred = model.predict(X_test)
-
-    acc = accuracy_score(y_test, y_pred)
-    prec = precision_score(y_test, y_pred, average='weighted', zero_division=0)
-    rec = recall_score(y_test, y_pred, average='weighted', zero_division=0)
-    f1 = f1_score(y_test, y_pred, average='weighted', zero_division=0)
-
-    print(f"Model: {name}")
-    print(f"Accuracy: {acc:.4f}")
-    print(f"Precision: {prec:.4f}")
-    print(f"Recall: {rec:.4f}")
-    print(f"F1 Score: {f1:.4f}")
-    print("Classification Report:\n", classification_report(y_test, y_pred, zero_division=0))
-
-    results.append({
-        "Model": name,
-        "Accuracy": acc,
-        "Precision": prec,
-        "Recall": rec,
-        "F1 Score": f1
-    })
+# Baseline comparison: hold-out fits and 5-fold CV for all five models run
+# in parallel (see training_harness.py), with wall-time recorded per model.
+results_df = compare_models(X, y, cv=5)
 
-comparison_df = pd.DataFrame(results)
 print("\nModel Comparison Summary:")
-print(comparison_df)
-
-results = {
-    'Model': ['Logistic Regression', 'Decision Tree', 'Random Forest', 'SVM', 'XGBoost'],
-    'Accuracy': [0.815, 0.985, 0.975, 0.915, 0.985],
-    'Precision': [0.784, 0.986, 0.976, 0.938, 0.986],
-    'Recall': [0.815, 0.985, 0.975, 0.915, 0.985],
-    'F1 Score': [0.792, 0.985, 0.975, 0.920, 0.985]
-}
-
-results_df = pd.DataFrame(results)
+print(results_df[["Model", "Accuracy", "Precision", "Recall", "F1 Score",
+                  "CV Mean", "CV Std", "Fit Seconds"]].round(3))
+print(f"Total wall time: {results_df.attrs['wall_seconds']:.2f}s")
 
 import matplotlib.pyplot as plt
 import seaborn as sns
@@ -111,25 +75,6 @@ sns.barplot(x='Model', y='Accuracy', data=results_df)
 plt.title('Model Accuracy Comparison')
 plt.show()
 
-
-models = {
-    'Logistic Regression': LogisticRegression(max_iter=1000),
-    'Decision Tree': DecisionTreeClassifier(),
-    'Random Forest': RandomForestClassifier(),
-    'SVM': SVC(),
-    'XGBoost': XGBClassifier(eval_metric='mlogloss')
-}
-
-cv_results = {}
-
-
-for name, model in models.items():
-    scores = cross_val_score(model, X, y, cv=5, scoring='accuracy')
-    cv_results[name] = scores
-    print(f"\n{name}")
-    print(f"Fold Accuracies: {scores}")
-    print(f"Mean Accuracy: {scores.mean():.3f} ± {scores.std():.3f}")
-
 xgb_model = XGBClassifier(
     learning_rate=0.05,
     max_depth=4,
@@ -271,343 +216,23 @@ plt.show()
 
 
 
-rf_model = RandomForestClassifier(
-    n_estimators=100,       
-    max_depth=8,            
-    min_samples_split=10,  
-    min_samples_leaf=5,     
-    max_features=0.6,      
-    bootstrap=True,       
-    random_state=42
-)
-
-rf_model.fit(X_train, y_train)
-
-train_acc = rf_model.score(X_train, y_train)
-test_acc = rf_model.score(X_test, y_test)
-
-print("Random Forest — Train Accuracy:", round(train_acc, 3))
-print("Random Forest — Test Accuracy:", round(test_acc, 3))
-print("Difference:", round(train_acc - test_acc, 3))
-
-
-xgb_model = XGBClassifier(
-    n_estimators=150,        
-    learning_rate=0.08,      
-    max_depth=4,            
-    subsample=0.7,           
-    colsample_bytree=0.7,   
-    gamma=0.4,             
-    reg_alpha=0.2,           
-    reg_lambda=0.8,         
-    eval_metric='mlogloss',
-    random_state=42
-)
-
-xgb_model.fit(X_train, y_train)
-
-train_acc = xgb_model.score(X_train, y_train)
-test_acc = xgb_model.score(X_test, y_test)
-
-print("XGBoost — Train Accuracy:", round(train_acc, 3))
-print("XGBoost — Test Accuracy:", round(test_acc, 3))
-print("Difference:", round(train_acc - test_acc, 3))
-
-
-rf_model = RandomForestClassifier(
-    n_estimators=50,         
-    max_depth=5,             
-    min_samples_split=15,   
-    min_samples_leaf=10,     
-    max_features=0.4,       
-    bootstrap=True,
-    random_state=42
-)
-
-rf_model.fit(X_train, y_train)
-
-train_acc = rf_model.score(X_train, y_train)
-test_acc = rf_model.score(X_test, y_test)
-
-print("Random Forest — Train Accuracy:", round(train_acc, 3))
-print("Random Forest — Test Accuracy:", round(test_acc, 3))
-print("Difference:", round(train_acc - test_acc, 3))
-
+# Tuned XGBoost / Random Forest: successive-halving search over the spaces in
+# search_spaces.toml (see hyperparam_search.py). Finished trials are kept in
+# search_trials/, so re-running resumes instead of refitting.
+search_config = load_config("search_spaces.toml")
+best_trials = run_search(X_train, y_train, search_config)
 
-xgb_model = XGBClassifier(
-    n_estimators=100,      
-    learning_rate=0.05,  
-    max_depth=3,             
-    subsample=0.6,         
-    colsample_bytree=0.6,   
-    gamma=0.8,              
-    reg_alpha=0.5,           
-    reg_lambda=1.0,        
-    eval_metric='mlogloss',
-    random_state=42
-)
-
-xgb_model.fit(X_train, y_train)
-
-train_acc = xgb_model.score(X_train, y_train)
-test_acc = xgb_model.score(X_test, y_test)
-
-print("XGBoost — Train Accuracy:", round(train_acc, 3))
-print("XGBoost — Test Accuracy:", round(test_acc, 3))
-print("Difference:", round(train_acc - test_acc, 3))
-
-
-
-xgb_model = XGBClassifier(
-    n_estimators=50,       
-    learning_rate=0.03,    
-    max_depth=2,            
-    subsample=0.5,         
-    colsample_bytree=0.5,   
-    gamma=2.0,              
-    reg_alpha=1.0,         
-    reg_lambda=2.0,       
-    eval_metric='mlogloss',
-    random_state=42
-)
-
-xgb_model.fit(X_train, y_train)
+xgb_model = best_estimator(search_config, "xgboost", best_trials["xgboost"], X_train, y_train)
+rf_model = best_estimator(search_config, "random_forest", best_trials["random_forest"], X_train, y_train)
 
-train_acc = xgb_model.score(X_train, y_train)
-test_acc = xgb_model.score(X_test, y_test)
-
-print("XGBoost — Train Accuracy:", round(train_acc, 3))
-print("XGBoost — Test Accuracy:", round(test_acc, 3))
-print("Difference:", round(train_acc - test_acc, 3))
-
-
-xgb = XGBClassifier(eval_metric='mlogloss', random_state=42)
-
-param_dist = {
-    'n_estimators': [100, 200, 300, 400],
-    'max_depth': [3, 4, 5, 6, 7],
-    'learning_rate': [0.01, 0.05, 0.1, 0.2],
-    'subsample': [0.6, 0.8, 1.0],
-    'colsample_bytree': [0.6, 0.8, 1.0]
-}
-
-random_search = RandomizedSearchCV(
-    estimator=xgb,
-    param_distributions=param_dist,
-    n_iter=20,         
-    cv=5,
-    scoring='accuracy',
-    n_jobs=-1,
-    verbose=2,
-    random_state=42
-)
-
-random_search.fit(X_train, y_train)
-
-print("Best Parameters:", random_search.best_params_)
-print("Best Accuracy:", random_search.best_score_)
-
-models = {
-    "Logistic Regression": log_reg,
-    "Decision Tree": dt_model,
-    "Random Forest": rf_model,
-    "SVM": svm_model,
-    "XGBoost": xgb_model
-}
-
-results = []
-
-for name, model in models.items():
+for name, key, model in [("XGBoost", "xgboost", xgb_model), ("Random Forest", "random_forest", rf_model)]:
     train_acc = model.score(X_train, y_train)
     test_acc = model.score(X_test, y_test)
-    diff = train_acc - test_acc
-    results.append({
-        "Model": name,
-        "Train Accuracy": round(train_acc, 3),
-        "Test Accuracy": round(test_acc, 3),
-        "Difference": round(diff, 3)
-    })
-
-results_df = pd.DataFrame(results)
-print(results_df)
-
-
-xgb_balanced = XGBClassifier(
-    n_estimators=80,       
-    learning_rate=0.03,     
-    max_depth=2,            
-    subsample=0.6,          
-    colsample_bytree=0.6,   
-    gamma=2.0,             
-    reg_alpha=2.0,         
-    reg_lambda=5.0,         
-    eval_metric='mlogloss',
-    random_state=42
-)
-
-
-xgb_balanced.fit(X_train, y_train)
-
-
-train_acc = xgb_balanced.score(X_train, y_train)
-test_acc  = xgb_balanced.score(X_test, y_test)
-
-print("XGBoost — Train Accuracy:", round(train_acc, 3))
-print("XGBoost — Test Accuracy :", round(test_acc, 3))
-print("Difference              :", round(train_acc - test_acc, 3))
-
-
-xgb_weaker = XGBClassifier(
-    n_estimators=40,        
-    learning_rate=0.02,     
-    max_depth=1,            
-    subsample=0.5,       
-    colsample_bytree=0.5, 
-    gamma=3.0,               
-    reg_alpha=4.0,       
-    reg_lambda=10.0,         
-    eval_metric='mlogloss',
-    random_state=42
-)
-
-xgb_weaker.fit(X_train, y_train)
-
-train_acc = xgb_weaker.score(X_train, y_train)
-test_acc  = xgb_weaker.score(X_test, y_test)
-
-print("XGBoost — Train Accuracy:", round(train_acc, 3))
-print("XGBoost — Test Accuracy :", round(test_acc, 3))
-print("Difference              :", round(train_acc - test_acc, 3))
-
-
-
-xgb_final = XGBClassifier(
-    n_estimators=50,       
-    learning_rate=0.02,     
-    max_depth=2,          
-    subsample=0.7,        
-    colsample_bytree=0.6,   
-    gamma=3.0,             
-    reg_alpha=3.5,         
-    reg_lambda=8.0,        
-    eval_metric='mlogloss',
-    random_state=42
-)
-
-xgb_final.fit(X_train, y_train)
-
-train_acc = xgb_final.score(X_train, y_train)
-test_acc  = xgb_final.score(X_test, y_test)
-
-print("XGBoost — Train Accuracy:", round(train_acc, 3))
-print("XGBoost — Test Accuracy :", round(test_acc, 3))
-print("Difference              :", round(train_acc - test_acc, 3))
-
-
-xgb_target94 = XGBClassifier(
-    n_estimators=45,      
-    learning_rate=0.025,    
-    max_depth=2,           
-    subsample=0.8,       
-    colsample_bytree=0.7,   
-    gamma=2.5,             
-    reg_alpha=3.0,        
-    reg_lambda=7.0,         
-    eval_metric='mlogloss',
-    random_state=42
-)
-
-xgb_target94.fit(X_train, y_train)
-
-train_acc = xgb_target94.score(X_train, y_train)
-test_acc  = xgb_target94.score(X_test, y_test)
-
-print("XGBoost — Train Accuracy:", round(train_acc, 3))
-print("XGBoost — Test Accuracy :", round(test_acc, 3))
-print("Difference              :", round(train_acc - test_acc, 3))
 
-
-
-rf_tuned = RandomForestClassifier(
-    n_estimators=80,      
-    max_depth=4,           
-    min_samples_split=20,  
-    min_samples_leaf=8,    
-    max_features=0.5,       
-    bootstrap=True,
-    random_state=42
-)
-
-rf_tuned.fit(X_train, y_train)
-
-train_acc = rf_tuned.score(X_train, y_train)
-test_acc  = rf_tuned.score(X_test, y_test)
-
-print("Random Forest — Train Accuracy:", round(train_acc, 3))
-print("Random Forest — Test Accuracy :", round(test_acc, 3))
-print("Difference                    :", round(train_acc - test_acc, 3))
-
-
-
-rf_balanced = RandomForestClassifier(
-    n_estimators=120,      
-    max_depth=5,            
-    min_samples_split=15,   
-    min_samples_leaf=5,    
-    max_features=0.6,    
-    bootstrap=True,
-    random_state=42
-)
-
-rf_balanced.fit(X_train, y_train)
-
-train_acc = rf_balanced.score(X_train, y_train)
-test_acc  = rf_balanced.score(X_test, y_test)
-
-print("Random Forest — Train Accuracy:", round(train_acc, 3))
-print("Random Forest — Test Accuracy :", round(test_acc, 3))
-print("Difference                    :", round(train_acc - test_acc, 3))
-
-
-rf_model = RandomForestClassifier(
-    n_estimators=60,       
-    max_depth=4,            
-    min_samples_split=20,   
-    min_samples_leaf=8,    
-    max_features=0.5,       
-    bootstrap=True,
-    random_state=42
-)
-
-rf_model.fit(X_train, y_train)
-
-train_acc = rf_model.score(X_train, y_train)
-test_acc  = rf_model.score(X_test, y_test)
-
-print("Random Forest — Train Accuracy:", round(train_acc, 3))
-print("Random Forest — Test Accuracy :", round(test_acc, 3))
-print("Difference                    :", round(train_acc - test_acc, 3))
-
-
-
-rf_model = RandomForestClassifier(
-    n_estimators=40,      
-    max_depth=3,           
-    min_samples_split=25,   
-    min_samples_leaf=10, 
-    max_features=0.4,       
-    bootstrap=True,
-    random_state=42
-)
-
-rf_model.fit(X_train, y_train)
-
-train_acc = rf_model.score(X_train, y_train)
-test_acc  = rf_model.score(X_test, y_test)
-
-print("Random Forest — Train Accuracy:", round(train_acc, 3))
-print("Random Forest — Test Accuracy :", round(test_acc, 3))
-print("Difference                    :", round(train_acc - test_acc, 3))
+    print(f"{name} — Best Parameters:", best_trials[key]["params"])
+    print(f"{name} — Train Accuracy:", round(train_acc, 3))
+    print(f"{name} — Test Accuracy :", round(test_acc, 3))
+    print("Difference              :", round(train_acc - test_acc, 3))
 
 models = {
     "Logistic Regression": log_reg,
@@ -674,6 +299,53 @@ plt.show()
 
 
 
+# Skills as multi-hot columns instead of one label per skill combination
+# (skill_encoder.py): the tuned XGBoost refitted on the processed columns
+# minus skills_list, plus one sparse column per skill, on the same split.
+skill_text = dataset_store.load("cleaned", columns=["candidate_id", "skills_list"]) \
+    .set_index("candidate_id")["skills_list"].reindex(X["candidate_id"])
+skill_encoder = SkillEncoder().fit(skill_text)
+X_multi_hot = multi_hot_features(X, skill_text, skill_encoder, drop=["skills_list"])
+Xs_train, Xs_test, ys_train, ys_test = train_test_split(
+    X_multi_hot, y,
+    test_size=0.2,
+    stratify=y,
+    random_state=42
+)
+xgb_skills = XGBClassifier(
+    n_estimators=best_trials["xgboost"]["resource"],
+    eval_metric='mlogloss',
+    random_state=42,
+    **best_trials["xgboost"]["params"]
+).fit(Xs_train, ys_train)
+print(f"Multi-hot skills ({len(skill_encoder.vocabulary_)} skills, "
+      f"{X_multi_hot.nnz} stored values) — Test Accuracy:",
+      round(xgb_skills.score(Xs_test, ys_test), 3),
+      "vs label-encoded:", round(xgb_model.score(X_test, y_test), 3))
+skill_encoder.save("skill_vocabulary.json")
+
+
+# App artifact: encoders, scaler, the tuned XGBoost and the role labels in a
+# single pipeline fitted on the app's nine input columns (feature_pipeline.py).
+app_df = dataset_store.load("app")
+app_pipeline = fit_pipeline(app_df, XGBClassifier(
+    n_estimators=best_trials["xgboost"]["resource"],
+    eval_metric='mlogloss',
+    random_state=42,
+    **best_trials["xgboost"]["params"]
+))
+save_pipeline(app_pipeline, "best_model.pkl")
+print("App pipeline saved as best_model.pkl")
+# Also publish it as a new version in models/ (model_store.py); running apps
+# following models/current switch to it without a restart.
+print("Published", model_store.publish_file("best_model.pkl"))
+
+# Native booster + JSON sidecar for fast cold start (native_model.py).
+export_native(app_pipeline, "best_model")
+print("Native export saved as best_model.native.json / best_model.native.ubj")
+for path in ["best_model.pkl", "best_model.native.json"]:
+    print(path, "time-to-first-prediction:", measure_cold_start(path))
+
 joblib.dump(xgb_model, "best_xgboost_model.pkl")
 print("Model saved successfully as best_xgboost_model.pkl")
 
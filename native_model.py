@@ -0,0 +1,235 @@
+"""
+Compact native export of the app's model pipeline.
+
+A JobRolePipeline pickle pulls in pickle deserialization plus the whole
+sklearn stack on cold start. The export here writes the XGBoost booster in
+its native UBJSON format next to a small JSON sidecar that holds everything
+else the pipeline knows: role labels, one-hot categories and scaler
+statistics. Loading reads the booster file once, checks it against the
+hash recorded in the sidecar, imports only xgboost, and reproduces the
+ColumnTransformer with a few NumPy operations.
+
+    best_model.native.json   sidecar (pass this path to load_model)
+    best_model.native.ubj    booster
+
+    python native_model.py export best_model.pkl -o best_model.native
+    python native_model.py cold-start best_model.pkl best_model.native.json
+"""
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from predictor import CATEGORICAL_COLUMNS, NUMERIC_COLUMNS, features_frame
+
+NATIVE_FORMAT_VERSION = 1
+SIDECAR_SUFFIX = ".native.json"
+BOOSTER_SUFFIX = ".native.ubj"
+
+
+def is_native_path(path):
+    return str(path).endswith(SIDECAR_SUFFIX)
+
+
+def _write_atomic(path, data):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# -----------------------------
+# EXPORT
+# -----------------------------
+def export_native(artifact, prefix="best_model"):
+    """
+    Writes `prefix`.native.ubj and `prefix`.native.json for a fitted
+    JobRolePipeline whose classifier is an XGBClassifier. The sidecar is
+    written last and records the booster's hash, so a reader never pairs it
+    with a half-written booster. Returns the sidecar path.
+    """
+    pipeline = getattr(artifact, "pipeline", None)
+    if pipeline is None:
+        raise ValueError("native export needs a feature_pipeline.JobRolePipeline artifact")
+    classifier = pipeline.named_steps["classifier"]
+    if not hasattr(classifier, "get_booster"):
+        raise ValueError(f"native export supports XGBoost only, not {type(classifier).__name__}")
+
+    preprocess = pipeline.named_steps["preprocess"]
+    onehot = preprocess.named_transformers_["categorical"]
+    scaler = preprocess.named_transformers_["numeric"]
+
+    booster_path = prefix + BOOSTER_SUFFIX
+    raw = bytes(classifier.get_booster().save_raw("ubj"))
+    _write_atomic(booster_path, raw)
+
+    sidecar = {
+        "format_version": NATIVE_FORMAT_VERSION,
+        "booster_file": os.path.basename(booster_path),
+        "booster_sha256": hashlib.sha256(raw).hexdigest(),
+        "classes": [str(c) for c in artifact.classes_],
+        "categorical": {
+            col: [str(v) for v in cats] for col, cats in zip(CATEGORICAL_COLUMNS, onehot.categories_)
+        },
+        "numeric": {
+            col: {"mean": float(mean), "scale": float(scale)}
+            for col, mean, scale in zip(NUMERIC_COLUMNS, scaler.mean_, scaler.scale_)
+        },
+        "metadata": getattr(artifact, "metadata", {}),
+    }
+    sidecar_path = prefix + SIDECAR_SUFFIX
+    _write_atomic(sidecar_path, json.dumps(sidecar, indent=1, default=str).encode())
+    return sidecar_path
+
+
+# -----------------------------
+# LOAD
+# -----------------------------
+class NativeModel:
+    """
+    predict_proba-compatible wrapper around a native booster and its sidecar.
+    """
+
+    def __init__(self, booster, sidecar):
+        self.booster = booster
+        self.sidecar = sidecar
+        self.classes_ = np.asarray(sidecar["classes"], dtype=object)
+        self._categories = [pd.Index(sidecar["categorical"][col]) for col in CATEGORICAL_COLUMNS]
+        self._mean = np.array([sidecar["numeric"][col]["mean"] for col in NUMERIC_COLUMNS])
+        self._scale = np.array([sidecar["numeric"][col]["scale"] for col in NUMERIC_COLUMNS])
+        self._offsets = np.cumsum([0] + [len(c) for c in self._categories])
+        self.n_features = int(self._offsets[-1]) + len(NUMERIC_COLUMNS)
+
+    @classmethod
+    def load(cls, sidecar_path):
+        # Imported here so callers that never load a native model do not pay
+        # for xgboost at import time.
+        import xgboost
+
+        with open(sidecar_path) as f:
+            sidecar = json.load(f)
+        if sidecar.get("format_version") != NATIVE_FORMAT_VERSION:
+            raise ValueError(f"unsupported native model format {sidecar.get('format_version')!r}")
+        booster_path = os.path.join(os.path.dirname(os.path.abspath(sidecar_path)), sidecar["booster_file"])
+        with open(booster_path, "rb") as f:
+            raw = f.read()
+        # A booster from another export (or a torn copy) would still load and
+        # silently mis-label every prediction.
+        if hashlib.sha256(raw).hexdigest() != sidecar.get("booster_sha256"):
+            raise ValueError(f"{booster_path} does not match the booster_sha256 in {sidecar_path}")
+        booster = xgboost.Booster()
+        booster.load_model(bytearray(raw))
+        return cls(booster, sidecar)
+
+    def transform(self, rows):
+        """
+        Same dense matrix as the pipeline's ColumnTransformer: one-hot blocks
+        in CATEGORICAL_COLUMNS order (unknown values all zero), then the
+        standardized numeric columns.
+        """
+        frame = features_frame(rows)
+        n = len(frame)
+        out = np.zeros((n, self.n_features), dtype=np.float32)
+        row_idx = np.arange(n)
+        for col, cats, offset in zip(CATEGORICAL_COLUMNS, self._categories, self._offsets):
+            codes = cats.get_indexer(frame[col].astype(str))
+            known = codes >= 0
+            out[row_idx[known], offset + codes[known]] = 1.0
+        numeric = frame[NUMERIC_COLUMNS].to_numpy(dtype=np.float64)
+        out[:, self._offsets[-1]:] = (numeric - self._mean) / self._scale
+        return out
+
+    def predict_proba(self, rows):
+        probs = self.booster.inplace_predict(self.transform(rows))
+        if probs.ndim == 1:  # binary objective returns P(class 1) only
+            probs = np.column_stack([1 - probs, probs])
+        return probs
+
+    def predict(self, rows):
+        return self.classes_[np.argmax(self.predict_proba(rows), axis=1)]
+
+
+def load_native(sidecar_path):
+    return NativeModel.load(sidecar_path)
+
+
+# -----------------------------
+# COLD-START MEASUREMENT
+# -----------------------------
+_COLD_START_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from model_registry import load_model
+from predictor import predict_top_k
+imported = time.perf_counter()
+model, encoder = load_model(sys.argv[1])
+loaded = time.perf_counter()
+predict_top_k(model, encoder, json.loads(sys.argv[2]), k=3)
+done = time.perf_counter()
+print(json.dumps({"import_seconds": imported - start, "load_seconds": loaded - imported,
+                  "first_predict_seconds": done - loaded, "total_seconds": done - start}))
+"""
+
+SAMPLE_PROFILE = {
+    "Degree": "B.Tech", "Major": "CS", "Skill1": "Python", "Skill2": "SQL",
+    "Certification": "Data Analyst", "ExperienceYears": 2, "ProjectCount": 3,
+    "Internship": "Yes", "ExperienceLevel": "Beginner",
+}
+
+
+def measure_cold_start(model_path, repeats=3, profile=SAMPLE_PROFILE):
+    """
+    Time-to-first-prediction for `model_path` in fresh interpreters, so
+    imports and artifact loading are counted. Returns the median run.
+    """
+    runs = []
+    here = os.path.dirname(os.path.abspath(__file__))
+    for _ in range(repeats):
+        out = subprocess.run(
+            [sys.executable, "-c", _COLD_START_SNIPPET, model_path, json.dumps(profile)],
+            cwd=here, capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    runs.sort(key=lambda r: r["total_seconds"])
+    return runs[len(runs) // 2]
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export or benchmark the native model format.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="write <prefix>.native.ubj and <prefix>.native.json")
+    export.add_argument("model", nargs="?", default="best_model.pkl")
+    export.add_argument("-o", "--prefix", default="best_model")
+
+    cold = sub.add_parser("cold-start", help="measure time-to-first-prediction per artifact")
+    cold.add_argument("models", nargs="+")
+    cold.add_argument("--repeats", type=int, default=3)
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        import joblib
+
+        start = time.perf_counter()
+        sidecar = export_native(joblib.load(args.model), args.prefix)
+        print(f"Exported {args.model} -> {sidecar} in {time.perf_counter() - start:.2f}s")
+    else:
+        for path in args.models:
+            r = measure_cold_start(path, args.repeats)
+            print(f"{path:<32} import {r['import_seconds']:.3f}s  load {r['load_seconds']:.3f}s  "
+                  f"first predict {r['first_predict_seconds']:.3f}s  total {r['total_seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Salted, memory-hard password hashing.
+
+Hashes are stored as
+
+    scrypt$<log2 n>$<r>$<p>$<salt b64>$<hash b64>
+
+Older accounts still hold a bare unsalted SHA-256 hex digest; those verify
+once more and are flagged for rehashing, which db_helper.verify_user does
+right after a successful login.
+
+scrypt is deliberately expensive, so calls go through a small dedicated
+thread pool (hashlib releases the GIL while it works). The pool caps how
+many KDF runs happen at once, so a burst of logins queues up instead of
+taking every core from the Streamlit server threads. Cost and pool size
+are tunable through environment variables.
+"""
+import base64
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+SCHEME = "scrypt"
+SCRYPT_LOG2_N = int(os.environ.get("EDU2JOB_SCRYPT_LOG2_N", 14))   # n = 16384
+SCRYPT_R = int(os.environ.get("EDU2JOB_SCRYPT_R", 8))
+SCRYPT_P = int(os.environ.get("EDU2JOB_SCRYPT_P", 1))
+SALT_BYTES = 16
+HASH_BYTES = 32
+KDF_WORKERS = int(os.environ.get("EDU2JOB_KDF_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+
+# Recently verified logins skip the KDF for a short while. Entries hold a
+# keyed digest (with a per-process random key), never the password.
+VERIFY_CACHE_TTL = float(os.environ.get("EDU2JOB_VERIFY_CACHE_TTL", 60))
+VERIFY_CACHE_SIZE = 1024
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _scrypt(password, salt, log2_n, r, p):
+    n = 1 << log2_n
+    # scrypt needs ~128 * n * r bytes; leave headroom over OpenSSL's 32 MB default.
+    return hashlib.scrypt(password.encode(), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r + (1 << 20), dklen=HASH_BYTES)
+
+
+def _legacy_sha256(password):
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+# -----------------------------
+# HASH / VERIFY (calling thread)
+# -----------------------------
+def hash_password(password, log2_n=None, r=None, p=None):
+    log2_n = SCRYPT_LOG2_N if log2_n is None else log2_n
+    r = SCRYPT_R if r is None else r
+    p = SCRYPT_P if p is None else p
+    salt = secrets.token_bytes(SALT_BYTES)
+    digest = _scrypt(password, salt, log2_n, r, p)
+    return f"{SCHEME}${log2_n}${r}${p}${_b64(salt)}${_b64(digest)}"
+
+
+def needs_rehash(stored):
+    if not stored or not stored.startswith(SCHEME + "$"):
+        return True
+    try:
+        _, log2_n, r, p, _, _ = stored.split("$")
+    except ValueError:
+        return True
+    return (int(log2_n), int(r), int(p)) != (SCRYPT_LOG2_N, SCRYPT_R, SCRYPT_P)
+
+
+def verify_password(password, stored):
+    """
+    Returns True if `password` matches `stored`, in constant time with
+    respect to the hash bytes. Accepts both scrypt and legacy SHA-256 hashes.
+    """
+    if not stored:
+        return False
+    if not stored.startswith(SCHEME + "$"):
+        return hmac.compare_digest(_legacy_sha256(password), stored)
+    try:
+        _, log2_n, r, p, salt, digest = stored.split("$")
+        expected = base64.b64decode(digest)
+        actual = _scrypt(password, base64.b64decode(salt), int(log2_n), int(r), int(p))
+    except (ValueError, TypeError):
+        return False
+    return hmac.compare_digest(actual, expected)
+
+
+# -----------------------------
+# VERIFICATION CACHE
+# -----------------------------
+_cache_key = secrets.token_bytes(32)
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cache_token(password, stored):
+    # Tied to the stored hash, so a password change or rehash invalidates it.
+    return hashlib.blake2b(password.encode() + b"\0" + stored.encode(), key=_cache_key).digest()
+
+
+def _cache_hit(password, stored):
+    if VERIFY_CACHE_TTL <= 0:
+        return False
+    token = _cache_token(password, stored)
+    with _cache_lock:
+        expires = _cache.get(token)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del _cache[token]
+            return False
+        _cache.move_to_end(token)
+        return True
+
+
+def _cache_store(password, stored):
+    if VERIFY_CACHE_TTL <= 0:
+        return
+    with _cache_lock:
+        _cache[_cache_token(password, stored)] = time.monotonic() + VERIFY_CACHE_TTL
+        while len(_cache) > VERIFY_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_verify_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+# -----------------------------
+# WORKER POOL
+# -----------------------------
+_pool = ThreadPoolExecutor(max_workers=KDF_WORKERS, thread_name_prefix="edu2job-kdf")
+
+
+def hash_password_async(password):
+    """
+    Returns a Future for hash_password(password) computed on the KDF pool.
+    """
+    return _pool.submit(hash_password, password)
+
+
+def verify_password_async(password, stored):
+    """
+    Returns a Future for verify_password on the KDF pool. Recently verified
+    (password, stored) pairs resolve immediately without running the KDF.
+    """
+    if _cache_hit(password, stored):
+        future = Future()
+        future.set_result(True)
+        return future
+
+    def run():
+        ok = verify_password(password, stored)
+        if ok:
+            _cache_store(password, stored)
+        return ok
+
+    return _pool.submit(run)
+
+
+def hash_password_pooled(password, timeout=None):
+    return hash_password_async(password).result(timeout)
+
+
+def verify_password_pooled(password, stored, timeout=None):
+    return verify_password_async(password, stored).result(timeout)
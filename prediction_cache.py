@@ -0,0 +1,130 @@
+"""
+LRU/TTL cache for top-k predictions.
+
+The app's input space is small (a handful of selectbox values and two
+bounded integers), so the same profile is scored again and again. Results
+are cached per canonicalized feature tuple and model version; when the
+model registry reports a new version of the artifact, the cache is cleared.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from model_registry import DEFAULT_MODEL_PATH, load_model, registry
+from predictor import FEATURE_COLUMNS, predict_top_k
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_TTL_SECONDS = 3600
+
+
+# -----------------------------
+# UTILS
+# -----------------------------
+def canonical_key(row):
+    """
+    Returns the nine input features of `row` as a hashable tuple.
+    Strings are stripped and whole-number numerics become ints, so 3, 3.0
+    and numpy.int64(3) all map to the same entry.
+    """
+    key = []
+    for col in FEATURE_COLUMNS:
+        value = row.get(col)
+        if hasattr(value, "item"):
+            value = value.item()
+        if isinstance(value, str):
+            value = value.strip()
+        elif isinstance(value, float) and value.is_integer():
+            value = int(value)
+        key.append(value)
+    return tuple(key)
+
+
+# -----------------------------
+# CACHE
+# -----------------------------
+class PredictionCache:
+    """
+    Thread-safe LRU cache with a per-entry time-to-live. Entries are keyed on
+    (model_version, k, feature tuple).
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _check_version(self, model_version):
+        # Called with the lock held. A new artifact makes every entry stale.
+        if model_version != self._model_version:
+            if self._data:
+                self.invalidations += 1
+            self._data.clear()
+            self._model_version = model_version
+
+    def get(self, key, model_version):
+        with self._lock:
+            self._check_version(model_version)
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, model_version):
+        with self._lock:
+            self._check_version(model_version)
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "model_version": self._model_version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Shared by every Streamlit session in this process.
+prediction_cache = PredictionCache()
+
+
+def cached_predict_top_k(row, model_path=DEFAULT_MODEL_PATH, k=3, cache=prediction_cache):
+    """
+    Returns [(role, confidence), ...] for a single candidate `row` (a dict of
+    the nine input features), scoring it only on a cache miss.
+    """
+    # version() also picks up a changed artifact, which clears the cache.
+    model_version = registry.version(model_path)
+    key = (k,) + canonical_key(row)
+    results = cache.get(key, model_version)
+    if results is None:
+        model, encoder = load_model(model_path)
+        labels, confidences = predict_top_k(model, encoder, row, k)
+        results = [(str(role), float(conf)) for role, conf in zip(labels[0], confidences[0])]
+        cache.put(key, results, model_version)
+    return results
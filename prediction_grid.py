@@ -0,0 +1,246 @@
+"""
+Precomputed top-k predictions for every input the app can send.
+
+Every app.py input is a selectbox or a bounded number_input, so the whole
+response surface fits in a table. The build step enumerates the grid in
+vectorized batches through the trained model and stores the top-k class
+indices and confidences as memory-mapped .npy files. A lookup is then a
+mixed-radix index computation and two array reads, with no XGBoost call.
+
+    python prediction_grid.py --model best_model.pkl --out prediction_grid
+
+The table records the model version it was built from; lookups return None
+when that no longer matches the live artifact or when an input is outside
+the grid, and callers fall back to live inference.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_registry import DEFAULT_MODEL_PATH, load_model, registry
+from predictor import FEATURE_COLUMNS, class_labels, top_k
+
+DEFAULT_GRID_DIR = "prediction_grid"
+DEFAULT_BATCH_SIZE = 200_000
+META_FILE = "meta.json"
+LABELS_FILE = "labels.npy"
+CONFIDENCES_FILE = "confidences.npy"
+
+# Confidences are stored as hundredths of a percent, which matches the two
+# decimals the app displays.
+CONFIDENCE_SCALE = 100
+
+# The values each app.py widget can produce, in FEATURE_COLUMNS order.
+GRID_OPTIONS = {
+    "Degree": ["Select Option", "B.Tech", "M.Tech", "BCA", "MCA"],
+    "Major": ["Select Option", "AI", "CS", "IT", "ECE"],
+    "Skill1": ["Select Option", "Python", "Java", "C++"],
+    "Skill2": ["Select Option", "SQL", "HTML", "React"],
+    "Certification": ["Select Option", "AI Specialist", "Data Analyst", "Web Developer"],
+    "ExperienceYears": list(range(0, 51)),
+    "ProjectCount": list(range(0, 51)),
+    "Internship": ["Select Option", "Yes", "No"],
+    "ExperienceLevel": ["Select Option", "Beginner", "Intermediate", "Expert"],
+}
+
+
+def grid_shape(options=GRID_OPTIONS):
+    return tuple(len(options[col]) for col in FEATURE_COLUMNS)
+
+
+# -----------------------------
+# BUILD
+# -----------------------------
+def grid_batch(start, stop, options=GRID_OPTIONS):
+    """
+    Returns the candidates with flat grid indices [start, stop) as a DataFrame.
+    """
+    codes = np.unravel_index(np.arange(start, stop), grid_shape(options))
+    return pd.DataFrame({
+        col: np.asarray(options[col], dtype=object if isinstance(options[col][0], str) else np.int64)[code]
+        for col, code in zip(FEATURE_COLUMNS, codes)
+    })
+
+
+def build_grid(model_path=DEFAULT_MODEL_PATH, out_dir=DEFAULT_GRID_DIR, k=3,
+               batch_size=DEFAULT_BATCH_SIZE, options=GRID_OPTIONS, progress=None):
+    """
+    Scores the full grid and writes it to `out_dir`. meta.json is written
+    last, so a directory without it is an incomplete build and is ignored.
+    `progress`, if given, is called with (rows_done, total_rows, seconds).
+    """
+    model, encoder = load_model(model_path)
+    labels = [str(label) for label in class_labels(model, encoder)]
+    k = min(k, len(labels))
+    shape = grid_shape(options)
+    total = int(np.prod(shape))
+
+    os.makedirs(out_dir, exist_ok=True)
+    meta_path = os.path.join(out_dir, META_FILE)
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    index_dtype = np.uint8 if len(labels) <= np.iinfo(np.uint8).max + 1 else np.uint16
+    out_idx = np.lib.format.open_memmap(
+        os.path.join(out_dir, LABELS_FILE), mode="w+", dtype=index_dtype, shape=(total, k))
+    out_conf = np.lib.format.open_memmap(
+        os.path.join(out_dir, CONFIDENCES_FILE), mode="w+", dtype=np.uint16, shape=(total, k))
+
+    start_time = time.perf_counter()
+    for start in range(0, total, batch_size):
+        stop = min(start + batch_size, total)
+        probs = model.predict_proba(grid_batch(start, stop, options))
+        idx, top = top_k(probs, k)
+        out_idx[start:stop] = idx
+        out_conf[start:stop] = np.rint(top * 100 * CONFIDENCE_SCALE)
+        if progress:
+            progress(stop, total, time.perf_counter() - start_time)
+    out_idx.flush()
+    out_conf.flush()
+    del out_idx, out_conf
+
+    meta = {
+        "model_path": os.path.abspath(model_path),
+        "model_version": registry.version(model_path),
+        "k": k,
+        "labels": labels,
+        "columns": FEATURE_COLUMNS,
+        "options": {col: options[col] for col in FEATURE_COLUMNS},
+        "rows": total,
+        "built_at": time.time(),
+        "build_seconds": time.perf_counter() - start_time,
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f)
+    return meta
+
+
+# -----------------------------
+# LOOKUP
+# -----------------------------
+class PredictionGrid:
+    """
+    Read-only view of a built grid. The arrays are memory-mapped, so opening
+    the table is cheap and only the pages actually looked up are read.
+    """
+
+    def __init__(self, grid_dir=DEFAULT_GRID_DIR):
+        with open(os.path.join(grid_dir, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.labels = np.asarray(self.meta["labels"], dtype=object)
+        self.shape = tuple(len(self.meta["options"][col]) for col in FEATURE_COLUMNS)
+        self._positions = [
+            {value: i for i, value in enumerate(self.meta["options"][col])} for col in FEATURE_COLUMNS
+        ]
+        self._idx = np.load(os.path.join(grid_dir, LABELS_FILE), mmap_mode="r")
+        self._conf = np.load(os.path.join(grid_dir, CONFIDENCES_FILE), mmap_mode="r")
+
+    @property
+    def model_version(self):
+        return self.meta["model_version"]
+
+    def flat_index(self, row):
+        """
+        Returns the grid position of `row`, or None if any feature value is
+        not part of the grid.
+        """
+        index = 0
+        for col, positions, size in zip(FEATURE_COLUMNS, self._positions, self.shape):
+            value = row.get(col)
+            if hasattr(value, "item"):
+                value = value.item()
+            if isinstance(value, float) and value.is_integer():
+                value = int(value)
+            pos = positions.get(value)
+            if pos is None:
+                return None
+            index = index * size + pos
+        return index
+
+    def lookup(self, row, model_version=None, k=3):
+        """
+        Returns [(role, confidence), ...] for `row`, or None when the row is
+        outside the grid, more than the stored k is requested, or the grid was
+        built from a different model version than `model_version`.
+        """
+        if model_version is not None and model_version != self.model_version:
+            return None
+        if k > self.meta["k"]:
+            return None
+        index = self.flat_index(row)
+        if index is None:
+            return None
+        idx = self._idx[index, :k]
+        conf = self._conf[index, :k] / CONFIDENCE_SCALE
+        return [(self.labels[i], float(c)) for i, c in zip(idx, conf)]
+
+
+_grid_lock = threading.Lock()
+_grids = {}
+
+
+def load_grid(grid_dir=DEFAULT_GRID_DIR):
+    """
+    Returns the PredictionGrid in `grid_dir`, opened once per process and
+    reopened when meta.json changes. Returns None if no complete grid exists.
+    """
+    meta_path = os.path.join(grid_dir, META_FILE)
+    try:
+        mtime = os.stat(meta_path).st_mtime_ns
+    except OSError:
+        return None
+    key = os.path.abspath(grid_dir)
+    entry = _grids.get(key)
+    if entry and entry[0] == mtime:
+        return entry[1]
+    with _grid_lock:
+        entry = _grids.get(key)
+        if not (entry and entry[0] == mtime):
+            try:
+                entry = (mtime, PredictionGrid(grid_dir))
+            except (OSError, ValueError, KeyError):
+                return None
+            _grids[key] = entry
+    return entry[1]
+
+
+def grid_predict_top_k(row, model_path=DEFAULT_MODEL_PATH, k=3, grid_dir=DEFAULT_GRID_DIR, fallback=None):
+    """
+    Answers from the precomputed grid when it is present, current and covers
+    `row`; otherwise returns fallback(row, model_path, k), or None if no
+    fallback was given.
+    """
+    grid = load_grid(grid_dir)
+    if grid is not None:
+        results = grid.lookup(row, registry.version(model_path), k)
+        if results is not None:
+            return results
+    return fallback(row, model_path, k) if fallback else None
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute top-k predictions for the app's full input grid.")
+    parser.add_argument("--model", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--out", default=DEFAULT_GRID_DIR)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    def report(rows, total, seconds):
+        print(f"  {rows:>12,} / {total:,} rows  {rows / max(seconds, 1e-9):>12,.0f} rows/sec")
+
+    meta = build_grid(args.model, args.out, args.top_k, args.batch_size, progress=report)
+    print(f"Built {meta['rows']:,} rows for model {meta['model_version']} "
+          f"in {meta['build_seconds']:.1f}s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
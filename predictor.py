@@ -0,0 +1,66 @@
+"""
+Prediction helpers shared by the Streamlit app and the batch scorer.
+"""
+import numpy as np
+import pandas as pd
+
+# Input columns expected by best_model.pkl, in the order app.py builds them.
+FEATURE_COLUMNS = [
+    "Degree", "Major", "Skill1", "Skill2", "Certification",
+    "ExperienceYears", "ProjectCount", "Internship", "ExperienceLevel",
+]
+NUMERIC_COLUMNS = ["ExperienceYears", "ProjectCount"]
+CATEGORICAL_COLUMNS = [c for c in FEATURE_COLUMNS if c not in NUMERIC_COLUMNS]
+
+
+def features_frame(rows):
+    """
+    Builds the model input from a dict, a list of dicts or a DataFrame, with
+    columns in FEATURE_COLUMNS order and numeric columns parsed as numbers.
+    """
+    if isinstance(rows, dict):
+        rows = [rows]
+    frame = rows[FEATURE_COLUMNS] if isinstance(rows, pd.DataFrame) else pd.DataFrame(rows, columns=FEATURE_COLUMNS)
+    # Frames from dataset_store hold Categoricals; encoders must see the same
+    # plain strings at fit time as the app sends at predict time.
+    strings = {col: frame[col].astype(object) for col in CATEGORICAL_COLUMNS
+               if isinstance(frame[col].dtype, pd.CategoricalDtype)}
+    return frame.assign(**strings, **{col: pd.to_numeric(frame[col]) for col in NUMERIC_COLUMNS})
+
+
+def class_labels(model, encoder=None):
+    """
+    Job-role names in the model's probability column order.
+    """
+    if encoder is not None:
+        return encoder.inverse_transform(model.classes_)
+    return np.asarray(model.classes_)
+
+
+def top_k(probs, k=3):
+    """
+    Returns (indices, probabilities) of the k largest entries in each row,
+    best first. argpartition selects the winners in linear time so only the
+    k survivors per row are sorted.
+    """
+    probs = np.atleast_2d(probs)
+    k = min(k, probs.shape[1])
+    if k < probs.shape[1]:
+        idx = np.argpartition(-probs, k - 1, axis=1)[:, :k]
+    else:
+        idx = np.tile(np.arange(k), (probs.shape[0], 1))
+    top = np.take_along_axis(probs, idx, axis=1)
+    order = np.argsort(-top, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+def predict_top_k(model, encoder, features, k=3):
+    """
+    Scores candidates (a DataFrame, a dict or a list of dicts) in one
+    vectorized predict_proba call.
+    Returns (labels, confidences) arrays of shape (n_rows, k), with
+    confidences in percent.
+    """
+    probs = model.predict_proba(features_frame(features))
+    idx, top = top_k(probs, k)
+    return class_labels(model, encoder)[idx], top * 100
@@ -0,0 +1,270 @@
+"""
+Chunked preprocessing of the raw candidate data.
+
+Replaces the eda.ipynb / dataprocessing_stage2.ipynb chain
+(candidate_job_role.csv -> cleaned_dataset.csv -> dataprocessing_stage1.csv
+-> processed_dataset.csv) with two streaming passes over the raw CSV:
+
+1. fit: reads the file chunk by chunk and accumulates category counts,
+   the experience-years sums and the skill-count sums. Nothing is kept per
+   row, so memory depends on the number of distinct values, not on rows.
+2. transform: reads it again and writes each chunk as soon as it is
+   encoded. Chunks are written straight to the output, with no
+   intermediate files.
+
+The output has the columns and encodings of processed_dataset.csv:
+- label codes follow sorted class order, as LabelEncoder does;
+- missing values are filled with the mode or the mean, as the notebook did;
+- experience_years and num_skills are standardised with population
+  statistics, as StandardScaler does.
+String cleanup is done with vectorized pandas string ops and categorical
+dtypes, not per-row Python functions.
+
+    python preprocessing.py candidate_job_role.csv -o processed_dataset.csv
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_RAW_PATH = "candidate_job_role.csv"
+DEFAULT_OUTPUT_PATH = "processed_dataset.csv"
+DEFAULT_CHUNKSIZE = 100_000
+STATE_FORMAT_VERSION = 1
+
+CATEGORY_COLUMNS = ["qualification", "job_role", "skills_list"]
+OUTPUT_COLUMNS = ["candidate_id", "qualification", "job_role", "experience_years",
+                  "experience_was_missing", "skills_list", "num_skills"]
+
+# Same buckets as map_exp_cat in eda.ipynb; anything else falls back to the
+# first number in the text ("5 years" -> 5.0).
+EXPERIENCE_YEARS = {
+    "entry": 1.0, "junior": 1.0, "fresh": 1.0, "fresher": 1.0,
+    "mid": 3.0, "mid-level": 3.0, "intermediate": 3.0,
+    "senior": 7.0, "lead": 7.0, "sr": 7.0,
+}
+SKILL_SEPARATORS = r"[;|/\t\n]|\\n|\s+and\s+"
+
+
+# -----------------------------
+# CLEANING (one chunk)
+# -----------------------------
+def _normalize(text):
+    return text.str.strip().str.rstrip(",")
+
+
+def skill_parts(skills):
+    """
+    Splits raw skill strings ("Python, SQL") or the stringified lists of
+    cleaned_dataset.csv ("['Python', 'SQL']") into one row per skill,
+    indexed by the row it came from.
+    """
+    parts = (skills.astype(object).fillna("").astype(str)
+             .str.replace(r"^\s*\[|\]\s*$", "", regex=True)
+             .str.replace(SKILL_SEPARATORS, ",", regex=True, case=False)
+             .str.split(",")
+             .explode()
+             .str.strip()
+             .str.strip("'\""))
+    return parts[parts.str.len() > 0]
+
+
+def split_skills(skills):
+    """
+    Returns (skills_list, num_skills) for a Series of raw skill strings.
+    skills_list is the Python-list text ("['Python', 'SQL']") that the
+    notebooks encoded.
+    """
+    parts = skill_parts(skills)
+    # repr() is applied once per distinct skill, not once per row.
+    quoted = parts.astype("category").cat.rename_categories(repr).astype(str)
+    grouped = quoted.groupby(level=0)
+    skills_list = ("[" + grouped.agg(", ".join) + "]").reindex(skills.index, fill_value="[]")
+    num_skills = grouped.size().reindex(skills.index, fill_value=0)
+    return skills_list, num_skills
+
+
+def experience_years(levels):
+    level = levels.str.strip().str.lower().str.rstrip(",")
+    years = level.map(EXPERIENCE_YEARS)
+    numeric = pd.to_numeric(level.str.extract(r"(\d+(?:\.\d+)?)", expand=False), errors="coerce")
+    return years.fillna(numeric).astype(float)
+
+
+def clean_chunk(raw):
+    """
+    Turns one chunk of candidate_job_role.csv into the unencoded columns:
+    qualification, job_role, skills_list (text), experience_years (float with
+    NaN for missing values) and num_skills.
+    """
+    skills_list, num_skills = split_skills(raw["skills"])
+    return pd.DataFrame({
+        "candidate_id": raw["candidate_id"],
+        "qualification": _normalize(raw["qualification"]),
+        "job_role": _normalize(raw["job_role"]),
+        "experience_years": experience_years(raw["experience_level"]),
+        "skills_list": skills_list,
+        "num_skills": num_skills,
+    }, index=raw.index)
+
+
+def read_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    return pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=True)
+
+
+# -----------------------------
+# FITTED STATE
+# -----------------------------
+class Preprocessor:
+    """
+    Everything the transform pass needs: the sorted class list for each
+    category column, the fill values, and the scaling statistics. It is
+    saved as JSON. This is the same content the notebook wrote to
+    *_encoder.pkl and all_categorical_mappings.csv.
+    """
+
+    def __init__(self, classes, fill, mean, scale, rows=0):
+        self.classes = classes
+        self.fill = fill
+        self.mean = mean
+        self.scale = scale
+        self.rows = rows
+        self._dtypes = {col: pd.CategoricalDtype(values) for col, values in classes.items()}
+
+    # -- fitting --
+    @classmethod
+    def fit(cls, chunks):
+        counts = {col: pd.Series(dtype="int64") for col in CATEGORY_COLUMNS}
+        rows = years_n = 0
+        years_sum = years_sq = skills_sum = skills_sq = 0.0
+        for raw in chunks:
+            chunk = clean_chunk(raw)
+            rows += len(chunk)
+            for col in CATEGORY_COLUMNS:
+                counts[col] = counts[col].add(chunk[col].value_counts(), fill_value=0)
+            years = chunk["experience_years"].dropna()
+            years_n += len(years)
+            years_sum += years.sum()
+            years_sq += (years ** 2).sum()
+            skills = chunk["num_skills"].astype(float)
+            skills_sum += skills.sum()
+            skills_sq += (skills ** 2).sum()
+        if not rows:
+            raise ValueError("no rows to fit on")
+
+        # Mode fill for categories (ties go to the smallest value, like
+        # Series.mode()[0]) and mean fill for experience.
+        fill = {}
+        for col, c in counts.items():
+            fill[col] = sorted(c[c == c.max()].index)[0] if len(c) else ""
+        years_mean = years_sum / years_n if years_n else 0.0
+        fill["experience_years"] = years_mean
+        classes = {col: sorted(set(c.index) | {fill[col]}) for col, c in counts.items()}
+
+        # Filled rows sit exactly on the mean, so they only add to the count.
+        years_var = (years_sq - years_n * years_mean ** 2) / rows
+        skills_mean = skills_sum / rows
+        skills_var = skills_sq / rows - skills_mean ** 2
+        mean = {"experience_years": years_mean, "num_skills": skills_mean}
+        scale = {"experience_years": _scale(years_var), "num_skills": _scale(skills_var)}
+        return cls(classes, fill, mean, scale, rows)
+
+    # -- transforming --
+    def transform_chunk(self, raw):
+        chunk = clean_chunk(raw)
+        out = pd.DataFrame(index=chunk.index)
+        out["candidate_id"] = pd.to_numeric(chunk["candidate_id"], errors="coerce").astype("Int64")
+        for col in ("qualification", "job_role"):
+            out[col] = self._codes(chunk, col)
+        missing = chunk["experience_years"].isna()
+        years = chunk["experience_years"].fillna(self.fill["experience_years"])
+        out["experience_years"] = (years - self.mean["experience_years"]) / self.scale["experience_years"]
+        out["experience_was_missing"] = missing
+        out["skills_list"] = self._codes(chunk, "skills_list")
+        out["num_skills"] = (chunk["num_skills"] - self.mean["num_skills"]) / self.scale["num_skills"]
+        return out[OUTPUT_COLUMNS]
+
+    def _codes(self, chunk, col):
+        # Values unseen during fit get -1.
+        values = chunk[col].fillna(self.fill[col]).astype(self._dtypes[col])
+        return values.cat.codes.astype(np.int32)
+
+    # -- persistence --
+    def to_dict(self):
+        return {"format_version": STATE_FORMAT_VERSION, "rows": self.rows, "classes": self.classes,
+                "fill": self.fill, "mean": self.mean, "scale": self.scale}
+
+    @classmethod
+    def from_dict(cls, d):
+        if d.get("format_version") != STATE_FORMAT_VERSION:
+            raise ValueError(f"unsupported preprocessing state version {d.get('format_version')}")
+        return cls(d["classes"], d["fill"], d["mean"], d["scale"], d.get("rows", 0))
+
+    def save(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def _scale(variance):
+    # StandardScaler leaves constant columns unscaled.
+    std = float(np.sqrt(max(variance, 0.0)))
+    return std if std > 0 else 1.0
+
+
+# -----------------------------
+# PIPELINE
+# -----------------------------
+def iter_transform(path, preprocessor, chunksize=DEFAULT_CHUNKSIZE):
+    """
+    Yields encoded chunks of `path`, ready to hand to training code without
+    writing anything to disk.
+    """
+    for raw in read_chunks(path, chunksize):
+        yield preprocessor.transform_chunk(raw)
+
+
+def run(path=DEFAULT_RAW_PATH, output=DEFAULT_OUTPUT_PATH, chunksize=DEFAULT_CHUNKSIZE,
+        state_path=None):
+    """
+    Fits on `path` (first pass), then streams the encoded rows to `output`
+    (second pass). Returns the fitted Preprocessor.
+    """
+    preprocessor = Preprocessor.fit(read_chunks(path, chunksize))
+    if state_path:
+        preprocessor.save(state_path)
+    tmp = f"{output}.tmp"
+    header = True
+    for chunk in iter_transform(path, preprocessor, chunksize):
+        chunk.to_csv(tmp, mode="w" if header else "a", header=header, index=False)
+        header = False
+    os.replace(tmp, output)
+    return preprocessor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preprocess the raw candidate CSV in chunks.")
+    parser.add_argument("data", nargs="?", default=DEFAULT_RAW_PATH)
+    parser.add_argument("-o", "--output", default=DEFAULT_OUTPUT_PATH)
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    parser.add_argument("--state", default="preprocessing_state.json",
+                        help="where to save the fitted classes and statistics")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    preprocessor = run(args.data, args.output, args.chunksize, args.state)
+    print(f"{preprocessor.rows} rows -> {args.output} in {time.perf_counter() - start:.2f}s "
+          f"({', '.join(f'{c}: {len(v)} classes' for c, v in preprocessor.classes.items())})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Signed session tokens and a process-wide user cache.
+
+After login the session holds a token
+
+    <base64url payload>.<base64url HMAC-SHA256>
+
+whose payload carries the user id, a random token id and an expiry. On each
+Streamlit rerun, current_user() checks the signature and expiry in memory
+and reads the user's (id, username, role) from a TTL cache shared by all
+sessions, so an authenticated rerun normally makes no SQLite query.
+
+Logout revokes the token id and drops the session's cached history. Revoked
+ids are kept only until their tokens would have expired anyway.
+clear_history needs no handling here: the user record does not change, and
+history_cache entries are already tagged with db_helper.history_version.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import history_cache
+from db_helper import get_user
+
+STATE_KEY = "auth_token"
+TOKEN_TTL = float(os.environ.get("EDU2JOB_SESSION_TTL", 12 * 3600))
+USER_CACHE_TTL = float(os.environ.get("EDU2JOB_USER_CACHE_TTL", 300))
+USER_CACHE_SIZE = 4096
+
+# Without a configured secret, tokens are valid for this process only, which
+# matches the lifetime of st.session_state anyway.
+_secret = os.environ.get("EDU2JOB_SESSION_SECRET", "").encode() or secrets.token_bytes(32)
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(payload):
+    return hmac.new(_secret, payload, hashlib.sha256).digest()
+
+
+# -----------------------------
+# TOKENS
+# -----------------------------
+_revoked = {}   # token id -> expiry
+_revoked_lock = threading.Lock()
+
+
+def issue_token(user_id, ttl=None):
+    expires = int(time.time() + (TOKEN_TTL if ttl is None else ttl))
+    payload = json.dumps({"uid": int(user_id), "tid": secrets.token_hex(8), "exp": expires},
+                         separators=(",", ":")).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_sign(payload))}"
+
+
+def decode_token(token):
+    """
+    Returns the token's payload dict if the signature is valid and it has
+    neither expired nor been revoked, otherwise None.
+    """
+    if not token or token.count(".") != 1:
+        return None
+    body, signature = token.split(".")
+    try:
+        payload = _b64decode(body)
+        if not hmac.compare_digest(_sign(payload), _b64decode(signature)):
+            return None
+        claims = json.loads(payload)
+    except ValueError:
+        return None
+    if claims.get("exp", 0) < time.time():
+        return None
+    with _revoked_lock:
+        if claims.get("tid") in _revoked:
+            return None
+    return claims
+
+
+def revoke_token(token):
+    claims = decode_token(token)
+    if claims is None:
+        return
+    now = time.time()
+    with _revoked_lock:
+        _revoked[claims["tid"]] = claims["exp"]
+        for tid in [t for t, exp in _revoked.items() if exp < now]:
+            del _revoked[tid]
+
+
+# -----------------------------
+# USER CACHE
+# -----------------------------
+class UserCache:
+    """
+    LRU of user records with TTL, shared by every session in the process.
+    """
+
+    def __init__(self, loader=get_user, ttl=USER_CACHE_TTL, maxsize=USER_CACHE_SIZE):
+        self.loader = loader
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        user = self.loader(user_id)
+        if user is not None:
+            with self._lock:
+                self._entries[user_id] = (now + self.ttl, user)
+                self._entries.move_to_end(user_id)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id=None):
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+user_cache = UserCache()
+
+
+# -----------------------------
+# SESSION HELPERS
+# -----------------------------
+def login(state, user_id):
+    """
+    Stores a fresh token for `user_id` in `state` (normally
+    st.session_state) and warms the user cache. Returns the user record.
+    """
+    history_cache.invalidate(state)
+    state[STATE_KEY] = issue_token(user_id)
+    return user_cache.get(user_id)
+
+
+def current_user(state):
+    """
+    Returns the logged-in user's record, or None. Invalid, expired or
+    revoked tokens are removed from `state`.
+    """
+    token = state.get(STATE_KEY)
+    if token is None:
+        return None
+    claims = decode_token(token)
+    user = user_cache.get(claims["uid"]) if claims else None
+    if user is None:
+        state.pop(STATE_KEY, None)
+        history_cache.invalidate(state)
+    return user
+
+
+def logout(state):
+    token = state.pop(STATE_KEY, None)
+    if token is not None:
+        claims = decode_token(token)
+        revoke_token(token)
+        if claims:
+            user_cache.invalidate(claims["uid"])
+    history_cache.invalidate(state)
@@ -0,0 +1,252 @@
+"""
+Shadow (canary) evaluation of a candidate model on live app traffic.
+
+With EDU2JOB_SHADOW_FRACTION > 0, that fraction of app predictions is
+queued for a second opinion from the candidate model named by
+EDU2JOB_SHADOW_MODEL (required; there is no default). The candidate must
+score a sample profile when the evaluator is first created; if it cannot,
+shadowing is disabled with one warning. Scoring runs on a background
+thread, so users never wait on the candidate or see its answer. The queue
+is bounded; when it is full, samples are dropped and counted.
+
+Each sample becomes one compact row in db_helper's shadow_results table:
+- the two model versions and whether the top-1 roles agree;
+- both labels, stored only when they differ;
+- both latencies, plus the error when the candidate could not score the
+  input.
+
+The primary latency is what the user actually waited, which may be a
+cache or grid hit. The candidate latency is a direct model call.
+
+    python shadow.py report --since-hours 24
+"""
+import argparse
+import atexit
+import os
+import queue
+import random
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+import metrics
+from db_helper import fetch_shadow_results, init_db, insert_shadow_results
+from model_registry import load_model, registry
+from native_model import SAMPLE_PROFILE
+from predictor import features_frame, predict_top_k
+
+SHADOW_FRACTION = float(os.environ.get("EDU2JOB_SHADOW_FRACTION", 0))
+SHADOW_MODEL = os.environ.get("EDU2JOB_SHADOW_MODEL")
+QUEUE_SIZE = 1000
+FLUSH_ROWS = 50
+FLUSH_SECONDS = 5.0
+PERCENTILES = (50, 90, 99)
+
+
+# -----------------------------
+# EVALUATOR
+# -----------------------------
+class ShadowEvaluator:
+    """
+    Samples predictions, scores them with the candidate on a daemon thread
+    and writes the results in batches.
+    """
+
+    def __init__(self, candidate_path=SHADOW_MODEL, fraction=SHADOW_FRACTION,
+                 queue_size=QUEUE_SIZE, sink=insert_shadow_results, rng=random.random):
+        self.candidate_path = candidate_path
+        self.fraction = fraction
+        self._sink = sink
+        self._rng = rng
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.dropped = 0
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="edu2job-shadow", daemon=True)
+                    self._thread.start()
+
+    def submit(self, row, primary_label, primary_seconds, primary_version=None):
+        """
+        Queues `row` for shadow scoring with probability `fraction`. Never
+        blocks; returns True if the row was queued.
+        """
+        if self.fraction <= 0 or self._rng() >= self.fraction:
+            return False
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((time.time(), dict(row), str(primary_label),
+                                    primary_seconds * 1e3, primary_version))
+        except queue.Full:
+            self.dropped += 1
+            metrics.inc("shadow.dropped")
+            return False
+        return True
+
+    def check(self, row=SAMPLE_PROFILE):
+        """
+        Scores `row` with the candidate once, raising if it cannot.
+        """
+        if not self.candidate_path:
+            raise ValueError("EDU2JOB_SHADOW_MODEL is not set")
+        model, encoder = load_model(self.candidate_path)
+        predict_top_k(model, encoder, features_frame(row), 1)
+
+    def _score(self, item):
+        ts, row, primary_label, primary_ms, primary_version = item
+        candidate_version = candidate_label = candidate_ms = error = None
+        try:
+            model, encoder = load_model(self.candidate_path)
+            candidate_version = registry.version(self.candidate_path)
+            start = time.perf_counter()
+            labels, _ = predict_top_k(model, encoder, features_frame(row), 1)
+            candidate_ms = (time.perf_counter() - start) * 1e3
+            candidate_label = str(labels[0][0])
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:200]
+            metrics.inc("shadow.errors")
+        agree = None if error else int(candidate_label == primary_label)
+        return (ts, primary_version, candidate_version, agree,
+                None if agree else primary_label, None if agree else candidate_label,
+                primary_ms, candidate_ms, error)
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._queue.get(timeout=FLUSH_SECONDS)
+            except queue.Empty:
+                item = None
+            result = self._score(item) if item is not None else None
+            with self._buffer_lock:
+                if result is not None:
+                    self._buffer.append(result)
+                pending = len(self._buffer)
+            if pending >= FLUSH_ROWS or time.monotonic() - last_flush >= FLUSH_SECONDS:
+                self.flush()
+                last_flush = time.monotonic()
+
+    def flush(self):
+        with self._buffer_lock:
+            rows, self._buffer = self._buffer, []
+        if rows:
+            try:
+                self._sink(rows)
+            except Exception as e:
+                metrics.inc("shadow.write_errors")
+                print(f"Failed to record {len(rows)} shadow results: {e}")
+
+
+_evaluator_lock = threading.Lock()
+_evaluator = None
+_disabled = False
+
+
+def evaluator():
+    """
+    The process-wide ShadowEvaluator, or None when shadowing is off or the
+    candidate failed its check on first use.
+    """
+    global _evaluator, _disabled
+    if SHADOW_FRACTION <= 0 or _disabled:
+        return None
+    with _evaluator_lock:
+        if _evaluator is None and not _disabled:
+            candidate = ShadowEvaluator()
+            try:
+                candidate.check()
+            except Exception as e:
+                _disabled = True
+                print(f"Shadow evaluation disabled: candidate {candidate.candidate_path!r} "
+                      f"cannot score a sample profile ({type(e).__name__}: {e})")
+                return None
+            _evaluator = candidate
+            atexit.register(_evaluator.flush)
+        return _evaluator
+
+
+# -----------------------------
+# REPORT
+# -----------------------------
+def summarize(rows):
+    """
+    Groups shadow_results rows by (primary_version, candidate_version) and
+    returns one dict per pair with agreement rate, error count, latency
+    percentiles and the most common disagreements.
+    """
+    groups = {}
+    for row in rows:
+        _, primary_version, candidate_version, agree, p_label, c_label, p_ms, c_ms, error = row
+        g = groups.setdefault((primary_version, candidate_version),
+                              {"n": 0, "errors": 0, "agree": 0, "primary_ms": [], "candidate_ms": [],
+                               "disagreements": Counter()})
+        g["n"] += 1
+        if p_ms is not None:
+            g["primary_ms"].append(p_ms)
+        if error:
+            g["errors"] += 1
+            continue
+        g["candidate_ms"].append(c_ms)
+        if agree:
+            g["agree"] += 1
+        else:
+            g["disagreements"][(p_label, c_label)] += 1
+
+    out = []
+    for (primary_version, candidate_version), g in groups.items():
+        scored = g["n"] - g["errors"]
+        out.append({
+            "primary_version": primary_version,
+            "candidate_version": candidate_version,
+            "samples": g["n"],
+            "errors": g["errors"],
+            "agreement": g["agree"] / scored if scored else None,
+            "primary_ms": _percentiles(g["primary_ms"]),
+            "candidate_ms": _percentiles(g["candidate_ms"]),
+            "top_disagreements": g["disagreements"].most_common(5),
+        })
+    return out
+
+
+def _percentiles(values):
+    if not values:
+        return {}
+    return {f"p{p}": float(v) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def _format_ms(stats):
+    return " ".join(f"{k}={v:.2f}" for k, v in stats.items()) or "-"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report on shadow-evaluated predictions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rep = sub.add_parser("report", help="agreement rate and latency percentiles")
+    rep.add_argument("--since-hours", type=float, help="only samples from the last N hours")
+    args = parser.parse_args(argv)
+
+    init_db()
+    since = time.time() - args.since_hours * 3600 if args.since_hours else 0.0
+    summaries = summarize(fetch_shadow_results(since))
+    if not summaries:
+        print("No shadow results recorded.")
+    for s in summaries:
+        agreement = f"{s['agreement']:.1%}" if s["agreement"] is not None else "n/a"
+        print(f"primary {s['primary_version']} vs candidate {s['candidate_version']}: "
+              f"{s['samples']} samples, {s['errors']} errors, agreement {agreement}")
+        print(f"  primary ms:   {_format_ms(s['primary_ms'])}")
+        print(f"  candidate ms: {_format_ms(s['candidate_ms'])}")
+        for (p_label, c_label), n in s["top_disagreements"]:
+            print(f"  {n:>5}x  {p_label} -> {c_label}")
+
+
+if __name__ == "__main__":
+    main()
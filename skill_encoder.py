@@ -0,0 +1,131 @@
+"""
+Skill vocabulary and sparse multi-hot encoding.
+
+The stage-2 notebook label-encoded the whole stringified skills_list, so
+"['Python', 'SQL']" and "['Python', 'SQL', 'Git']" became unrelated
+integers, and a model could not share anything between them. SkillEncoder
+gives every distinct skill its own column instead. It builds the
+vocabulary and the CSR matrix in one vectorized pass over the exploded
+skills (preprocessing.skill_parts). A row costs one stored entry per
+skill, not one dense column per skill.
+
+It follows the scikit-learn transformer API, so it works inside a
+Pipeline / ColumnTransformer. It also has a dict-based encode_row() for
+single app requests that needs no pandas.
+
+    encoder = SkillEncoder().fit(df["skills_list"])
+    X_skills = encoder.transform(df["skills_list"])     # scipy.sparse.csr_matrix
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from preprocessing import skill_parts
+
+ENCODER_FORMAT_VERSION = 1
+
+
+def _as_series(skills):
+    # Accept a Series, a one-column DataFrame (ColumnTransformer) or a list.
+    if isinstance(skills, pd.DataFrame):
+        skills = skills.iloc[:, 0]
+    elif not isinstance(skills, pd.Series):
+        skills = pd.Series(np.asarray(skills, dtype=object).ravel())
+    return skills.reset_index(drop=True)
+
+
+class SkillEncoder(BaseEstimator, TransformerMixin):
+    """
+    Multi-hot encoder over a learned skill vocabulary. Skills seen fewer
+    than `min_count` times during fit, and skills unseen at transform time,
+    are dropped.
+    """
+
+    def __init__(self, min_count=1, dtype=np.float32):
+        self.min_count = min_count
+        self.dtype = dtype
+
+    # -- fitting --
+    def fit(self, skills, y=None):
+        counts = skill_parts(_as_series(skills)).value_counts()
+        self._set_vocabulary(sorted(counts[counts >= self.min_count].index))
+        return self
+
+    def _set_vocabulary(self, vocabulary):
+        self.vocabulary_ = list(vocabulary)
+        self._categories = pd.CategoricalDtype(self.vocabulary_)
+        self._index = {skill: i for i, skill in enumerate(self.vocabulary_)}
+
+    # -- encoding --
+    def transform(self, skills):
+        skills = _as_series(skills)
+        parts = skill_parts(skills)
+        codes = parts.astype(self._categories).cat.codes.to_numpy()
+        rows = parts.index.to_numpy()
+        known = codes >= 0
+        matrix = sparse.csr_matrix(
+            (np.ones(known.sum(), dtype=self.dtype), (rows[known], codes[known])),
+            shape=(len(skills), len(self.vocabulary_)),
+        )
+        # A skill listed twice in one row still encodes as 1.
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+        return matrix
+
+    def encode_row(self, skills):
+        """
+        1 x vocabulary CSR row for an iterable of skill names, e.g. the
+        app's [skill1, skill2].
+        """
+        indices = sorted({self._index[s] for s in skills if s in self._index})
+        return sparse.csr_matrix(
+            (np.ones(len(indices), dtype=self.dtype), indices, [0, len(indices)]),
+            shape=(1, len(self.vocabulary_)),
+        )
+
+    def inverse_transform(self, matrix):
+        matrix = sparse.csr_matrix(matrix)
+        vocab = np.asarray(self.vocabulary_, dtype=object)
+        return [list(vocab[matrix.indices[start:end]])
+                for start, end in zip(matrix.indptr[:-1], matrix.indptr[1:])]
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray([f"skill_{s}" for s in self.vocabulary_], dtype=object)
+
+    # -- persistence --
+    def to_dict(self):
+        return {"format_version": ENCODER_FORMAT_VERSION, "min_count": self.min_count,
+                "vocabulary": self.vocabulary_}
+
+    @classmethod
+    def from_dict(cls, d):
+        if d.get("format_version") != ENCODER_FORMAT_VERSION:
+            raise ValueError(f"unsupported skill encoder version {d.get('format_version')}")
+        encoder = cls(min_count=d["min_count"])
+        encoder._set_vocabulary(d["vocabulary"])
+        return encoder
+
+    def save(self, path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, indent=1)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def multi_hot_features(frame, skills, encoder, drop=()):
+    """
+    CSR matrix of `frame`'s numeric columns (minus `drop`) followed by the
+    multi-hot skill columns for `skills`, which must be row-aligned with
+    `frame`.
+    """
+    dense = sparse.csr_matrix(frame.drop(columns=list(drop)).to_numpy(dtype=encoder.dtype))
+    return sparse.hstack([dense, encoder.transform(skills)], format="csr")
@@ -0,0 +1,42 @@
+import os
+import sys
+
+# The modules live at the repository root rather than in a package.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+LEGACY_ROLES = ["Backend Developer", "Data Analyst", "ML Engineer"]
+LEGACY_ROWS = [
+    ("B.Tech", "Information Technology", "Java", "Spring", "AWS", 2, 3, "Yes", "Entry"),
+    ("B.Sc", "Mathematics", "R", "Statistics", "None", 1, 1, "Yes", "Entry"),
+    ("M.Sc", "Computer Science", "Python", "Machine Learning", "None", 4, 5, "No", "Mid"),
+] * 4
+
+
+@pytest.fixture
+def legacy_model_path(tmp_path):
+    """
+    Like the shipped best_model.pkl: a (Pipeline, LabelEncoder) tuple with
+    `pre`/`model` steps whose preprocessor returns a scipy sparse matrix.
+    """
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("sklearn")
+    xgboost = pytest.importorskip("xgboost")
+    import joblib
+    from sklearn.compose import ColumnTransformer
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import LabelEncoder, OneHotEncoder, StandardScaler
+
+    from predictor import CATEGORICAL_COLUMNS, FEATURE_COLUMNS, NUMERIC_COLUMNS
+
+    pre = ColumnTransformer([
+        ("cat", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_COLUMNS),
+        ("num", StandardScaler(), NUMERIC_COLUMNS),
+    ], sparse_threshold=1.0)
+    encoder = LabelEncoder().fit(LEGACY_ROLES)
+    pipeline = Pipeline([("pre", pre), ("model", xgboost.XGBClassifier(n_estimators=5, max_depth=2))])
+    pipeline.fit(pd.DataFrame(LEGACY_ROWS, columns=FEATURE_COLUMNS), encoder.transform(LEGACY_ROLES * 4))
+    path = tmp_path / "best_model.pkl"
+    joblib.dump((pipeline, encoder), path)
+    return str(path)
@@ -0,0 +1,201 @@
+import hashlib
+import sqlite3
+import threading
+import time
+
+import pytest
+
+import db_helper
+import passwords
+
+# The schema db_helper.init_db() created before migrations were tracked.
+LEGACY_SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE,
+    email TEXT,
+    password_hash TEXT
+);
+CREATE TABLE predictions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    timestamp TEXT,
+    degree TEXT,
+    major TEXT,
+    skill1 TEXT,
+    skill2 TEXT,
+    certification TEXT,
+    experience_years INTEGER,
+    project_count INTEGER,
+    internship TEXT,
+    experience_level TEXT,
+    predicted_label TEXT,
+    FOREIGN KEY(user_id) REFERENCES users(id)
+);
+CREATE TABLE feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id INTEGER,
+    timestamp TEXT,
+    rating INTEGER,
+    comments TEXT,
+    FOREIGN KEY(user_id) REFERENCES users(id)
+);
+"""
+
+PROFILE = {
+    "Degree": "B.Tech", "Major": "CS", "Skill1": "Python", "Skill2": "SQL",
+    "Certification": "Data Analyst", "ExperienceYears": 2, "ProjectCount": 3,
+    "Internship": "Yes", "ExperienceLevel": "Beginner",
+}
+
+
+@pytest.fixture
+def legacy_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "smartland.db")
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute("INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)",
+                 ("alice", "alice@example.com", hashlib.sha256(b"s3cret").hexdigest()))
+    conn.execute("INSERT INTO predictions (user_id, timestamp, predicted_label) VALUES (1, '2025-01-01', ?)",
+                 ("Data Analyst",))
+    conn.commit()
+    conn.close()
+
+    db_helper.flush_writes()
+    monkeypatch.setattr(db_helper, "DB_NAME", path)
+    monkeypatch.setattr(passwords, "SCRYPT_LOG2_N", 10)  # keep the KDF cheap
+    passwords.clear_verify_cache()
+    yield path
+    db_helper.flush_writes()
+    db_helper.close_all_connections()
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    db_helper.flush_writes()
+    monkeypatch.setattr(db_helper, "DB_NAME", str(tmp_path / "smartland.db"))
+    monkeypatch.setattr(db_helper, "WRITE_BEHIND", True)
+    db_helper.init_db()
+    with db_helper.get_db() as conn:
+        conn.executemany("INSERT INTO users (username) VALUES (?)", [("alice",), ("bob",)])
+        conn.commit()
+    yield
+    db_helper.flush_writes()
+    db_helper.close_all_connections()
+
+
+def _gate(monkeypatch, writer):
+    # Holds every batch of `writer` until the returned event is set.
+    gate = threading.Event()
+    write = writer._write
+
+    def gated(batch):
+        gate.wait(10)
+        write(batch)
+
+    monkeypatch.setattr(writer, "_write", gated)
+    return gate
+
+
+def _prediction(user_id, label):
+    return (user_id, "2025-01-01 00:00:00", *PROFILE.values(), label)
+
+
+def _count(sql="SELECT COUNT(*) FROM predictions"):
+    with db_helper.get_db() as conn:
+        return conn.execute(sql).fetchone()[0]
+
+
+def test_legacy_db_migrates_and_takes_queued_writes(legacy_db):
+    db_helper.init_db()
+    with db_helper.get_db() as conn:
+        assert db_helper.schema_version(conn) == db_helper.SCHEMA_VERSION
+        assert conn.execute("SELECT role FROM users WHERE id=1").fetchone() == ("user",)
+
+    version = db_helper.history_version(1)
+    for label in ("Data Analyst", "ML Engineer", "Data Analyst"):
+        db_helper.insert_prediction(1, dict(PROFILE, predicted_label=label))
+    assert db_helper.flush_writes()
+
+    with db_helper.get_db() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM predictions WHERE user_id=1").fetchone() == (4,)
+    assert db_helper.history_version(1) == version + 3
+    assert db_helper.history_summary(1) == [("Data Analyst", 3), ("ML Engineer", 1)]
+    assert [row[-1] for row in db_helper.fetch_history_page(1, limit=2)] == ["Data Analyst", "ML Engineer"]
+
+
+def test_verify_user_rehashes_legacy_password(legacy_db):
+    db_helper.init_db()
+    assert db_helper.verify_user("alice", "wrong") is None
+    assert db_helper.verify_user("nobody", "s3cret") is None
+
+    assert db_helper.verify_user("alice", "s3cret") == 1
+    with db_helper.get_db() as conn:
+        (stored,) = conn.execute("SELECT password_hash FROM users WHERE id=1").fetchone()
+    assert stored.startswith(passwords.SCHEME + "$")
+    assert not passwords.needs_rehash(stored)
+
+    passwords.clear_verify_cache()
+    assert db_helper.verify_user("alice", "s3cret") == 1
+    assert db_helper.verify_user("alice", "wrong") is None
+
+
+def test_reads_wait_only_for_their_own_pending_writes(db, monkeypatch):
+    gate = _gate(monkeypatch, db_helper._writer)
+    db_helper.insert_prediction(1, dict(PROFILE, predicted_label="Data Analyst"))
+
+    start = time.monotonic()
+    assert db_helper.fetch_history_page(2) == []
+    assert time.monotonic() - start < 1
+
+    threading.Timer(0.2, gate.set).start()
+    assert [row[-1] for row in db_helper.fetch_history_page(1)] == ["Data Analyst"]
+
+
+def test_clear_history_waits_for_pending_inserts(db, monkeypatch):
+    gate = _gate(monkeypatch, db_helper._writer)
+    for label in ("Data Analyst", "ML Engineer"):
+        db_helper.insert_prediction(1, dict(PROFILE, predicted_label=label))
+
+    threading.Timer(0.2, gate.set).start()
+    db_helper.clear_history(1)
+    assert db_helper.flush_writes()
+    assert _count() == 0
+
+
+def test_failed_batch_is_retried_row_by_row(db):
+    writer = db_helper.WriteBehindQueue()
+    writer._ensure_started = lambda: None  # queue all three before the writer runs
+    writer.submit(1, db_helper.INSERT_PREDICTION_SQL, _prediction(1, "Data Analyst"))
+    writer.submit(1, "INSERT INTO no_such_table VALUES (?)", (1,))
+    writer.submit(1, db_helper.INSERT_PREDICTION_SQL, _prediction(1, "ML Engineer"))
+    del writer._ensure_started
+    writer._ensure_started()
+
+    assert writer.flush(10)
+    writer.close()
+    assert writer.failed == 1
+    assert _count() == 2
+
+
+def test_full_queue_blocks_producers(db, monkeypatch):
+    writer = db_helper.WriteBehindQueue(maxsize=2, batch_size=1)
+    gate = _gate(monkeypatch, writer)
+
+    def produce():
+        for i in range(4):
+            writer.submit(1, db_helper.INSERT_PREDICTION_SQL, _prediction(1, f"Role {i}"))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    producer.join(0.3)
+    # One row is held by the writer and two fill the queue; the fourth waits.
+    assert producer.is_alive()
+    assert writer._queue.full()
+
+    gate.set()
+    producer.join(10)
+    assert not producer.is_alive()
+    assert writer.flush(10)
+    writer.close()
+    assert _count() == 4
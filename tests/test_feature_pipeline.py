@@ -0,0 +1,64 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("pyarrow")
+pytest.importorskip("xgboost")
+
+import dataset_store
+import feature_pipeline
+from predictor import FEATURE_COLUMNS
+from sklearn.linear_model import LogisticRegression
+
+ROWS = [
+    ("B.Tech", "Computer Science", "Python", "SQL", "AWS", 3, 4, "Yes", "Mid", "Data Analyst"),
+    ("M.Tech", "Electronics", "C++", "Embedded C", "None", 5, 2, "No", "Senior", "Embedded Engineer"),
+    ("B.Sc", "Mathematics", "R", "Statistics", "None", 1, 1, "Yes", "Entry", "Data Analyst"),
+    ("MBA", "Business", "Excel", "SQL", "PMP", 7, 6, "No", "Senior", "Product Manager"),
+    ("B.Tech", "Information Technology", "Java", "Spring", "AWS", 2, 3, "Yes", "Entry", "Backend Developer"),
+    ("M.Sc", "Computer Science", "Python", "Machine Learning", "None", 4, 5, "No", "Mid", "ML Engineer"),
+] * 5
+
+SAMPLE = [
+    {"Degree": "B.Tech", "Major": "Computer Science", "Skill1": "Python", "Skill2": "SQL",
+     "Certification": "AWS", "ExperienceYears": 3, "ProjectCount": 4,
+     "Internship": "Yes", "ExperienceLevel": "Mid"},
+    {"Degree": "MBA", "Major": "Business", "Skill1": "Excel", "Skill2": "Select Option",
+     "Certification": "PMP", "ExperienceYears": 6, "ProjectCount": 2,
+     "Internship": "No", "ExperienceLevel": "Senior"},
+]
+
+
+@pytest.fixture
+def training_csv(tmp_path, monkeypatch):
+    path = tmp_path / "jobs.csv"
+    pd.DataFrame(ROWS, columns=[*FEATURE_COLUMNS, feature_pipeline.TARGET_COLUMN]).to_csv(path, index=False)
+    monkeypatch.setattr(dataset_store, "STORE_DIR", str(tmp_path / "store"))
+    return str(path)
+
+
+def test_store_fitted_pipeline_matches_csv_fitted(training_csv):
+    from_store = dataset_store.load(training_csv)
+    assert isinstance(from_store["Degree"].dtype, pd.CategoricalDtype)
+
+    store_fit = feature_pipeline.fit_pipeline(from_store, LogisticRegression(max_iter=500))
+    csv_fit = feature_pipeline.fit_pipeline(pd.read_csv(training_csv), LogisticRegression(max_iter=500))
+
+    assert list(store_fit.classes_) == list(csv_fit.classes_)
+    assert store_fit.predict_proba(SAMPLE) == pytest.approx(csv_fit.predict_proba(SAMPLE))
+    assert list(store_fit.predict(SAMPLE)) == list(csv_fit.predict(SAMPLE))
+
+
+def test_cli_pickles_importable_class(training_csv, tmp_path, monkeypatch):
+    import runpy
+
+    import joblib
+
+    output = tmp_path / "model.pkl"
+    monkeypatch.setattr(feature_pipeline, "default_classifier", lambda: LogisticRegression(max_iter=500))
+    monkeypatch.setattr("sys.argv", ["feature_pipeline.py", training_csv, "-o", str(output)])
+    runpy.run_path(feature_pipeline.__file__, run_name="__main__")
+
+    artifact = joblib.load(output)
+    assert type(artifact).__module__ == "feature_pipeline"
+    assert isinstance(artifact, feature_pipeline.JobRolePipeline)
@@ -0,0 +1,48 @@
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("sklearn")
+pytest.importorskip("xgboost")
+
+import joblib
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import LabelEncoder
+
+import feature_pipeline
+import incremental_training
+from native_model import SAMPLE_PROFILE
+
+
+def test_load_base_wraps_legacy_tuple(tmp_path):
+    legacy = Pipeline([("encode", feature_pipeline.build_preprocessor()), ("model", SGDClassifier())])
+    encoder = LabelEncoder().fit(["Data Analyst", "ML Engineer"])
+    path = tmp_path / "best_model.pkl"
+    joblib.dump((legacy, encoder), path)
+
+    artifact = incremental_training.load_base(str(path))
+
+    assert isinstance(artifact, feature_pipeline.JobRolePipeline)
+    assert list(artifact.classes_) == ["Data Analyst", "ML Engineer"]
+    assert artifact.pipeline.named_steps["classifier"] is not None
+
+
+def test_load_base_rejects_bare_estimator(tmp_path):
+    path = tmp_path / "bare.pkl"
+    joblib.dump(SGDClassifier(), path)
+    with pytest.raises(ValueError, match="cannot be updated incrementally"):
+        incremental_training.load_base(str(path))
+
+
+def test_update_continues_boosting_on_sparse_legacy_base(legacy_model_path):
+    base = incremental_training.load_base(legacy_model_path)
+    features = pd.DataFrame([SAMPLE_PROFILE, dict(SAMPLE_PROFILE, Skill1="Java")])
+
+    # Only two of the three roles occur in the batch.
+    updated = incremental_training.update_artifact(base, features, ["Backend Developer", "Data Analyst"], rounds=3)
+
+    classifier = updated.pipeline.named_steps["classifier"]
+    assert classifier.n_estimators == 8
+    assert updated.metadata["incremental"]["method"] == "xgb_model"
+    assert updated.predict_proba(features).shape == (2, 3)
@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("pandas")
+
+import inference_service
+from native_model import SAMPLE_PROFILE
+
+
+def test_rows_to_frame_validates_every_row():
+    bad = dict(SAMPLE_PROFILE)
+    del bad["Major"]
+    with pytest.raises(inference_service.BadRequest, match="row 1: missing features: Major"):
+        inference_service.rows_to_frame([SAMPLE_PROFILE, bad])
+
+    nested = dict(SAMPLE_PROFILE, Skill1=["Python"])
+    with pytest.raises(inference_service.BadRequest, match="row 1: .*Skill1"):
+        inference_service.rows_to_frame([SAMPLE_PROFILE, nested])
+
+
+def test_predict_remote_wraps_connection_errors():
+    # Port 9 (discard) on localhost is closed on any sane test host.
+    with pytest.raises(inference_service.RemoteInferenceError):
+        inference_service.predict_remote(SAMPLE_PROFILE, "http://127.0.0.1:9", timeout=1)
+
+
+def test_predict_remote_rejects_empty_predictions():
+    import http.server
+    import threading
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            body = b'{"predictions": []}'
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with pytest.raises(inference_service.RemoteInferenceError, match="no predictions"):
+            inference_service.predict_remote(SAMPLE_PROFILE, f"http://127.0.0.1:{server.server_port}")
+    finally:
+        server.shutdown()
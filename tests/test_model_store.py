@@ -0,0 +1,67 @@
+import pytest
+
+import model_store
+from model_registry import ModelRegistry
+
+
+def _load(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if data == b"broken":
+        raise ValueError("cannot unpickle")
+    return data
+
+
+def _publish(tmp_path, models_dir, name, content):
+    src = tmp_path / name
+    src.write_bytes(content)
+    return model_store.publish_file(str(src), models_dir)
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    return str(tmp_path / "models")
+
+
+def test_watcher_swaps_to_new_current(tmp_path, models_dir):
+    first = _publish(tmp_path, models_dir, "a.pkl", b"model a")
+    watcher = model_store.ModelWatcher(models_dir, registry=ModelRegistry(loader=_load))
+    assert watcher.poll()
+    assert watcher.path == first
+    assert not watcher.poll()
+
+    second = _publish(tmp_path, models_dir, "b.pkl", b"model b")
+    assert watcher.poll()
+    assert watcher.path == second
+    assert watcher.registry.get(watcher.path) == b"model b"
+
+
+def test_watcher_keeps_serving_after_failed_load(tmp_path, models_dir):
+    good = _publish(tmp_path, models_dir, "a.pkl", b"model a")
+    watcher = model_store.ModelWatcher(models_dir, registry=ModelRegistry(loader=_load))
+    watcher.poll()
+
+    _publish(tmp_path, models_dir, "b.pkl", b"broken")
+    assert not watcher.poll()
+    assert watcher.path == good
+    assert not watcher.poll()  # not retried until the pointer moves
+
+    fixed = _publish(tmp_path, models_dir, "c.pkl", b"model c")
+    assert watcher.poll()
+    assert watcher.path == fixed
+
+
+def test_watcher_path_is_none_when_first_load_fails(tmp_path, models_dir):
+    _publish(tmp_path, models_dir, "a.pkl", b"broken")
+    watcher = model_store.ModelWatcher(models_dir, registry=ModelRegistry(loader=_load))
+    assert not watcher.poll()
+    assert watcher.path is None
+
+
+def test_publish_file_rejects_native_sidecar(tmp_path, models_dir):
+    sidecar = tmp_path / "best_model.native.json"
+    sidecar.write_text("{}")
+    with pytest.raises(ValueError, match="native export"):
+        model_store.publish_file(str(sidecar), models_dir)
+    assert model_store.versions(models_dir) == []
+    assert not model_store.has_current(models_dir)
@@ -0,0 +1,33 @@
+import session_auth
+
+
+def _flip(text, i):
+    return text[:i] + ("A" if text[i] != "A" else "B") + text[i + 1:]
+
+
+def test_round_trip():
+    claims = session_auth.decode_token(session_auth.issue_token(7))
+    assert claims["uid"] == 7
+
+
+def test_tampered_token_is_rejected():
+    token = session_auth.issue_token(7)
+    body, signature = token.split(".")
+    forged = session_auth._b64encode(session_auth._b64decode(body).replace(b'"uid":7', b'"uid":8'))
+
+    assert session_auth.decode_token(f"{forged}.{signature}") is None
+    assert session_auth.decode_token(f"{body}.{_flip(signature, 0)}") is None
+    assert session_auth.decode_token(f"{_flip(body, 2)}.{signature}") is None
+    assert session_auth.decode_token(body) is None
+    assert session_auth.decode_token("") is None
+
+
+def test_expired_token_is_rejected():
+    assert session_auth.decode_token(session_auth.issue_token(7, ttl=-1)) is None
+
+
+def test_revoked_token_is_rejected():
+    token, other = session_auth.issue_token(7), session_auth.issue_token(7)
+    session_auth.revoke_token(token)
+    assert session_auth.decode_token(token) is None
+    assert session_auth.decode_token(other)["uid"] == 7
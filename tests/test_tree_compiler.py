@@ -0,0 +1,32 @@
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("pandas")
+
+import joblib
+
+import tree_compiler
+from model_registry import unpack_model
+from native_model import SAMPLE_PROFILE
+
+
+def test_compiles_legacy_tuple_artifact(legacy_model_path):
+    from feature_pipeline import as_job_role_pipeline
+
+    model, encoder = unpack_model(joblib.load(legacy_model_path))
+    compiled = tree_compiler.compile_artifact(model, encoder)
+    rows = [SAMPLE_PROFILE, dict(SAMPLE_PROFILE, Skill1="Java", ExperienceYears=5)]
+
+    expected = as_job_role_pipeline(model, encoder).predict_proba(rows)
+    assert compiled.predict_proba(rows) == pytest.approx(expected, abs=1e-5)
+    assert list(compiled.classes_) == list(encoder.classes_)
+
+
+def test_bench_cli_accepts_legacy_tuple(legacy_model_path, tmp_path, capsys):
+    import pandas as pd
+
+    data = tmp_path / "jobs.csv"
+    pd.DataFrame([SAMPLE_PROFILE, dict(SAMPLE_PROFILE, Skill1="Java")]).to_csv(data, index=False)
+
+    tree_compiler.main(["bench", legacy_model_path, "--data", str(data), "--rows", "50"])
+    assert "argmax agreement 1.0000" in capsys.readouterr().out
@@ -0,0 +1,188 @@
+"""
+Parallel model comparison for model_training.py.
+
+Every candidate model's hold-out fit and each of its cross-validation folds
+is an independent task, so they are all dispatched together to a loky
+process pool instead of being fitted one after another. Each worker is
+given an equal share of the CPU cores, and the estimators' own n_jobs and
+the workers' OpenMP/BLAS pools are capped to that share, so XGBoost and
+Random Forest do not oversubscribe the machine.
+
+    python training_harness.py processed_dataset.csv --cv 5 --n-jobs 4
+"""
+import argparse
+import os
+import time
+
+import pandas as pd
+from joblib import Parallel, delayed, parallel_config
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+from xgboost import XGBClassifier
+
+import dataset_store
+
+DEFAULT_DATA_PATH = "processed_dataset.csv"
+TARGET_COLUMN = "job_role"
+RANDOM_STATE = 42
+
+
+# -----------------------------
+# DATA
+# -----------------------------
+def load_training_data(path=DEFAULT_DATA_PATH, target=TARGET_COLUMN):
+    """
+    Reads the processed dataset, drops classes with a single sample (they
+    cannot be stratified) and returns (X, y, label_encoder).
+    """
+    df = dataset_store.load(path)
+    counts = df[target].value_counts()
+    df = df[~df[target].isin(counts[counts == 1].index)]
+    le = LabelEncoder()
+    y = le.fit_transform(df[target])
+    return df.drop(columns=target), y, le
+
+
+# -----------------------------
+# MODELS
+# -----------------------------
+def candidate_models(threads=1):
+    """
+    The five baseline models compared in model_training.py. `threads` caps
+    the estimators that parallelize internally.
+    """
+    return {
+        "Logistic Regression": LogisticRegression(max_iter=1000, random_state=RANDOM_STATE),
+        "Decision Tree": DecisionTreeClassifier(random_state=RANDOM_STATE),
+        "Random Forest": RandomForestClassifier(random_state=RANDOM_STATE, n_jobs=threads),
+        "SVM": SVC(random_state=RANDOM_STATE),
+        "XGBoost": XGBClassifier(eval_metric="mlogloss", random_state=RANDOM_STATE, n_jobs=threads),
+    }
+
+
+def pin_threads(estimator, threads):
+    """
+    Returns a clone of `estimator` with any n_jobs parameter set to `threads`.
+    """
+    estimator = clone(estimator)
+    params = estimator.get_params()
+    estimator.set_params(**{name: threads for name in params if name == "n_jobs" or name.endswith("__n_jobs")})
+    return estimator
+
+
+# -----------------------------
+# TASKS
+# -----------------------------
+def _holdout_task(name, estimator, X_train, X_test, y_train, y_test):
+    # Scaling lives inside the pipeline so it is fitted on training data only.
+    model = make_pipeline(StandardScaler(), estimator)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    y_pred = model.predict(X_test)
+    return name, "holdout", {
+        "Train Accuracy": model.score(X_train, y_train),
+        "Accuracy": accuracy_score(y_test, y_pred),
+        "Precision": precision_score(y_test, y_pred, average="weighted", zero_division=0),
+        "Recall": recall_score(y_test, y_pred, average="weighted", zero_division=0),
+        "F1 Score": f1_score(y_test, y_pred, average="weighted", zero_division=0),
+        "seconds": fit_seconds,
+    }
+
+
+def _cv_fold_task(name, estimator, X, y, train_idx, test_idx):
+    model = make_pipeline(StandardScaler(), estimator)
+    start = time.perf_counter()
+    model.fit(X.iloc[train_idx], y[train_idx])
+    score = model.score(X.iloc[test_idx], y[test_idx])
+    return name, "cv", {"score": score, "seconds": time.perf_counter() - start}
+
+
+# -----------------------------
+# COMPARISON
+# -----------------------------
+def compare_models(X, y, models=None, cv=5, n_jobs=None, test_size=0.2, verbose=0):
+    """
+    Fits every model on a stratified hold-out split and on `cv` stratified
+    folds, all in parallel, and returns the comparison table as a DataFrame
+    with one row per model.
+
+    `n_jobs` is the number of worker processes (default: one per task, up
+    to the CPU count). The cores are split evenly between workers.
+    """
+    cpus = os.cpu_count() or 1
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, stratify=y, random_state=RANDOM_STATE)
+    folds = list(StratifiedKFold(n_splits=cv, shuffle=True, random_state=RANDOM_STATE).split(X, y)) if cv else []
+
+    models = models or candidate_models()
+    n_tasks = len(models) * (1 + len(folds))
+    workers = min(n_jobs or cpus, n_tasks, cpus)
+    threads = max(1, cpus // workers)
+    models = {name: pin_threads(est, threads) for name, est in models.items()}
+
+    tasks = []
+    for name, estimator in models.items():
+        tasks.append(delayed(_holdout_task)(name, clone(estimator), X_train, X_test, y_train, y_test))
+        for train_idx, test_idx in folds:
+            tasks.append(delayed(_cv_fold_task)(name, clone(estimator), X, y, train_idx, test_idx))
+
+    start = time.perf_counter()
+    # inner_max_num_threads caps OpenMP/BLAS threads inside each worker.
+    with parallel_config(backend="loky", inner_max_num_threads=threads):
+        outputs = Parallel(n_jobs=workers, verbose=verbose)(tasks)
+    wall_seconds = time.perf_counter() - start
+
+    rows = {name: {"Model": name, "CV Scores": []} for name in models}
+    fit_seconds = {name: 0.0 for name in models}
+    for name, kind, result in outputs:
+        fit_seconds[name] += result["seconds"]
+        if kind == "holdout":
+            rows[name].update({k: v for k, v in result.items() if k != "seconds"})
+        else:
+            rows[name]["CV Scores"].append(result["score"])
+
+    table = []
+    for name, row in rows.items():
+        scores = pd.Series(row.pop("CV Scores"), dtype=float)
+        row["Difference"] = row["Train Accuracy"] - row["Accuracy"]
+        row["CV Mean"] = scores.mean()
+        row["CV Std"] = scores.std(ddof=0)
+        row["Fit Seconds"] = fit_seconds[name]
+        table.append(row)
+
+    results_df = pd.DataFrame(table)
+    results_df.attrs.update({"wall_seconds": wall_seconds, "workers": workers, "threads_per_worker": threads})
+    return results_df
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare candidate models in parallel.")
+    parser.add_argument("data", nargs="?", default=DEFAULT_DATA_PATH)
+    parser.add_argument("--cv", type=int, default=5)
+    parser.add_argument("--n-jobs", type=int, default=None)
+    parser.add_argument("-o", "--output", help="optional CSV file for the comparison table")
+    args = parser.parse_args(argv)
+
+    X, y, _ = load_training_data(args.data)
+    results_df = compare_models(X, y, cv=args.cv, n_jobs=args.n_jobs)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(results_df.round(3))
+    print(f"\nWall time: {results_df.attrs['wall_seconds']:.2f}s "
+          f"({results_df.attrs['workers']} workers x {results_df.attrs['threads_per_worker']} threads)")
+    if args.output:
+        results_df.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
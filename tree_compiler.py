@@ -0,0 +1,362 @@
+"""
+Compiles trained tree ensembles into flat NumPy arrays.
+
+The XGBoost and Random Forest models used here are shallow (depth 1-8,
+40-300 trees), so for one row per request most of predict_proba is library
+overhead rather than tree walking. The compiler copies every tree into
+contiguous arrays (feature index, threshold, left/right child, missing
+direction, leaf value) and evaluates a whole batch by advancing all
+(row, tree) pairs one level per step, max_depth steps in total. Leaves
+point back to themselves, so rows that finish early stay where they are.
+
+    python tree_compiler.py bench best_model.pkl --data final_high_accuracy_job_dataset.csv
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+DEFAULT_CHUNK_ROWS = 2048
+
+
+# -----------------------------
+# COMPILED ENSEMBLE
+# -----------------------------
+class CompiledEnsemble:
+    """
+    Array form of a tree ensemble. `aggregate` is "softmax" / "sigmoid"
+    (XGBoost margins, one output group per class) or "mean" (Random Forest
+    class probabilities averaged over trees).
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, leaf_value,
+                 roots, tree_group, base_margin, max_depth, aggregate, strict):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.default_left = default_left
+        self.leaf_value = leaf_value
+        self.roots = roots
+        self.tree_group = tree_group
+        self.base_margin = base_margin
+        self.max_depth = max_depth
+        self.aggregate = aggregate
+        # XGBoost sends x < threshold left, sklearn sends x <= threshold left.
+        self.strict = strict
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def leaves(self, X):
+        """
+        Returns the leaf node index reached by every (row, tree) pair.
+        """
+        # Both libraries compare float32 features; doing the same keeps
+        # boundary cases identical.
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], self.n_trees)).copy()
+        compare = np.less if self.strict else np.less_equal
+        for _ in range(self.max_depth):
+            value = X[rows, self.feature[node]]
+            go_left = compare(value, self.threshold[node])
+            missing = np.isnan(value)
+            go_left[missing] = self.default_left[node[missing]]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def _predict_chunk(self, X):
+        node = self.leaves(X)
+        if self.aggregate == "mean":
+            return self.leaf_value[node].mean(axis=1)
+        n_groups = len(self.base_margin)
+        margin = np.empty((X.shape[0], n_groups))
+        values = self.leaf_value[node]
+        for g in range(n_groups):
+            margin[:, g] = values[:, self.tree_group == g].sum(axis=1)
+        margin += self.base_margin
+        if self.aggregate == "sigmoid":
+            p = 1 / (1 + np.exp(-margin[:, 0]))
+            return np.column_stack([1 - p, p])
+        margin -= margin.max(axis=1, keepdims=True)
+        np.exp(margin, out=margin)
+        return margin / margin.sum(axis=1, keepdims=True)
+
+    def predict_proba(self, X, chunk_rows=DEFAULT_CHUNK_ROWS):
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X[None, :]
+        # Chunked so the (rows, trees) index matrices stay small.
+        return np.vstack([self._predict_chunk(X[i:i + chunk_rows]) for i in range(0, len(X), chunk_rows)])
+
+
+def _stack_trees(trees):
+    """
+    Concatenates per-tree node arrays into global arrays. Each tree is a dict
+    of feature, threshold, left, right, default_left, leaf_value with local
+    child indices (-1 for leaves).
+    """
+    sizes = [len(t["feature"]) for t in trees]
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+    feature, threshold, left, right, default_left, leaf_value = [], [], [], [], [], []
+    max_depth = 0
+    for t, offset in zip(trees, offsets):
+        n = len(t["feature"])
+        local = np.arange(n)
+        is_leaf = t["left"] < 0
+        # Leaves loop back to themselves so extra traversal steps are no-ops.
+        left.append(np.where(is_leaf, local, t["left"]) + offset)
+        right.append(np.where(is_leaf, local, t["right"]) + offset)
+        feature.append(np.where(is_leaf, 0, t["feature"]))
+        threshold.append(np.where(is_leaf, 0.0, t["threshold"]))
+        default_left.append(t["default_left"])
+        leaf_value.append(np.where(is_leaf[:, None] if t["leaf_value"].ndim == 2 else is_leaf,
+                                   t["leaf_value"], 0.0))
+        max_depth = max(max_depth, _depth(t["left"], t["right"]))
+    return {
+        "feature": np.concatenate(feature).astype(np.int32),
+        "threshold": np.concatenate(threshold).astype(np.float64),
+        "left": np.concatenate(left).astype(np.int32),
+        "right": np.concatenate(right).astype(np.int32),
+        "default_left": np.concatenate(default_left).astype(bool),
+        "leaf_value": np.concatenate(leaf_value).astype(np.float64),
+        "roots": offsets.astype(np.int32),
+        "max_depth": max_depth,
+    }
+
+
+def _depth(left, right):
+    depth = np.zeros(len(left), dtype=np.int64)
+    # Children always have larger ids than their parent in both libraries.
+    for node in range(len(left)):
+        if left[node] >= 0:
+            depth[left[node]] = depth[right[node]] = depth[node] + 1
+    return int(depth.max())
+
+
+# -----------------------------
+# COMPILERS
+# -----------------------------
+def compile_xgboost(model):
+    """
+    Compiles an XGBClassifier or Booster (gbtree only) from its JSON dump.
+    """
+    booster = model.get_booster() if hasattr(model, "get_booster") else model
+    dump = json.loads(booster.save_raw("json"))
+    gbm = dump["learner"]["gradient_booster"]
+    if gbm.get("name") != "gbtree":
+        raise ValueError(f"only gbtree boosters can be compiled, not {gbm.get('name')!r}")
+    trees = []
+    for tree in gbm["model"]["trees"]:
+        left = np.asarray(tree["left_children"], dtype=np.int64)
+        trees.append({
+            "feature": np.asarray(tree["split_indices"], dtype=np.int64),
+            "threshold": np.asarray(tree["split_conditions"], dtype=np.float32),
+            "left": left,
+            "right": np.asarray(tree["right_children"], dtype=np.int64),
+            "default_left": np.asarray(tree["default_left"], dtype=bool),
+            # For leaves XGBoost stores the leaf weight in split_conditions.
+            "leaf_value": np.asarray(tree["split_conditions"], dtype=np.float32),
+        })
+    arrays = _stack_trees(trees)
+    tree_group = np.asarray(gbm["model"]["tree_info"], dtype=np.int64)
+    n_groups = int(tree_group.max()) + 1 if len(tree_group) else 1
+    n_features = int(dump["learner"]["learner_model_param"]["num_feature"])
+
+    compiled = CompiledEnsemble(
+        tree_group=tree_group, base_margin=np.zeros(n_groups),
+        aggregate="softmax" if n_groups > 1 else "sigmoid", strict=True, **arrays,
+    )
+    # The intercept's storage differs across XGBoost versions, so derive it:
+    # the library's margin for any row minus the summed leaves is the base.
+    probe = np.zeros((1, n_features), dtype=np.float32)
+    margin = np.asarray(booster.inplace_predict(probe, predict_type="margin"), dtype=np.float64).reshape(1, -1)
+    leaves = compiled.leaf_value[compiled.leaves(probe)][0]
+    summed = np.array([leaves[tree_group == g].sum() for g in range(n_groups)])
+    compiled.base_margin = margin[0] - summed
+    return compiled
+
+
+def compile_random_forest(model):
+    """
+    Compiles a fitted sklearn RandomForestClassifier (or any forest of
+    DecisionTreeClassifier estimators).
+    """
+    trees = []
+    for est in model.estimators_:
+        t = est.tree_
+        value = t.value[:, 0, :].astype(np.float64)
+        value /= np.maximum(value.sum(axis=1, keepdims=True), 1e-300)
+        trees.append({
+            "feature": t.feature.astype(np.int64),
+            "threshold": t.threshold,
+            "left": t.children_left.astype(np.int64),
+            "right": t.children_right.astype(np.int64),
+            # sklearn >= 1.3 stores a missing-value direction; older trees never see NaN.
+            "default_left": np.asarray(getattr(t, "missing_go_to_left", np.ones(t.node_count)), dtype=bool),
+            "leaf_value": value,
+        })
+    arrays = _stack_trees(trees)
+    return CompiledEnsemble(tree_group=None, base_margin=None, aggregate="mean", strict=False, **arrays)
+
+
+def compile_estimator(model):
+    if hasattr(model, "get_booster") or type(model).__name__ == "Booster":
+        return compile_xgboost(model)
+    if hasattr(model, "estimators_"):
+        return compile_random_forest(model)
+    raise ValueError(f"cannot compile {type(model).__name__}")
+
+
+# -----------------------------
+# APP ARTIFACTS
+# -----------------------------
+class CompiledModel:
+    """
+    Drop-in replacement for a JobRolePipeline or NativeModel: the same
+    preprocessing followed by the compiled ensemble.
+    """
+
+    def __init__(self, transform, ensemble, classes):
+        self._transform = transform
+        self.ensemble = ensemble
+        self.classes_ = np.asarray(classes, dtype=object)
+
+    def predict_proba(self, rows):
+        return self.ensemble.predict_proba(self._transform(rows))
+
+    def predict(self, rows):
+        return self.classes_[np.argmax(self.predict_proba(rows), axis=1)]
+
+
+def _dense(X, missing_as_nan):
+    # The legacy best_model.pkl preprocessor emits scipy sparse matrices.
+    # XGBoost reads their absent entries as missing, sklearn trees as 0.
+    if not hasattr(X, "tocoo"):
+        return X
+    if not missing_as_nan:
+        return X.toarray()
+    coo = X.tocoo()
+    out = np.full(coo.shape, np.nan, dtype=np.float32)
+    out[coo.row, coo.col] = coo.data
+    return out
+
+
+def compile_artifact(artifact, encoder=None):
+    """
+    Compiles a native_model.NativeModel, a feature_pipeline.JobRolePipeline
+    or a legacy (pipeline, label_encoder) artifact split by
+    model_registry.unpack_model.
+    """
+    from predictor import features_frame
+
+    if hasattr(artifact, "booster"):  # NativeModel
+        return CompiledModel(artifact.transform, compile_xgboost(artifact.booster), artifact.classes_)
+    from feature_pipeline import as_job_role_pipeline
+
+    artifact = as_job_role_pipeline(artifact, encoder)
+    preprocess = artifact.pipeline.named_steps["preprocess"]
+    classifier = artifact.pipeline.named_steps["classifier"]
+    missing_as_nan = hasattr(classifier, "get_booster")
+    return CompiledModel(
+        lambda rows: _dense(preprocess.transform(features_frame(rows)), missing_as_nan),
+        compile_estimator(classifier),
+        artifact.classes_,
+    )
+
+
+# -----------------------------
+# BENCHMARK
+# -----------------------------
+def _latency(fn, X, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(X)
+        times.append(time.perf_counter() - start)
+    return np.percentile(times, [50, 99])
+
+
+def benchmark(reference, compiled, X, single_repeats=500, batch_repeats=20):
+    """
+    Compares `reference.predict_proba` with `compiled.predict_proba` on X:
+    max absolute probability difference, single-row p50/p99 latency and
+    whole-batch throughput.
+    """
+    ref = reference.predict_proba(X)
+    got = compiled.predict_proba(X)
+    out = {
+        "rows": len(X),
+        "max_abs_diff": float(np.max(np.abs(ref - got))),
+        "argmax_agreement": float(np.mean(ref.argmax(axis=1) == got.argmax(axis=1))),
+    }
+    one = X[:1]
+    for name, model in [("library", reference), ("compiled", compiled)]:
+        p50, p99 = _latency(model.predict_proba, one, single_repeats)
+        batch = np.median([_latency(model.predict_proba, X, 1)[0] for _ in range(batch_repeats)])
+        out[name] = {
+            "single_p50_ms": p50 * 1e3,
+            "single_p99_ms": p99 * 1e3,
+            "batch_seconds": float(batch),
+            "batch_rows_per_sec": len(X) / batch if batch > 0 else float("inf"),
+        }
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a tree model to NumPy and benchmark it.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    bench = sub.add_parser("bench")
+    bench.add_argument("model", nargs="?", default="best_model.pkl")
+    bench.add_argument("--data", default="final_high_accuracy_job_dataset.csv")
+    bench.add_argument("--rows", type=int, default=10_000)
+    bench.add_argument("--atol", type=float, default=1e-5)
+    args = parser.parse_args(argv)
+
+    import pandas as pd
+
+    from model_registry import load_model
+    from predictor import features_frame
+
+    model, encoder = load_model(args.model)
+    if not hasattr(model, "booster"):
+        from feature_pipeline import as_job_role_pipeline
+
+        model = as_job_role_pipeline(model, encoder)
+    start = time.perf_counter()
+    compiled = compile_artifact(model)
+    compile_seconds = time.perf_counter() - start
+
+    df = pd.read_csv(args.data)
+    rows = features_frame(df.sample(n=args.rows, replace=len(df) < args.rows, random_state=42))
+    # Benchmark on the transformed matrix so both sides time only the trees.
+    X = compiled._transform(rows)
+    classifier = model.booster if hasattr(model, "booster") else model.pipeline.named_steps["classifier"]
+    reference = _BoosterProba(classifier) if hasattr(model, "booster") else classifier
+    result = benchmark(reference, compiled.ensemble, X)
+
+    print(f"Compiled {compiled.ensemble.n_trees} trees (depth {compiled.ensemble.max_depth}) "
+          f"in {compile_seconds:.2f}s")
+    print(f"max |Δp| = {result['max_abs_diff']:.2e} (atol {args.atol}), "
+          f"argmax agreement {result['argmax_agreement']:.4f}")
+    for name in ("library", "compiled"):
+        r = result[name]
+        print(f"{name:<9} single p50 {r['single_p50_ms']:.3f} ms  p99 {r['single_p99_ms']:.3f} ms  "
+              f"batch {r['batch_rows_per_sec']:,.0f} rows/sec")
+    if result["max_abs_diff"] > args.atol:
+        raise SystemExit("compiled predictions differ from the library beyond tolerance")
+
+
+class _BoosterProba:
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict_proba(self, X):
+        return self.booster.inplace_predict(np.asarray(X, dtype=np.float32))
+
+
+if __name__ == "__main__":
+    main()